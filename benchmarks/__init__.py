@@ -0,0 +1,4 @@
+"""
+Benchmarks for the game's subsystems. Each module is run on its own,
+e.g. python -m benchmarks.audio_load, from the project root.
+"""
@@ -0,0 +1,54 @@
+"""Helpers shared by the benchmarks, for running pygame without a window."""
+
+from pathlib import Path
+import os
+
+import pygame
+
+def init_headless(audio: bool = True) -> None:
+    """Initialize pygame with dummy video (and audio) drivers."""
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    if audio:
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    # the game loads its assets relative to the project root
+    os.chdir(Path(__file__).resolve().parent.parent)
+
+    pygame.init()
+    if audio and not pygame.mixer.get_init():
+        pygame.mixer.init()
+
+def use_data_dir(data_dir: str | Path) -> None:
+    """Point every save and cache path in the config to the directory."""
+
+    from game.utils import config
+
+    for name in dir(config):
+        value = getattr(config, name)
+        if name.endswith("_path") and isinstance(value, str) and value.startswith("game/data/"):
+            setattr(config, name, str(Path(data_dir, value[len("game/data/"):])))
+
+def rss_bytes() -> int | None:
+    """Return the resident memory of the process, if it can be read."""
+
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+def print_table(rows: list[dict], columns: list[str]) -> None:
+    """Print the rows as an aligned table with the given columns."""
+
+    cells = [[str(row.get(column, "")) for column in columns] for row in rows]
+    widths = [
+        max(len(column), *(len(row[i]) for row in cells))
+        for i, column in enumerate(columns)
+    ]
+
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    print("  ".join("-" * width for width in widths))
+    for row in cells:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
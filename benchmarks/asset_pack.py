@@ -0,0 +1,121 @@
+"""
+Compares starting the game with the packed asset archive and with the
+loose asset files: how many asset files are opened up to the first
+frame, the time to the first frame, and the time to load every sound.
+
+Builds the archive first if there is none.
+
+    python -m benchmarks.asset_pack [--runs N]
+"""
+
+from pathlib import Path
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def run_child(mode: str, data_dir: str) -> None:
+    """Start the game once with or without the archive, printing the results."""
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.chdir(ROOT)
+
+    import game
+    from game.utils import config
+    from game.utils.asset_pack import get_pack
+    from ._headless import use_data_dir
+
+    use_data_dir(data_dir)
+    config.use_asset_pack = mode == 'pack'
+
+    asset_dirs = (
+        Path(config.images_path).resolve(),
+        Path(config.sounds_path).resolve(),
+        Path(config.sequences_path).resolve(),
+    )
+    pack_path = Path(config.asset_pack_path).resolve()
+    opened: list[str] = []
+
+    # opens from python; SDL and libsndfile open files in C, so those
+    # are counted by the asset pack and the stream decoder instead
+    def on_event(event: str, args: tuple) -> None:
+        if event != 'open' or not isinstance(args[0], (str, Path)):
+            return
+        path = Path(args[0]).resolve()
+        if path == pack_path or any(path.is_relative_to(d) for d in asset_dirs):
+            opened.append(str(path))
+
+    sys.addaudithook(on_event)
+
+    start = time.perf_counter()
+    instance = game.Game()
+    instance.run(max_frames=1)
+    first_frame_ms = (time.perf_counter() - start) * 1000
+
+    pack = get_pack()
+    # loose sequences are read from python, and already counted
+    c_opens = pack.loose_loads - sum(1 for path in opened if path.endswith(".json"))
+    opens_to_first_frame = (
+        len(opened) + c_opens + instance.sound_bank.decoder.jobs_submitted
+    )
+
+    instance.sound_bank.clear()
+    start = time.perf_counter()
+    for path in sorted(Path(config.sounds_path).iterdir()):
+        instance.sound_bank.get(path.name)
+    sounds_ms = (time.perf_counter() - start) * 1000
+
+    print(json.dumps({
+        'opens': opens_to_first_frame,
+        'first_frame_ms': first_frame_ms,
+        'sounds_ms': sounds_ms,
+    }))
+
+def main() -> int:
+    from ._headless import print_table
+    from game.utils import config
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if not Path(ROOT, config.asset_pack_path).exists():
+        subprocess.run([sys.executable, "-m", "game.utils.pack_tool", "build"],
+                       cwd=ROOT, check=True)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        for mode in ('loose', 'pack'):
+            results = []
+            for _ in range(args.runs):
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.asset_pack", "--child", mode, data_dir],
+                    cwd=ROOT, capture_output=True, text=True, check=True
+                ).stdout
+                results += [
+                    json.loads(line) for line in output.splitlines() if line.startswith("{")
+                ]
+
+            rows.append({
+                'assets': mode,
+                'files opened': max(result['opens'] for result in results),
+                'first frame ms': f"{statistics.median(r['first_frame_ms'] for r in results):.1f}",
+                'all sounds ms': f"{statistics.median(r['sounds_ms'] for r in results):.1f}",
+            })
+
+    print(f"Startup with loose and packed assets (median of {args.runs} runs):")
+    print_table(rows, ['assets', 'files opened', 'first frame ms', 'all sounds ms'])
+    return 0
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3])
+    else:
+        sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+Compares loading the music stems from WAV files against compressed
+OGG copies, decoded on the main thread (SoundBank.get) and on the
+background thread (SoundBank.load_async).
+
+Reports the size on disk, the decoded size, the growth in resident
+memory, the total load time, and the longest the main thread was
+blocked while a simulated 60 fps loop waited for the stems.
+
+Then plays a long track made of the stems, in both formats, decoded
+whole into a Sound or streamed with an AudioStream, and reports the
+peak growth in resident memory while it plays and the longest frame
+spent feeding it.
+
+    python -m benchmarks.audio_load [--repeat N] [--track-seconds 60]
+                                    [--play-seconds 3]
+
+The OGG copies are encoded with soundfile; without it only the WAV
+path is measured, and nothing is streamed.
+"""
+
+from pathlib import Path
+import argparse
+import gc
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from ._headless import init_headless, print_table, rss_bytes
+
+init_headless()
+
+try:
+    import numpy
+    import soundfile
+except ImportError:
+    numpy = None
+    soundfile = None
+
+import pygame
+
+from game.systems import AudioStream, SoundBank
+from game.utils import config
+
+STEMS = ["drums.wav", "mel1.wav", "mel2.wav"]
+FRAME_MS = 1000 / 60
+
+def make_assets(directory: Path, suffix: str) -> int:
+    """
+    Put the stems in the directory in the given format.
+    Return their total size on disk.
+    """
+
+    directory.mkdir()
+    for stem in STEMS:
+        source = Path(config.sounds_path, stem)
+        if suffix == '.wav':
+            shutil.copy(source, directory)
+        else:
+            data, samplerate = soundfile.read(source)
+            soundfile.write(directory / Path(stem).with_suffix(suffix), data, samplerate)
+
+    return sum(path.stat().st_size for path in directory.iterdir())
+
+def load_sync(bank: SoundBank) -> float:
+    """Decode every stem on the main thread. Return the longest frame."""
+
+    longest = 0.0
+    for stem in STEMS:
+        start = time.perf_counter()
+        bank.get(stem)
+        longest = max(longest, (time.perf_counter() - start) * 1000)
+
+    return longest
+
+def load_async(bank: SoundBank) -> float:
+    """
+    Request every stem, then run frames until they are decoded.
+    Return the longest time a frame spent on loading.
+    """
+
+    start = time.perf_counter()
+    for stem in STEMS:
+        bank.load_async(stem)
+    longest = (time.perf_counter() - start) * 1000
+
+    while True:
+        start = time.perf_counter()
+        done = bank.poll()
+        longest = max(longest, (time.perf_counter() - start) * 1000)
+        if done:
+            return longest
+        time.sleep(FRAME_MS / 1000)
+
+def measure(directory: Path, suffix: str, mode: str) -> dict[str, float]:
+    """Load the stems once and return the measurements."""
+
+    config.sounds_path = str(directory)
+    config.audio_formats = (suffix,)
+
+    gc.collect()
+    rss_before = rss_bytes()
+    bank = SoundBank()
+
+    start = time.perf_counter()
+    if mode == 'sync':
+        blocked = load_sync(bank)
+    else:
+        blocked = load_async(bank)
+    total = (time.perf_counter() - start) * 1000
+
+    rss_after = rss_bytes()
+    result = {
+        'total_ms': total,
+        'blocked_ms': blocked,
+        'decoded_kib': bank.bytes_used / 1024,
+        'rss_kib': 0.0,
+    }
+    if rss_before is not None and rss_after is not None:
+        result['rss_kib'] = (rss_after - rss_before) / 1024
+
+    bank.clear()
+    return result
+
+def make_track(directory: Path, suffix: str, seconds: int) -> Path:
+    """Write a track of the stems played one after another, for the seconds."""
+
+    parts = []
+    samplerate = None
+    for stem in STEMS:
+        data, rate = soundfile.read(Path(config.sounds_path, stem), always_2d=True)
+        if samplerate is None:
+            samplerate = rate
+        if rate != samplerate:
+            positions = numpy.linspace(0, len(data) - 1, round(len(data) * samplerate / rate))
+            data = numpy.column_stack([
+                numpy.interp(positions, numpy.arange(len(data)), data[:, i])
+                for i in range(data.shape[1])
+            ])
+        parts.append(data if data.shape[1] == 2 else numpy.repeat(data, 2, axis=1))
+
+    loop = numpy.concatenate(parts)
+    repeats = -(-seconds * samplerate // len(loop))
+    track = numpy.tile(loop, (repeats, 1))[:seconds * samplerate]
+
+    path = directory / f"track{suffix}"
+    # a second at a time: libsndfile crashes encoding long vorbis writes
+    with soundfile.SoundFile(path, 'w', samplerate, track.shape[1]) as file:
+        for start in range(0, len(track), samplerate):
+            file.write(track[start:start + samplerate])
+    return path
+
+def play(path: Path, mode: str, seconds: float) -> dict[str, float]:
+    """
+    Play the track for the seconds, at 60 fps, either decoded whole or
+    streamed. Return the peak growth in resident memory and the longest
+    frame spent starting or feeding it.
+    """
+
+    channel = pygame.mixer.Channel(0)
+    gc.collect()
+    rss_before = rss_bytes() or 0
+    peak = rss_before
+
+    start = time.perf_counter()
+    stream = None
+    sound = None
+    if mode == 'whole':
+        sound = pygame.mixer.Sound(path)
+        channel.play(sound)
+    else:
+        stream = AudioStream(path, channel)
+        stream.start()
+    longest = (time.perf_counter() - start) * 1000
+
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        if stream is not None:
+            stream.update()
+        longest = max(longest, (time.perf_counter() - start) * 1000)
+        peak = max(peak, rss_bytes() or 0)
+        time.sleep(FRAME_MS / 1000)
+
+    if stream is not None:
+        stream.stop()
+    channel.stop()
+    del sound
+    return {'rss_kib': (peak - rss_before) / 1024, 'blocked_ms': longest}
+
+def play_in_child(path: Path, mode: str, seconds: float) -> dict[str, float]:
+    """
+    Play the track in a fresh process, so memory freed by an earlier
+    run does not hide the growth of this one.
+    """
+
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.audio_load", "--play",
+         str(path), mode, str(seconds)],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return [json.loads(line) for line in output.splitlines() if line.startswith("{")][-1]
+
+def main() -> None:
+    """Run the benchmark and print a table of median results."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--track-seconds", type=int, default=60,
+                        help="length of the track played")
+    parser.add_argument("--play-seconds", type=float, default=3,
+                        help="how long the track is played for")
+    args = parser.parse_args()
+
+    suffixes = ['.wav']
+    if soundfile is not None:
+        suffixes.append('.ogg')
+    else:
+        print("soundfile is not installed, skipping the OGG assets.\n")
+
+    sounds_path = config.sounds_path
+    audio_formats = config.audio_formats
+    rows: list[dict] = []
+    with tempfile.TemporaryDirectory() as temp:
+        for suffix in suffixes:
+            directory = Path(temp, suffix[1:])
+            disk = make_assets(directory, suffix)
+
+            for mode in ('sync', 'async'):
+                runs = [measure(directory, suffix, mode) for _ in range(args.repeat)]
+                median = {
+                    key: statistics.median(run[key] for run in runs)
+                    for key in runs[0]
+                }
+                rows.append({
+                    'format': suffix[1:],
+                    'mode': mode,
+                    'disk KiB': f"{disk / 1024:.0f}",
+                    'decoded KiB': f"{median['decoded_kib']:.0f}",
+                    'RSS +KiB': f"{median['rss_kib']:.0f}",
+                    'load ms': f"{median['total_ms']:.1f}",
+                    'max blocked ms': f"{median['blocked_ms']:.2f}",
+                })
+        config.sounds_path = sounds_path
+        config.audio_formats = audio_formats
+
+        print_table(rows, list(rows[0]))
+        if soundfile is None:
+            return
+
+        rows = []
+        for suffix in suffixes:
+            track = make_track(Path(temp, suffix[1:]), suffix, args.track_seconds)
+            for mode in ('whole', 'stream'):
+                runs = [
+                    play_in_child(track, mode, args.play_seconds)
+                    for _ in range(args.repeat)
+                ]
+                rows.append({
+                    'format': suffix[1:],
+                    'mode': mode,
+                    'disk KiB': f"{track.stat().st_size / 1024:.0f}",
+                    'RSS peak +KiB': f"{statistics.median(run['rss_kib'] for run in runs):.0f}",
+                    'max blocked ms': f"{statistics.median(run['blocked_ms'] for run in runs):.2f}",
+                })
+
+    print(f"\nPlaying a {args.track_seconds} s track for {args.play_seconds} s:")
+    print_table(rows, list(rows[0]))
+
+if __name__ == '__main__':
+    if len(sys.argv) == 5 and sys.argv[1] == "--play":
+        print(json.dumps(play(Path(sys.argv[2]), sys.argv[3], float(sys.argv[4]))))
+    else:
+        main()
@@ -0,0 +1,5 @@
+"""
+Times the entity simulation, headless, over preset scenarios: fields of
+aliens, bullets and powerups, and the abilities acting on them. Run it
+with python -m benchmarks.entity_sim (see its --help).
+"""
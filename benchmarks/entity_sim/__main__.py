@@ -0,0 +1,228 @@
+"""
+Times Game._update_session and Game._draw_session apart, over a fixed
+number of steps of 1/60 s, in each of the preset scenarios. Each
+scenario runs in its own process, with the random generator seeded, the
+ship kept alive and the level held at 1, so the runs can be compared.
+
+The results are written as json with --output. With --compare, the
+median step of each phase is compared with the baseline (by default
+the stored one), and any slower than it by more than the tolerance
+fails the benchmark (exit status 1). Results over other steps or
+warm-up steps than the baseline's are not compared.
+
+Timings only compare on the machine which made them, so the baseline
+is not committed: store one on your machine with --update-baseline
+before making changes, then compare against it.
+
+    python -m benchmarks.entity_sim [--scenario NAME ...] [--steps 300]
+                                    [--warmup 30] [--output PATH]
+                                    [--compare [PATH]] [--update-baseline]
+                                    [--tolerance 0.25] [--slack-ms 0.1]
+"""
+
+from pathlib import Path
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+BASELINE_PATH = ROOT / "benchmarks" / "baselines" / "entity_sim.json"
+PHASES = ('update', 'draw')
+
+def run_child(name: str, steps: int, warmup: int, data_dir: str) -> None:
+    """Play the scenario for the given steps, printing the timings."""
+
+    from .._headless import init_headless, use_data_dir
+    init_headless()
+
+    import random
+
+    import game
+    from game.utils import helper_funcs
+    from .scenarios import SCENARIOS
+
+    use_data_dir(data_dir)
+    random.seed(0)
+    scenario = SCENARIOS[name]
+
+    instance = game.Game()
+    instance.menus['main'].open()
+    # as Game.run does after the first frame
+    instance._run_frame()
+    instance.gc_policy.freeze()
+
+    instance.ship_class = scenario['ship_class']
+    instance.start_session()
+    # a fixed step, a ship which cannot die, and no level ups
+    instance.dt = 1 / 60
+    instance.ship.stats['hit_points'].set_value(10**9)
+    instance.state.last_second_tracked = sys.maxsize
+    scenario['setup'](instance)
+
+    def count_entities() -> dict[str, int]:
+        return {
+            'aliens': len(instance.aliens),
+            'bullets': len(instance.bullets),
+            'powerups': len(instance.powerups),
+        }
+
+    entities = {'start': count_entities()}
+    times: dict[str, list[float]] = {phase: [] for phase in PHASES}
+    for step in range(warmup + steps):
+        if scenario['before_step'] is not None:
+            scenario['before_step'](instance)
+
+        start = time.perf_counter()
+        instance._update_session()
+        updated = time.perf_counter()
+        instance._draw_session()
+        drawn = time.perf_counter()
+
+        # collect between the steps, as the game does after each frame
+        instance.gc_policy.end_frame()
+
+        if step < warmup:
+            continue
+        times['update'].append((updated - start) * 1000)
+        times['draw'].append((drawn - updated) * 1000)
+    entities['end'] = count_entities()
+
+    instance.quit_session()
+    instance.quit()
+
+    print(json.dumps({
+        'description': scenario['description'],
+        'entities': entities,
+        **{
+            phase: {
+                'mean': round(sum(values) / len(values), 4),
+                'p50': round(helper_funcs.percentile(values, 50), 4),
+                'p95': round(helper_funcs.percentile(values, 95), 4),
+                'max': round(max(values), 4),
+            } for phase, values in times.items()
+        },
+    }))
+
+def collect(name: str, steps: int, warmup: int, data_dir: str) -> dict:
+    """Return the timings of the scenario, from a child process."""
+
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.entity_sim", "--child",
+         name, str(steps), str(warmup), data_dir],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return [json.loads(line) for line in output.splitlines() if line.startswith("{")][-1]
+
+def main() -> int:
+    from .._headless import print_table
+    from .scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="run only this scenario; may be given again")
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30,
+                        help="steps played first, and not timed")
+    parser.add_argument("--output", type=Path,
+                        help="write the results to this json file")
+    parser.add_argument("--compare", type=Path, nargs="?", const=BASELINE_PATH,
+                        help="compare with these results (the baseline by default)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown per phase, relative to the baseline")
+    parser.add_argument("--slack-ms", type=float, default=0.1,
+                        help="allowed slowdown per phase in ms, for short phases")
+    args = parser.parse_args()
+
+    baseline: dict = {}
+    if args.compare is not None and args.compare.exists():
+        baseline = json.loads(args.compare.read_text())
+        # medians over other steps are not the same measurement
+        for key in ('steps', 'warmup'):
+            if baseline.get(key, None) != getattr(args, key):
+                parser.error(
+                    f"the baseline at {args.compare} was run with --{key} "
+                    f"{baseline.get(key, None)}, not {getattr(args, key)}; "
+                    "run with the same, or store a new baseline"
+                )
+
+    names = args.scenario or list(SCENARIOS)
+    results = {
+        'steps': args.steps,
+        'warmup': args.warmup,
+        'python': platform.python_version(),
+        'time': round(time.time()),
+        'scenarios': {},
+    }
+    with tempfile.TemporaryDirectory() as data_dir:
+        for name in names:
+            results['scenarios'][name] = collect(name, args.steps, args.warmup, data_dir)
+
+    regressions: list[str] = []
+    rows = []
+    for name, result in results['scenarios'].items():
+        entities = result['entities']
+        row = {
+            'scenario': name,
+            'aliens': f"{entities['start']['aliens']}>{entities['end']['aliens']}",
+            'bullets': f"{entities['start']['bullets']}>{entities['end']['bullets']}",
+            'powerups': f"{entities['start']['powerups']}>{entities['end']['powerups']}",
+        }
+        for phase in PHASES:
+            value = result[phase]['p50']
+            row[phase] = f"{value:.3f}"
+            row[f"{phase} p95"] = f"{result[phase]['p95']:.3f}"
+
+            base_result = baseline.get('scenarios', {}).get(name, None)
+            if base_result is None:
+                continue
+            base = base_result[phase]['p50']
+            row[f"{phase} base"] = f"{base:.3f}"
+            if value > base * (1 + args.tolerance) + args.slack_ms:
+                regressions.append(f"{name} {phase}: {value:.3f} ms (baseline {base:.3f} ms)")
+                row['status'] = "SLOWER"
+        rows.append(row)
+
+    print(f"Median ms per step over {args.steps} steps (entities at the first > last step):")
+    print_table(rows, [
+        'scenario', 'aliens', 'bullets', 'powerups', 'update', 'update p95',
+        'update base', 'draw', 'draw p95', 'draw base', 'status'
+    ])
+    print()
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=4) + "\n")
+        print(f"Wrote the results to {args.output}.")
+
+    if args.update_baseline:
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(results, indent=4) + "\n")
+        print(f"Stored the baseline at {BASELINE_PATH}.")
+        return 0
+
+    if args.compare is None:
+        return 0
+
+    if not baseline:
+        print(f"No results at {args.compare}. Store a baseline with --update-baseline.")
+        return 0
+
+    if regressions:
+        print("FAIL: phases slower than the baseline:")
+        for regression in regressions:
+            print(f"\t{regression}")
+        return 1
+
+    print("OK: no phase is slower than the baseline.")
+    return 0
+
+if __name__ == '__main__':
+    if len(sys.argv) == 6 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]), sys.argv[5])
+    else:
+        sys.exit(main())
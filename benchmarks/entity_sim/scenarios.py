@@ -0,0 +1,172 @@
+"""
+The scenarios of the entity simulation benchmark. Each one picks the
+ship, fills the field once the session has started, and may top it up
+before every step, outside of the timed part.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, TypedDict
+if TYPE_CHECKING:
+    from game import Game
+
+import random
+
+from game.entities import Alien, Bullet, Ship, SpearFish
+from game.entities.entity import Entity
+from game.mechanics import abilities
+
+class ScenarioDict(TypedDict):
+    """A class representing a dictionary of a benchmark scenario."""
+
+    description: str
+    ship_class: type[Ship]
+    setup: Callable[[Game], None]
+    # called before each step, untimed; None to leave the field alone
+    before_step: Callable[[Game], None] | None
+
+# region HELPERS
+# -----------------------------------------------------------------------
+
+def place(entity: Entity, x: float, y: float) -> None:
+    """Move the entity to the position, keeping its vertical heading."""
+
+    entity.x, entity.y = float(x), float(y)
+    entity.rect.x, entity.rect.y = round(entity.x), round(entity.y)
+    if entity.destination is not None:
+        entity.destination = (entity.x, entity.destination[1])
+
+def random_position(game: Game, entity: Entity, top: float, bottom: float) -> tuple[float, float]:
+    """Return a random position within the given fractions of the play height."""
+
+    play_rect = game.play_rect
+    x = random.uniform(play_rect.left, play_rect.right - entity.rect.width)
+    y = random.uniform(play_rect.height * top, play_rect.height * bottom - entity.rect.height)
+    return x, y
+
+def add_aliens(game: Game, count: int, top: float = 0, bottom: float = 0.5, hp: int | None = None) -> None:
+    """Add aliens at random positions within the band of the play height."""
+
+    for _ in range(count):
+        alien = Alien(game)
+        place(alien, *random_position(game, alien, top, bottom))
+        if hp is not None:
+            alien.hp = hp
+        game.aliens.add(alien)
+
+def fire_at_max_rate(game: Game) -> None:
+    """
+    Enable the SpearFish's Spear, and raise the fire rate so the ship
+    fires a bullet every step.
+    """
+
+    game.ship.ability_slots['passive_1'].toggle(True)
+    game.ship.stats['fire_rate'].set_value(game.ship.bullet_delay_ms)
+
+# -----------------------------------------------------------------------
+# endregion
+
+# region SCENARIOS
+# -----------------------------------------------------------------------
+
+def setup_aliens(count: int) -> Callable[[Game], None]:
+    """Return a setup adding the number of aliens over the upper half."""
+
+    def setup(game: Game) -> None:
+        add_aliens(game, count)
+
+    return setup
+
+def setup_spearfish_bullets(game: Game) -> None:
+    """Fill the field with bullets, and a few aliens too tough to kill."""
+
+    fire_at_max_rate(game)
+    add_aliens(game, 100, bottom=0.2, hp=10**9)
+    for _ in range(3000):
+        bullet = Bullet(game)
+        place(bullet, *random_position(game, bullet, 0.25, 1))
+        game.bullets.add(bullet)
+
+def setup_death_pulse(game: Game) -> None:
+    """Let the ship's abilities charge instantly."""
+
+    game.ship.req_charge_time = 0
+
+def before_death_pulse(game: Game) -> None:
+    """
+    Fill the screen with aliens again once a pulse killed them, and give
+    the ship another Death Pulse (it is used up when fired) to fire
+    during the step.
+    """
+
+    if not game.aliens:
+        add_aliens(game, 1000, bottom=0.9)
+    slot = game.ship.ability_slots['active_1']
+    slot.set_ability(abilities.DeathPulse)
+    slot.toggle(True)
+    game.ship.start_ability_charge()
+
+def setup_powerup_drops(game: Game) -> None:
+    """Have every alien drop a powerup, and shoot at a column of them."""
+
+    fire_at_max_rate(game)
+    for _ in range(500):
+        powerup = game.drop_manager.try_drop(100, (0, 0))
+        if powerup is None:
+            continue
+        place(powerup, *random_position(game, powerup, 0, 0.9))
+        game.powerups.add(powerup)
+
+def before_powerup_drops(game: Game) -> None:
+    """Keep a column of aliens, which drop a powerup each, over the ship."""
+
+    while len(game.aliens) < 50:
+        alien = Alien(game)
+        alien.hp = 1
+        alien.drop_chance = 100
+        x = game.ship.rect.centerx - alien.rect.width // 2
+        place(alien, x, random.uniform(0, game.play_rect.height * 0.6))
+        game.aliens.add(alien)
+
+SCENARIOS: dict[str, ScenarioDict] = {
+    'aliens_100': {
+        'description': "100 aliens descending",
+        'ship_class': Ship,
+        'setup': setup_aliens(100),
+        'before_step': None,
+    },
+    'aliens_1k': {
+        'description': "1,000 aliens descending",
+        'ship_class': Ship,
+        'setup': setup_aliens(1_000),
+        'before_step': None,
+    },
+    'aliens_10k': {
+        'description': "10,000 aliens descending",
+        'ship_class': Ship,
+        'setup': setup_aliens(10_000),
+        'before_step': None,
+    },
+    'spearfish_bullets': {
+        'description': "a SpearFish at its max fire rate, among 3,000 bullets",
+        'ship_class': SpearFish,
+        'setup': setup_spearfish_bullets,
+        'before_step': None,
+    },
+    'death_pulse': {
+        'description': "Death Pulse fired every step, at 1,000 aliens over the screen",
+        'ship_class': Ship,
+        'setup': setup_death_pulse,
+        'before_step': before_death_pulse,
+    },
+    'powerup_drops': {
+        'description': "500 powerups falling, and every alien shot drops one",
+        'ship_class': SpearFish,
+        'setup': setup_powerup_drops,
+        'before_step': before_powerup_drops,
+    },
+}
+
+# -----------------------------------------------------------------------
+# endregion
+
+__all__ = ["ScenarioDict", "SCENARIOS"]
@@ -0,0 +1,146 @@
+"""
+Plays a long session headless, with the ship firing constantly and the
+alien group kept full, once with automatic garbage collection and once
+with the game's GC policy (see game.perf.GCPolicy). Each runs in its own
+process, so neither inherits the other's heap.
+
+Reports the busy time of the frames (everything but waiting for the
+next tick) at p50, p95, p99 and max, and the collections that ran
+during the session, in total and at safe points, and how long a full
+collection takes at the end of the session, with the alien group full.
+
+    python -m benchmarks.gc_soak [--seconds 30] [--aliens 120] [--fps 120]
+"""
+
+from pathlib import Path
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def run_child(mode: str, seconds: float, aliens: int, fps: int, data_dir: str) -> None:
+    """Play one session with or without the policy, printing the results."""
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.chdir(ROOT)
+
+    import game
+    from game.entities import Alien
+    from game.utils import config, helper_funcs
+    from ._headless import use_data_dir
+
+    use_data_dir(data_dir)
+    config.gc_control = mode == 'policy'
+    # the gc pauses come from the session's telemetry
+    config.record_telemetry = True
+
+    instance = game.Game()
+    instance.settings.data['fps'] = fps
+    instance.menus['main'].open()
+    # as Game.run does after the first frame
+    instance._run_frame()
+    instance.gc_policy.freeze()
+    instance.start_session()
+
+    busy: list[float] = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        while len(instance.aliens) < aliens:
+            instance.aliens.add(Alien(instance))
+        instance.ship.fire_bullet()
+
+        instance._run_frame()
+        frame = instance.profiler.get_last_frame()
+        busy.append(sum(ms for phase, ms in frame.items() if phase != 'idle'))
+
+    instance.quit_session()
+    record = instance.telemetry.last_record
+
+    # what a gen 2 pause costs with the alien group still full
+    start = time.perf_counter()
+    gc.collect()
+    full_ms = (time.perf_counter() - start) * 1000
+
+    gc_pauses = record['gc_pauses'] if record is not None else {}
+    collections = list(instance.gc_policy.collections)
+    instance.quit()
+
+    print(json.dumps({
+        'frames': len(busy),
+        'level': record['level'] if record is not None else 0,
+        'p50': helper_funcs.percentile(busy, 50),
+        'p95': helper_funcs.percentile(busy, 95),
+        'p99': helper_funcs.percentile(busy, 99),
+        'max': max(busy, default=0),
+        'full_ms': full_ms,
+        'gc_pauses': gc_pauses,
+        'backstops': instance.gc_policy.backstop_collections,
+        'safe_points': [c for c in collections if c['reason'] != 'startup'],
+    }))
+
+def main() -> int:
+    from ._headless import print_table
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--aliens", type=int, default=120)
+    parser.add_argument("--fps", type=int, default=120)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        for mode in ('automatic', 'policy'):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.gc_soak", "--child", mode,
+                 str(args.seconds), str(args.aliens), str(args.fps), data_dir],
+                cwd=ROOT, capture_output=True, text=True, check=True
+            ).stdout
+            results[mode] = [
+                json.loads(line) for line in output.splitlines() if line.startswith("{")
+            ][-1]
+
+    rows = []
+    for mode, result in results.items():
+        gc_pauses = result['gc_pauses']
+        rows.append({
+            'gc': mode,
+            'frames': result['frames'],
+            'p50 ms': f"{result['p50']:.2f}",
+            'p95 ms': f"{result['p95']:.2f}",
+            'p99 ms': f"{result['p99']:.2f}",
+            'max ms': f"{result['max']:.2f}",
+            'collections': gc_pauses.get('count', 0),
+            'gen 2': gc_pauses.get('per_generation', [0, 0, 0])[2],
+            'longest ms': f"{gc_pauses.get('max_ms', 0):.2f}",
+            'safe point ms': f"{gc_pauses.get('safe_point_ms', 0):.1f}",
+            'full gc ms': f"{result['full_ms']:.2f}",
+        })
+
+    print(f"Frame busy time over a {args.seconds:g} s session, "
+          f"{args.aliens} aliens, {args.fps} fps:")
+    print_table(rows, [
+        'gc', 'frames', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms',
+        'collections', 'gen 2', 'longest ms', 'safe point ms', 'full gc ms'
+    ])
+
+    policy = results['policy']
+    print(f"\nPolicy reached level {policy['level']}, "
+          f"with {policy['backstops']} backstop collections. Safe points:")
+    for collection in policy['safe_points']:
+        print(f"\t{collection['reason']:<12} gen {collection['generation']}  "
+              f"{collection['ms']:.3f} ms")
+    return 0
+
+if __name__ == '__main__':
+    if len(sys.argv) == 7 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], float(sys.argv[3]), int(sys.argv[4]),
+                  int(sys.argv[5]), sys.argv[6])
+    else:
+        sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Checks the cold start of the game against a budget, by importing it in
+fresh interpreters with `python -X importtime`.
+
+Reports the median import time of the game's own modules (pygame and
+other third-party packages are listed, but not budgeted), and checks
+that importing the game has no side effects: no display, fonts or mixer
+are initialized. Exits with status 1 if either check fails.
+
+    python -m benchmarks.import_time [--runs N] [--budget-ms MS] [--top N]
+"""
+
+from pathlib import Path
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from ._headless import print_table
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# what importing the game initializes, printed by the child interpreter
+PROBE = (
+    "import game, pygame; "
+    "print(pygame.display.get_init(), pygame.font.get_init(), "
+    "bool(pygame.mixer.get_init()))"
+)
+
+def run_once() -> tuple[dict[str, tuple[int, int]], list[str]]:
+    """
+    Import the game in a fresh interpreter. Return the (self, cumulative)
+    import time of each module in microseconds, and the probe output.
+    """
+
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+    times: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+
+    return times, result.stdout.split()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=35,
+                        help="budget for the game's own modules")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+
+    def median_ms(name: str, index: int) -> float:
+        values = [times[name][index] for times, _ in runs if name in times]
+        return statistics.median(values) / 1000 if values else 0
+
+    modules = set().union(*(times for times, _ in runs))
+    own = sorted(
+        (name for name in modules if name == "game" or name.startswith("game.")),
+        key=lambda name: median_ms(name, 0), reverse=True
+    )
+    own_ms = sum(median_ms(name, 0) for name in own)
+
+    print(f"Slowest game modules (median of {args.runs} runs):")
+    print_table([
+        {
+            'module': name,
+            'self ms': f"{median_ms(name, 0):.2f}",
+            'cumulative ms': f"{median_ms(name, 1):.2f}",
+        }
+        for name in own[:args.top]
+    ], ['module', 'self ms', 'cumulative ms'])
+    print()
+
+    print_table([
+        {'': "game, total", 'ms': f"{median_ms('game', 1):.2f}"},
+        {'': "pygame", 'ms': f"{median_ms('pygame', 1):.2f}"},
+        {'': "game's own modules", 'ms': f"{own_ms:.2f}"},
+        {'': "budget", 'ms': f"{args.budget_ms:.2f}"},
+    ], ['', 'ms'])
+    print()
+
+    is_ok = True
+    if own_ms > args.budget_ms:
+        print(f"FAIL: the game's modules take {own_ms:.2f} ms to import, "
+              f"over the budget of {args.budget_ms:.2f} ms.")
+        is_ok = False
+
+    initialized = [
+        subsystem for subsystem, flag
+        in zip(("display", "font", "mixer"), runs[-1][1])
+        if flag == "True"
+    ]
+    if initialized:
+        print(f"FAIL: importing the game initialized: {', '.join(initialized)}.")
+        is_ok = False
+
+    if is_ok:
+        print("OK: within budget, and importing has no side effects.")
+    return 0 if is_ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
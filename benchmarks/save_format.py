@@ -0,0 +1,142 @@
+"""
+Compares the json and binary save formats on synthetic progress saves
+holding thousands of session records, and on the settings.
+
+Reports the size of each save and the median time to encode, decode,
+write and load it.
+
+    python -m benchmarks.save_format [--sessions 1000 5000] [--repeat N]
+"""
+
+from pathlib import Path
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+
+from ._headless import init_headless, print_table
+
+init_headless(audio=False)
+
+from game.systems import save_format
+from game.utils import config
+
+def make_progress(sessions: int) -> dict:
+    """Return a progress save with the given number of session records."""
+
+    rng = random.Random(sessions)
+    upgrades = [
+        "Hit Points Upgrade", "Thrust Upgrade", "Fire Power Upgrade",
+        "Fire Rate Upgrade", "Active Ability Slot Upgrade",
+        "Passive Ability Slot Upgrade", "Active Ability Charge Time Upgrade",
+        "Luck Upgrade",
+    ]
+    data = {
+        'credits': rng.randrange(10**6),
+        'max_credits_owned': rng.randrange(10**6),
+        'max_credits_session': rng.randrange(10**4),
+        'credits_spent': rng.randrange(10**6),
+        'num_of_sessions': sessions,
+        'longest_session': rng.randrange(10**7),
+        'total_session_duration': rng.randrange(10**9),
+        'upgrades': {name: {'level': rng.randrange(10)} for name in upgrades},
+        'rewards': {
+            f"Reward {i}": {'is_unlocked': True, 'is_claimed_or_toggled': i % 2 == 0}
+            for i in range(50)
+        },
+        'journal_seq': rng.randrange(10**5),
+        'sessions': [
+            {
+                'start_time': 1.7e9 + i * 600.5,
+                'duration_ms': rng.randrange(10**6),
+                'ship_class': rng.choice(("Ship", "BakersDozen", "SpearFish")),
+                'kills': rng.randrange(1000),
+                'credits': rng.randrange(10**4),
+                'level': rng.randrange(1, 30),
+                'upgrades': {name: rng.randrange(10) for name in upgrades},
+            }
+            for i in range(sessions)
+        ],
+    }
+    return data
+
+def make_settings() -> dict:
+    """Return a settings save like the default one."""
+
+    return {
+        'fps': 60, 'show_fps': False, 'music_volume': 5,
+        'keybinds': {
+            name: {'control': name.replace('_', ' ').title(), 'keycode': 1073741904 + i}
+            for i, name in enumerate((
+                'cancel', 'move_left', 'move_right', 'fire',
+                'active_1', 'active_2', 'active_3',
+                'passive_1', 'passive_2', 'passive_3', 'passive_4',
+            ))
+        },
+    }
+
+def median_ms(func, repeat: int) -> float:
+    """Return the median time of the call, in ms."""
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(times)
+
+def measure(name: str, kind: str, data: dict, directory: Path, repeat: int) -> list[dict]:
+    """Return a row for each format."""
+
+    rows = []
+    for save_type in ('json', 'binary'):
+        config.save_format = save_type
+        encoder = save_format.get_encoder(kind)
+        path = save_format.get_path(Path(directory, name))
+        blob = encoder(data)
+        path.write_bytes(blob)
+
+        if save_type == 'json':
+            decode = lambda: save_format.decode_json(kind, blob)
+        else:
+            decode = lambda: save_format.decode(kind, blob)
+
+        assert json.dumps(save_format.load(kind, path)) == json.dumps(data)
+        rows.append({
+            'save': name,
+            'format': save_type,
+            'KiB': f"{len(blob) / 1024:.1f}",
+            'encode ms': f"{median_ms(lambda: encoder(data), repeat):.2f}",
+            'decode ms': f"{median_ms(decode, repeat):.2f}",
+            'write ms': f"{median_ms(lambda: path.write_bytes(encoder(data)), repeat):.2f}",
+            'load ms': f"{median_ms(lambda: save_format.load(kind, path), repeat):.2f}",
+        })
+
+    return rows
+
+def main() -> None:
+    """Run the benchmark and print a table of the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    save_type = config.save_format
+    rows: list[dict] = []
+    with tempfile.TemporaryDirectory() as temp:
+        rows += measure("settings", 'settings', make_settings(), Path(temp), args.repeat)
+        for sessions in args.sessions:
+            rows += measure(
+                f"progress_{sessions}", 'progress',
+                make_progress(sessions), Path(temp), args.repeat
+            )
+    config.save_format = save_type
+
+    print_table(rows, list(rows[0]))
+
+if __name__ == '__main__':
+    main()
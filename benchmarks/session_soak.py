@@ -0,0 +1,179 @@
+"""
+Starts and quits sessions over and over, headless, to find leaks. Each
+session spawns aliens, fires and plays a few frames; every few cycles
+the session is paused and restarted from the pause menu instead, and
+every few others it ends with the ship destroyed by an alien.
+
+The resident memory, the number of surfaces reachable from python
+objects, and the number of objects the garbage collector tracks are
+sampled as the cycles run, once the saves and history queued so far
+are written. The harness fails (exit status 1) if any of
+them grew between the first sample after the warm-up and the last one
+by more than its allowance.
+
+    python -m benchmarks.session_soak [--cycles 2000] [--frames 5]
+                                      [--restart-every 5] [--die-every 3]
+                                      [--samples 10]
+                                      [--rss-slack-kib 4096]
+                                      [--object-slack 200]
+                                      [--surface-slack 0]
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+
+from ._headless import init_headless, print_table, rss_bytes
+
+init_headless()
+
+import pygame
+
+import game
+from game.entities import Alien
+from ._headless import use_data_dir
+
+def count_surfaces() -> int:
+    """Return how many surfaces the tracked python objects refer to."""
+
+    surfaces: set[int] = set()
+    for obj in gc.get_objects():
+        for referent in gc.get_referents(obj):
+            if isinstance(referent, pygame.Surface):
+                surfaces.add(id(referent))
+    return len(surfaces)
+
+def take_sample(instance: game.Game, cycle: int) -> dict[str, int]:
+    """
+    Let the writer threads store what is queued, collect the garbage,
+    then measure what is still alive.
+    """
+
+    instance.save_service.flush()
+    instance.history.flush()
+
+    # frozen objects are alive but not tracked, so count them too
+    gc.unfreeze()
+    gc.collect()
+    sample = {
+        'cycle': cycle,
+        'rss': rss_bytes() or 0,
+        'objects': len(gc.get_objects()),
+        'surfaces': count_surfaces(),
+    }
+    gc.freeze()
+    return sample
+
+def play_session(instance: game.Game, frames: int, restart: bool, die: bool) -> None:
+    """Play one session from the main menu back to the main menu."""
+
+    instance.start_session()
+    for _ in range(10):
+        instance.aliens.add(Alien(instance))
+
+    for _ in range(frames):
+        instance.ship.fire_bullet()
+        instance._run_frame()
+
+    if restart:
+        instance.menus['pause'].open()
+        instance._run_frame()
+        instance.menus['pause'].restart_session()
+        for _ in range(frames):
+            instance._run_frame()
+
+    if die:
+        # an alien past the bottom takes the ship's last hit point,
+        # which ends the session at the end of the frame
+        instance.ship.stats['hit_points'].set_value(1)
+        alien = Alien(instance)
+        alien.y = alien.bounds['bottom']
+        instance.aliens.add(alien)
+        instance._run_frame()
+        if instance.state.session_running:
+            raise RuntimeError("The session did not end when the ship was destroyed.")
+    else:
+        instance.quit_session()
+    instance._run_frame()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--frames", type=int, default=5,
+                        help="frames played in each session")
+    parser.add_argument("--restart-every", type=int, default=5,
+                        help="restart from the pause menu every N cycles")
+    parser.add_argument("--die-every", type=int, default=3,
+                        help="end the session with the ship destroyed every N cycles")
+    parser.add_argument("--samples", type=int, default=10)
+    # sqlite's page cache for the session history (2 MiB a connection)
+    # keeps filling for the first few thousand sessions, then levels off
+    parser.add_argument("--rss-slack-kib", type=int, default=4096)
+    parser.add_argument("--object-slack", type=int, default=200)
+    parser.add_argument("--surface-slack", type=int, default=0)
+    args = parser.parse_args()
+
+    data_dir = tempfile.TemporaryDirectory()
+    use_data_dir(data_dir.name)
+
+    instance = game.Game()
+    instance.settings.data['fps'] = 0 # as fast as possible
+    instance.menus['main'].open()
+    # as Game.run does after the first frame
+    instance._run_frame()
+    instance.gc_policy.freeze()
+
+    # the first cycles fill caches (fonts, sounds, sequences, saves)
+    warm_up = max(1, args.cycles // 10)
+    every = max(1, (args.cycles - warm_up) // args.samples)
+
+    samples: list[dict[str, int]] = []
+    start = time.perf_counter()
+    for cycle in range(1, args.cycles + 1):
+        restart = args.restart_every > 0 and cycle % args.restart_every == 0
+        die = args.die_every > 0 and cycle % args.die_every == 0
+        play_session(instance, args.frames, restart, die)
+
+        if cycle >= warm_up and (cycle - warm_up) % every == 0 or cycle == args.cycles:
+            samples.append(take_sample(instance, cycle))
+    elapsed = time.perf_counter() - start
+
+    instance.quit()
+    pygame.quit()
+    data_dir.cleanup()
+
+    print(f"{args.cycles} sessions in {elapsed:.1f} s:")
+    print_table([{
+        'cycle': sample['cycle'],
+        'rss KiB': sample['rss'] // 1024,
+        'objects': sample['objects'],
+        'surfaces': sample['surfaces'],
+    } for sample in samples], ['cycle', 'rss KiB', 'objects', 'surfaces'])
+    print()
+
+    first, last = samples[0], samples[-1]
+    allowances = {
+        'rss': args.rss_slack_kib * 1024,
+        'objects': args.object_slack,
+        'surfaces': args.surface_slack,
+    }
+    leaks = [
+        f"{name} grew by {last[name] - first[name]} "
+        f"(from {first[name]} to {last[name]}, allowed {allowance})"
+        for name, allowance in allowances.items()
+        if last[name] - first[name] > allowance
+    ]
+
+    if leaks:
+        print("FAIL: growth over the run:")
+        for leak in leaks:
+            print(f"\t{leak}")
+        return 1
+
+    print("OK: no growth over the run.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Measures the time from launch to the first frame, phase by phase, using
+the game's startup timeline, under the dummy video and audio drivers.
+
+Cold runs start a fresh interpreter each, so they include importing the
+game. Warm runs construct the game again in a process which has already
+done so. Saves go to a temporary directory, shared by all the runs.
+
+The medians are compared with a stored baseline, and any phase slower
+than the baseline by more than the tolerance fails the benchmark (exit
+status 1). Store new numbers with --update-baseline.
+
+Timings only compare on the machine which made them, so the baseline
+is not committed: store one on your machine with --update-baseline
+before making changes, then compare against it.
+
+    python -m benchmarks.startup [--runs N] [--tolerance 0.5] [--slack-ms 5]
+                                 [--baseline PATH] [--update-baseline]
+"""
+
+import time
+START = time.perf_counter()
+
+from pathlib import Path
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = ROOT / "benchmarks" / "baselines" / "startup.json"
+
+def run_child(mode: str, runs: int, data_dir: str) -> None:
+    """Start the game the given number of times, printing each timeline."""
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.chdir(ROOT)
+
+    import game
+    import_ms = (time.perf_counter() - START) * 1000
+
+    # keep the benchmark's saves out of the player's
+    from ._headless import use_data_dir
+    use_data_dir(data_dir)
+
+    if mode == 'warm':
+        # the first construction in the process is not warm yet
+        game.Game().run(max_frames=1)
+
+    for _ in range(runs):
+        instance = game.Game()
+        instance.run(max_frames=1)
+
+        result = instance.startup.get_durations()
+        result['first_frame_total'] = instance.startup.get_total_ms()
+        if mode == 'cold':
+            result['import'] = import_ms
+            result['first_frame_total'] += import_ms
+        print(json.dumps(result))
+
+def collect(mode: str, runs: int, data_dir: str) -> list[dict[str, float]]:
+    """Return the timelines of the runs, from child processes."""
+
+    command = [sys.executable, "-m", "benchmarks.startup", "--child", mode, data_dir]
+    results: list[dict[str, float]] = []
+
+    if mode == 'cold':
+        processes = [command + ["1"] for _ in range(runs)]
+    else:
+        processes = [command + [str(runs)]]
+
+    for args in processes:
+        output = subprocess.run(
+            args, cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        results += [
+            json.loads(line) for line in output.splitlines() if line.startswith("{")
+        ]
+
+    return results
+
+def get_medians(results: list[dict[str, float]]) -> dict[str, float]:
+    """Return the median time of each phase over the runs."""
+
+    phases = {phase: None for result in results for phase in result}
+    return {
+        phase: statistics.median(result.get(phase, 0.0) for result in results)
+        for phase in phases
+    }
+
+def main() -> int:
+    from ._headless import print_table
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown per phase, relative to the baseline")
+    parser.add_argument("--slack-ms", type=float, default=5,
+                        help="allowed slowdown per phase in ms, for short phases")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        # a first launch creates the saves and caches every later one finds
+        collect('cold', 1, data_dir)
+        medians = {
+            'cold': get_medians(collect('cold', args.runs, data_dir)),
+            'warm': get_medians(collect('warm', args.runs, data_dir)),
+        }
+
+    baseline: dict[str, dict[str, float]] = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+
+    regressions: list[str] = []
+    rows = []
+    for phase in medians['cold']:
+        row = {'phase': phase}
+        for mode in ('cold', 'warm'):
+            if phase not in medians[mode]:
+                continue
+            value = medians[mode][phase]
+            row[mode] = f"{value:.1f}"
+
+            base = baseline.get(mode, {}).get(phase, None)
+            if base is None:
+                continue
+            row[f"{mode} base"] = f"{base:.1f}"
+            if value > base * (1 + args.tolerance) + args.slack_ms:
+                regressions.append(f"{mode} {phase}: {value:.1f} ms (baseline {base:.1f} ms)")
+                row['status'] = "SLOWER"
+        rows.append(row)
+
+    print(f"Startup phases in ms (median of {args.runs} runs):")
+    print_table(rows, ['phase', 'cold', 'cold base', 'warm', 'warm base', 'status'])
+    print()
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        rounded = {
+            mode: {phase: round(value, 2) for phase, value in phases.items()}
+            for mode, phases in medians.items()
+        }
+        args.baseline.write_text(json.dumps(rounded, indent=4) + "\n")
+        print(f"Stored the baseline at {args.baseline}.")
+        return 0
+
+    if not baseline:
+        print(f"No baseline at {args.baseline}. Store one with --update-baseline.")
+        return 0
+
+    if regressions:
+        print("FAIL: phases slower than the baseline:")
+        for regression in regressions:
+            print(f"\t{regression}")
+        return 1
+
+    print("OK: no phase is slower than the baseline.")
+    return 0
+
+if __name__ == '__main__':
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], int(sys.argv[4]), sys.argv[3])
+    else:
+        sys.exit(main())
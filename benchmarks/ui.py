@@ -0,0 +1,311 @@
+"""
+Measures the menus and trays, headless, at each of the configured
+resolutions: resizing the game to it (Game._handle_resize_event), then
+opening, rebuilding, scrolling and drawing each menu of the MenusDict,
+and rebuilding and drawing both trays. A session runs throughout, so
+the pause menu and the trays have something to show.
+
+Each element added by Menu._add_elements_from_dicts is also timed on its
+own, as it is built (over as many rebuilds of its menu) and as it is
+drawn, and the slowest are listed, so a costly entry in menu_setups.py
+can be told apart from its menu.
+
+With --compare, the medians, the elements' included, are compared with
+the baseline (by default the stored one), and any slower than it by
+more than the tolerance fail the benchmark (exit status 1). Timings
+shorter than --min-ms in the baseline are too short to compare, and
+results over another number of repeats than the baseline's are not
+compared.
+
+Timings only compare on the machine which made them, so the baseline
+is not committed: store one on your machine with --update-baseline
+before making changes, then compare against it.
+
+    python -m benchmarks.ui [--repeats 20] [--scroll-steps 20] [--top 10]
+                            [--output PATH] [--compare [PATH]]
+                            [--update-baseline] [--tolerance 0.25]
+                            [--min-ms 0.05]
+"""
+
+from pathlib import Path
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+
+from ._headless import init_headless, print_table
+
+init_headless()
+
+import game
+from game.ui.base import Menu
+from game.utils import config
+from ._headless import use_data_dir
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = ROOT / "benchmarks" / "baselines" / "ui.json"
+PHASES = ('open', 'update', 'scroll', 'draw')
+
+def time_ms(action: Callable[[], Any], before: Callable[[], Any] | None = None,
+            repeats: int = 1) -> float:
+    """Return the median ms the action takes, calling before untimed first."""
+
+    times: list[float] = []
+    for _ in range(repeats):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        action()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def time_elements(menu: Menu, repeats: int) -> dict[str, dict[str, float]]:
+    """
+    Rebuild the menu repeatedly with each element dict added on its own,
+    timing it, then time drawing each element. Return the median ms by
+    element name.
+    """
+
+    add_elements = menu._add_elements_from_dicts
+    built: dict[str, list[float]] = {}
+
+    def add_timed(dicts: list, origin: tuple[int, int] = (0, 0)) -> None:
+        for element in dicts:
+            start = time.perf_counter()
+            add_elements([element], origin)
+            built.setdefault(element['name'], []).append(
+                (time.perf_counter() - start) * 1000
+            )
+
+    menu._add_elements_from_dicts = add_timed
+    try:
+        for _ in range(repeats):
+            menu.update()
+    finally:
+        del menu._add_elements_from_dicts
+
+    costs: dict[str, dict[str, float]] = {}
+    for name, build_times in built.items():
+        element = menu.elements[name]
+        costs[name] = {
+            'build': statistics.median(build_times),
+            'draw': time_ms(element.draw, repeats=repeats),
+        }
+    return costs
+
+def scroll_ms(menu: Menu, steps: int) -> float:
+    """
+    Scroll the menu with the mouse wheel down and back up, drawing it
+    after each step. Return the median ms of a step.
+    """
+
+    magnitude = config.mouse_wheel_magnitude
+    times: list[float] = []
+    for direction in (-1, 1):
+        for _ in range(steps):
+            start = time.perf_counter()
+            menu.scroll((0, direction * magnitude), True)
+            menu.draw()
+            times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def measure_menu(instance: game.Game, menu: Menu,
+                 repeats: int, scroll_steps: int) -> dict[str, Any]:
+    """Return the costs of opening, rebuilding, scrolling and drawing the menu."""
+
+    def redraw() -> None:
+        menu.needs_redraw = True
+
+    result: dict[str, Any] = {}
+    result['open'] = time_ms(menu.open, menu.close, repeats)
+    result['update'] = time_ms(menu.update, repeats=repeats)
+    result['draw'] = time_ms(menu.draw, redraw, repeats)
+    result['scroll'] = scroll_ms(menu, scroll_steps)
+    result['elements'] = time_elements(menu, repeats)
+    result['height'] = menu.rect.height
+
+    menu.close()
+    # the pause menu stops the session when it opens
+    instance.state.session_running = True
+    return result
+
+def measure_tray(tray: Menu, repeats: int) -> dict[str, Any]:
+    """Return the costs of rebuilding and drawing the tray."""
+
+    def redraw() -> None:
+        tray.needs_redraw = True
+
+    return {
+        'update': time_ms(tray.update, repeats=repeats),
+        'draw': time_ms(tray.draw, redraw, repeats),
+        'elements': time_elements(tray, repeats),
+        'height': tray.rect.height,
+    }
+
+def measure_resolution(instance: game.Game, resolution: tuple[int, int],
+                       repeats: int, scroll_steps: int) -> dict[str, Any]:
+    """Resize the game to the native resolution, then measure every menu."""
+
+    instance.native_resolution = resolution
+    start = time.perf_counter()
+    instance._handle_resize_event()
+    resize_ms = (time.perf_counter() - start) * 1000
+
+    result: dict[str, Any] = {
+        'render_size': list(instance.screen.size),
+        'resize': resize_ms,
+        'menus': {},
+    }
+    for name, menu in instance.menus.items():
+        result['menus'][name] = measure_menu(instance, menu, repeats, scroll_steps)
+    result['menus']['top_tray'] = measure_tray(instance.top_tray, repeats)
+    result['menus']['bot_tray'] = measure_tray(instance.bot_tray, repeats)
+    return result
+
+def get_timings(results: dict[str, Any]) -> dict[str, float]:
+    """Flatten the results to 'resolution menu phase' -> ms, for comparing."""
+
+    timings: dict[str, float] = {}
+    for resolution, result in results['resolutions'].items():
+        timings[f"{resolution} resize"] = result['resize']
+        for name, menu in result['menus'].items():
+            for phase in PHASES:
+                if phase in menu:
+                    timings[f"{resolution} {name} {phase}"] = menu[phase]
+            for element, costs in menu['elements'].items():
+                timings[f"{resolution} {name} {element} build"] = costs['build']
+                timings[f"{resolution} {name} {element} draw"] = costs['draw']
+    return timings
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--scroll-steps", type=int, default=20,
+                        help="mouse wheel steps down, then as many up")
+    parser.add_argument("--top", type=int, default=10,
+                        help="slowest elements listed")
+    parser.add_argument("--output", type=Path,
+                        help="write the results to this json file")
+    parser.add_argument("--compare", type=Path, nargs="?", const=BASELINE_PATH,
+                        help="compare with these results (the baseline by default)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown, relative to the baseline")
+    parser.add_argument("--min-ms", type=float, default=0.05,
+                        help="baseline timings shorter than this are not compared")
+    args = parser.parse_args()
+
+    baseline_results: dict[str, Any] = {}
+    if args.compare is not None and args.compare.exists():
+        baseline_results = json.loads(args.compare.read_text())
+        # medians over other repeats are not the same measurement
+        if baseline_results.get('repeats', None) != args.repeats:
+            parser.error(
+                f"the baseline at {args.compare} was run with --repeats "
+                f"{baseline_results.get('repeats', None)}, not {args.repeats}; "
+                "run with the same, or store a new baseline"
+            )
+
+    data_dir = tempfile.TemporaryDirectory()
+    use_data_dir(data_dir.name)
+
+    instance = game.Game()
+    instance.menus['main'].open()
+    instance._run_frame()
+    instance.start_session()
+    instance._run_frame()
+    # the remap menu shows nothing until a key is picked
+    instance.menus['remap'].keybind = instance.settings.data['keybinds']['fire']
+
+    native_resolution = instance.native_resolution
+    results: dict[str, Any] = {
+        'repeats': args.repeats,
+        'python': platform.python_version(),
+        'time': round(time.time()),
+        'resolutions': {},
+    }
+    for resolution in config.resolutions:
+        key = f"{resolution[0]}x{resolution[1]}"
+        results['resolutions'][key] = measure_resolution(
+            instance, resolution, args.repeats, args.scroll_steps
+        )
+
+    instance.native_resolution = native_resolution
+    instance.quit_session()
+    instance.quit()
+    data_dir.cleanup()
+
+    # menus by resolution
+    for resolution, result in results['resolutions'].items():
+        width, height = result['render_size']
+        print(f"{resolution} (rendered at {width}x{height}), "
+              f"resize {result['resize']:.2f} ms, median ms:")
+        print_table([{
+            'menu': name,
+            'elements': len(menu['elements']),
+            'height': menu['height'],
+            **{phase: f"{menu[phase]:.3f}" for phase in PHASES if phase in menu},
+        } for name, menu in result['menus'].items()],
+            ['menu', 'elements', 'height', *PHASES])
+        print()
+
+    # the slowest elements, at any resolution
+    elements: dict[tuple[str, str], dict[str, float]] = {}
+    for result in results['resolutions'].values():
+        for name, menu in result['menus'].items():
+            for element, costs in menu['elements'].items():
+                slowest = elements.setdefault((name, element), {'build': 0, 'draw': 0})
+                slowest['build'] = max(slowest['build'], costs['build'])
+                slowest['draw'] = max(slowest['draw'], costs['draw'])
+
+    print(f"Slowest {args.top} elements to build, ms at the slowest resolution:")
+    ranked = sorted(elements.items(), key=lambda i: -i[1]['build'])[:args.top]
+    print_table([{
+        'menu': name,
+        'element': element,
+        'build': f"{costs['build']:.3f}",
+        'draw': f"{costs['draw']:.3f}",
+    } for (name, element), costs in ranked], ['menu', 'element', 'build', 'draw'])
+    print()
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=4) + "\n")
+        print(f"Wrote the results to {args.output}.")
+
+    if args.update_baseline:
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(results, indent=4) + "\n")
+        print(f"Stored the baseline at {BASELINE_PATH}.")
+        return 0
+
+    if args.compare is None:
+        return 0
+
+    if not baseline_results:
+        print(f"No results at {args.compare}. Store a baseline with --update-baseline.")
+        return 0
+
+    baseline = get_timings(baseline_results)
+    regressions = [
+        f"{key}: {value:.3f} ms (baseline {baseline[key]:.3f} ms)"
+        for key, value in get_timings(results).items()
+        if key in baseline and baseline[key] >= args.min_ms
+        and value > baseline[key] * (1 + args.tolerance)
+    ]
+
+    if regressions:
+        print("FAIL: slower than the baseline:")
+        for regression in regressions:
+            print(f"\t{regression}")
+        return 1
+
+    print("OK: nothing is slower than the baseline.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
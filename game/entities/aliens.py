@@ -10,13 +10,13 @@ if TYPE_CHECKING:
 import pygame
 
 from .entity import Entity
-from ..utils import config, helper_funcs
+from ..utils import assets, config, helper_funcs
 
 class Alien(Entity):
     """Base class that manages the aliens."""
 
     name: str = "Base Alien"
-    image: pygame.Surface = helper_funcs.load_image(dflt_color="red")
+    image = assets.LazyImage(dflt_color="red")
 
     def __init__(self, game: Game) -> None:
         """Initialize the alien."""
@@ -91,7 +91,8 @@ class Alien(Entity):
     def destroy(self) -> None:
         """Destroy the alien. Handle sounds, animations, etc."""
 
-        # TODO: play sounds and animations
+        self.game.sfx.play('alien_destroyed')
+        # TODO: play animations
         return super().destroy()    
 
 __all__ = ["Alien"]
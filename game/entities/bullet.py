@@ -9,13 +9,13 @@ import pygame
 
 from .entity import Entity
 from .aliens import Alien
-from ..utils import config, helper_funcs
+from ..utils import assets, config, helper_funcs
 
 class Bullet(Entity):
     """A class that represents a bullet fired from the ship."""
 
     name: str = "Base Bullet"
-    image: pygame.Surface = helper_funcs.load_image(None, 'orange', (4, 4))
+    image = assets.LazyImage(None, 'orange', (4, 4))
 
     def __init__(self, game: Game) -> None:
         """Initialize the bullet."""
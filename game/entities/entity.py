@@ -9,7 +9,7 @@ if TYPE_CHECKING:
 
 import pygame
 from pygame.sprite import Sprite
-from ..utils import helper_funcs
+from ..utils import assets, helper_funcs
 
 class BoundsDict(TypedDict):
     """A class representing a dictionary containing entity bounds."""
@@ -26,7 +26,7 @@ class Entity(Sprite):
     """
 
     name = "Base Entity"
-    default_image: pygame.Surface = helper_funcs.load_image()
+    default_image = assets.LazyImage()
 
     def __init__(self,
                  game: Game,
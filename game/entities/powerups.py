@@ -10,14 +10,14 @@ if TYPE_CHECKING:
 import pygame
 
 from .entity import Entity
-from ..utils import config, helper_funcs
+from ..utils import assets, config, helper_funcs
 from ..mechanics import stats, abilities
 
 class PowerUp(Entity):
     """A base class representing a powerup."""
 
     name: str = "Base Powerup"
-    image: pygame.Surface = helper_funcs.load_image(None, "teal", (12, 12))
+    image = assets.LazyImage(None, "teal", (12, 12))
 
     def __init__(self,
                  game: Game,
@@ -68,6 +68,7 @@ class PowerUp(Entity):
         Child classes should augment this method.
         """
 
+        self.game.sfx.play('powerup_collected')
         self.destroy()
     
 class ImproveStat(PowerUp):
@@ -76,7 +77,7 @@ class ImproveStat(PowerUp):
     """
 
     name = "Improve Stat"
-    image: pygame.Surface = helper_funcs.load_image(None, "cadetblue1", (12, 12))
+    image = assets.LazyImage(None, "cadetblue1", (12, 12))
 
     def __init__(self,
                  game: Game,
@@ -112,7 +113,7 @@ class AddAbility(PowerUp):
     """A class representing a powerup that grants the ship an ability."""
 
     name: str = "Add Ability"
-    image: pygame.Surface = helper_funcs.load_image(None, "peru", (12, 12))
+    image = assets.LazyImage(None, "peru", (12, 12))
 
     def __init__(self,
                  game: Game,
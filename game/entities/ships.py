@@ -14,7 +14,7 @@ from .aliens import Alien
 from .bullet import Bullet
 from .powerups import PowerUp
 from ..mechanics import abilities as abs, stats
-from ..utils import config, helper_funcs
+from ..utils import assets, config
 
 class StatsDict(TypedDict):
     
@@ -60,7 +60,7 @@ class Ship(Entity):
 
     name: str = "Base Ship"
     description: str = "The basic ship. Parent class to other ships."
-    image: pygame.Surface = helper_funcs.load_image(None, 'green')
+    image = assets.LazyImage(None, 'green')
 
     def __init__(self,
                  game: Game,
@@ -208,6 +208,7 @@ class Ship(Entity):
         if self.game.touch and self.game.touch.touch_start_ts:
             return
         
+        old_destination = self.destination
         if self.moving_left and self.moving_right:
             self.destination = None
         elif not self.moving_left and not self.moving_right:
@@ -216,6 +217,10 @@ class Ship(Entity):
             self.destination = (self.bounds["left"], self.y)
         elif self.moving_right:
             self.destination = (self.bounds["right"], self.y)
+        
+        if self.destination != old_destination:
+            # steered with the keys or a gamepad
+            self.game.latency.mark_effect('key', 'gamepad')
     
     def take_damage(self, damage: int) -> None:
         """
@@ -225,10 +230,11 @@ class Ship(Entity):
 
         self.stats['hit_points'].modify_stat(-damage)
         self.game.bot_tray.update()
+        self.game.sfx.play('ship_hit')
 
         if self.stats['hit_points'].value <= 0:
             # TODO: replace this with a 'lose_session' menu
-            self.game.quit_session()
+            self.game.end_session()
 
     # region COLLISION CHECKING
     # -------------------------------------------------------------------
@@ -268,15 +274,17 @@ class Ship(Entity):
     # -------------------------------------------------------------------
     # endregion collision checking
 
-    def fire_bullet(self, fire_rate_bonus: int = 0) -> None:
-        """Fire a bullet."""
+    def fire_bullet(self, fire_rate_bonus: int = 0) -> bool:
+        """Fire a bullet. Return True if the bullet was fired."""
 
         fire_rate = self.stats['fire_rate'].value + fire_rate_bonus
         if self.bullet_cooldown_ms < self.bullet_delay_ms / fire_rate:
-            return
+            return False
 
         self.game.bullets.add(Bullet(self.game))
         self.bullet_cooldown_ms = 0
+        self.game.sfx.play('bullet_fired')
+        return True
     
     # region ABILITY SLOTS AND ABILITIES
     # -------------------------------------------------------------------
@@ -347,7 +355,7 @@ class SpearFish(Ship):
 
     name = "SpearFish"
     description = "A ship with a high fire rate and the Spear passive ability."
-    image = helper_funcs.load_image(None, 'darkslategray3', (20, 28))
+    image = assets.LazyImage(None, 'darkslategray3', (20, 28))
 
     def __init__(self, game: Game) -> None:
         """Initialize the SpearFish."""
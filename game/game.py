@@ -3,16 +3,20 @@ A module containing the main Game class,
 which manages the game as a whole.
 """
 
+from typing import Callable
+
 import pygame
 from pygame import sprite
 
 from .systems import *
 from .entities import *
 from .input import *
-from .ui import menus, trays
+from .perf import *
+from .ui import menus, trays, overlays
 from .utils import config, events
 from .mechanics import upgrades, rewards
 from .utils import helper_funcs
+from .utils.asset_loader import get_loader
 
 class Game:
     """Class that represents the game object."""
@@ -20,7 +24,9 @@ class Game:
     def __init__(self) -> None:
         """Initialize the core game object."""
         
+        self.startup = StartupTimeline()
         pygame.init()
+        self.startup.lap('pygame_init')
 
         self.game_running: bool = True
 
@@ -36,23 +42,48 @@ class Game:
         # ---
 
         self._configure_display()
+        self.startup.lap('display')
 
         self.touch = Touch()
+        self.event_pump = EventPump()
+        self.save_service = SaveService()
         self.settings = Settings(self)
+        self._make_actions()
+        self.startup.lap('settings')
+        self.latency = LatencyTracker(self)
+        self.profiler = FrameProfiler(self)
+        self.telemetry = SessionTelemetry(self)
+        self.history = SessionHistory(self)
         self.clock = pygame.time.Clock()
         self.dt = 0
         self.fps = 0
         self.state = State()
+        self.gc_policy = GCPolicy(self)
+        self.memory = MemoryInspector(self)
+        self.tracer = get_tracer()
+        if config.record_trace:
+            self.tracer.start()
+        if self.tracer.enabled:
+            self.profiler.enable("Tracer")
+        self.startup.lap('instrumentation')
         self._make_upgrades()
         self._make_rewards()
+        self.startup.lap('upgrades_rewards')
         self.progress = Progress(self)
         self._load_saved_upgrades()
         self._load_saved_rewards()
+        self.startup.lap('progress')
 
+        self.sound_bank = SoundBank()
         self.music_player = MusicPlayer(self)
+        self.sfx = SoundEffects(self)
+        self.startup.lap('audio')
         self.drop_manager = RandomDropManager(self)
+        self.snapshot = SessionSnapshot(self)
 
         self._make_menus()
+        self.profiler_overlay = overlays.ProfilerOverlay(self)
+        self.startup.lap('menus')
 
         self.default_ship_class = ships.Ship
         self.ship_class = self.default_ship_class
@@ -62,6 +93,7 @@ class Game:
                 # re-toggle to start with the correct ship
                 ship_reward.toggle_on()
                 break
+        self.startup.lap('ship_class')
     
     # region INIT HELPER FUNCTIONS
     # -------------------------------------------------------------------
@@ -115,6 +147,35 @@ class Game:
                 elif isinstance(reward, rewards.ToggleableReward):
                     reward.is_toggled_on = saved[reward.name]['is_claimed_or_toggled']
 
+    def _make_actions(self) -> None:
+        """Set up the actions triggered by keybinds and gamepads."""
+
+        self.action_map = ActionMap(self.settings)
+        am = self.action_map
+
+        # registration order is the priority order for shared keys
+        am.register('cancel', lambda: self.menus['pause'].open())
+        am.register(
+            'move_left',
+            lambda: self._set_ship_moving('left', True),
+            lambda: self._set_ship_moving('left', False)
+        )
+        am.register(
+            'move_right',
+            lambda: self._set_ship_moving('right', True),
+            lambda: self._set_ship_moving('right', False)
+        )
+        am.register('fire', self._start_firing, self._stop_firing)
+
+        for slot_name in ('active_1', 'active_2', 'active_3',
+                          'passive_1', 'passive_2', 'passive_3', 'passive_4'):
+            am.register(slot_name, self._make_slot_toggle(slot_name))
+
+    def _make_slot_toggle(self, slot_name: str) -> Callable[[], None]:
+        """Return a function which toggles the given ability slot."""
+
+        return lambda: self.ship.ability_slots[slot_name].toggle()
+
     def _make_menus(self) -> None:
         """Load all the menus."""
 
@@ -132,22 +193,69 @@ class Game:
     # -------------------------------------------------------------------
     # endregion init helper functions
     
-    def run(self) -> None:
-        """Run the game loop."""
+    def run(self, max_frames: int | None = None) -> None:
+        """
+        Run the game loop. If max_frames is given, quit after running
+        that many frames (used by the benchmarks).
+        """
 
         self.menus['main'].open()
+        self.startup.lap('main_menu')
         self.music_player.load_sequence("main_menu.json", True)
+        self.startup.lap('first_sequence')
 
+        # continue a session that was suspended when the game closed
+        self.snapshot.load()
+        self.startup.lap('snapshot')
+
+        frames = 0
         while self.game_running:
+            self._run_frame()
+            if frames == 0:
+                self.startup.finish('first_frame')
+                # what is loaded by now lives as long as the game
+                self.gc_policy.freeze()
+
+            frames += 1
+            if max_frames is not None and frames >= max_frames:
+                self.quit()
+        
+        pygame.quit()
+
+    def _run_frame(self) -> None:
+        """Run a single iteration of the game loop."""
+
+        with self.tracer.trace('frame', 'frame'):
+            self.profiler.begin_frame()
             self._handle_events()
+            self.profiler.lap('events')
             self._update()
             self._draw()
+            if self.state.session_over:
+                self.quit_session()
+            self.gc_policy.end_frame()
+            self.profiler.lap('gc')
 
             # control the framerate and timing
             self.dt = self.clock.tick(self.settings.data["fps"]) / 1000
             self.fps = int(self.clock.get_fps())
-        
-        pygame.quit()
+            self.profiler.lap('idle')
+            self.telemetry.record_frame()
+
+        self._trace_entity_counts()
+        self.tracer.submit()
+
+    def _trace_entity_counts(self) -> None:
+        """Record the number of entities in the trace, once per frame."""
+
+        if not self.tracer.enabled or not self.state.session_running:
+            return
+
+        self.tracer.counter('entities', {
+            'aliens': len(self.aliens),
+            'bullets': len(self.bullets),
+            'powerups': len(self.powerups),
+        })
 
     # region GAME FLOW HELPER FUNCTIONS
     # -------------------------------------------------------------------
@@ -169,6 +277,9 @@ class Game:
         self.powerups: sprite.Group[sprite.Sprite] = sprite.Group()
 
         self.spawn_manager = SpawnManager(self)
+        self.telemetry.start()
+        self.gc_policy.begin_session()
+        self.memory.take_snapshot()
 
         self.menus['main'].close()
         self.music_player.load_sequence("test.json", True)
@@ -186,21 +297,72 @@ class Game:
         print("\nLevel:", self.state.level)
         self.spawn_manager.level_up()
         self.spawn_manager.spawn_wave()
+        self.gc_policy.collect('level_up')
+        self.memory.take_snapshot()
     
+    def end_session(self) -> None:
+        """
+        End the session once the current frame is over. Entities call
+        this rather than quit_session, which releases them while they
+        are still being updated.
+        """
+
+        self.state.session_over = True
+
     def quit_session(self) -> None:
         """Quit the session and return to the main menu."""
 
         self.state.session_running = False
+        self.state.session_over = False
+        self.telemetry.finish()
+        self.history.record_session()
+        self.snapshot.discard()
+        self.sfx.stop()
         self.progress.update()
 
         # check for unlocked rewards
         for reward in self.rewards.values():
             reward.unlock()
 
-        # TODO: clear the game objects ??
+        self._tear_down_session()
+        self.gc_policy.end_session()
         self.menus['main'].open()
         self.music_player.load_sequence("main_menu.json", True)
     
+    def abandon_session(self) -> None:
+        """
+        Return to the main menu from a session that could not be set up,
+        without recording it or counting its progress.
+        """
+
+        if not self.state.session_running:
+            return
+
+        self.state.session_running = False
+        self.state.session_over = False
+        self.telemetry.finish()
+        self.sfx.stop()
+        self._tear_down_session()
+        self.gc_policy.end_session()
+        self.menus['main'].open()
+        self.music_player.load_sequence("main_menu.json", True)
+
+    def _tear_down_session(self) -> None:
+        """
+        Release the session's entities, trays and spawn manager, so that
+        nothing keeps them, or the game through them, alive until the
+        next session replaces them.
+        """
+
+        for group in (self.aliens, self.bullets, self.powerups):
+            group.empty()
+
+        # only read while a session runs; entities end it with end_session
+        del self.ship
+        del self.top_tray, self.bot_tray
+        del self.spawn_manager
+        del self.aliens, self.bullets, self.powerups
+
     def quit(self) -> None:
         """Handle quitting the game."""
 
@@ -208,6 +370,16 @@ class Game:
         if self.state.session_running:
             self.quit_session()
         
+        if self.latency.enabled:
+            print(self.latency)
+
+        # make sure every save reaches the disk before exiting
+        self.save_service.close()
+        self.history.close()
+        get_loader().shutdown()
+        self.gc_policy.release()
+        self.tracer.stop()
+        
         self.game_running = False
     
     # -------------------------------------------------------------------
@@ -332,10 +504,21 @@ class Game:
         self.native_resolution = next_res
         self._handle_resize_event()
 
+    def toggle_tracing(self) -> None:
+        """Start or stop tracing, and the profiler whose laps it traces."""
+
+        self.tracer.toggle()
+        if self.tracer.enabled:
+            self.profiler.enable("Tracer")
+        else:
+            self.profiler.disable("Tracer")
+
     def _handle_events(self) -> None:
         """Handle user input and window events."""
 
-        for event in pygame.event.get():
+        for event in self.event_pump.get():
+            self.latency.record_input(event)
+
             if event.type == pygame.QUIT:
                 self.quit()
             
@@ -362,43 +545,34 @@ class Game:
             
             elif event.type == pygame.MOUSEMOTION:
                 self._handle_mousemove_event(event)
+            
+            elif event.type in (pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP):
+                self._handle_joybutton_event(event)
+            
+            elif event.type == pygame.JOYDEVICEADDED:
+                self.action_map.connect_gamepad(event.device_index)
+            
+            elif event.type == pygame.JOYDEVICEREMOVED:
+                self.action_map.disconnect_gamepad(event.instance_id)
                 
     def _handle_keydown_events(self, event: pygame.Event) -> None:
         """Handle what happens when certain keys are pressed."""
         
         self.menus['remap'].listen_for_key(event.key)
 
-        if event.key == pygame.K_BACKSPACE:
+        if event.key == config.debug_keys['cycle_resolutions']:
             self._cycle_resolutions()
+        elif event.key == config.debug_keys['profiler_overlay']:
+            self.profiler_overlay.toggle()
+        elif event.key == config.debug_keys['memory_report']:
+            self.memory.dump()
+        elif event.key == config.debug_keys['trace']:
+            self.toggle_tracing()
 
         if not self.state.session_running:
             return
         
-        if event.key == self.settings.data['keybinds']['cancel'].keycode:
-            self.menus['pause'].open()
-
-        elif event.key == self.settings.data['keybinds']['move_left'].keycode:
-            self.ship.moving_left = True
-        elif event.key == self.settings.data['keybinds']['move_right'].keycode:
-            self.ship.moving_right = True
-        elif event.key == self.settings.data['keybinds']['fire'].keycode:
-            self.ship.fire_bullet()
-            self.ship.start_ability_charge()
-
-        elif event.key == self.settings.data['keybinds']['active_1'].keycode:
-            self.ship.ability_slots['active_1'].toggle()
-        elif event.key == self.settings.data['keybinds']['active_2'].keycode:
-            self.ship.ability_slots['active_2'].toggle()
-        elif event.key == self.settings.data['keybinds']['active_3'].keycode:
-            self.ship.ability_slots['active_3'].toggle()
-        elif event.key == self.settings.data['keybinds']['passive_1'].keycode:
-            self.ship.ability_slots['passive_1'].toggle()
-        elif event.key == self.settings.data['keybinds']['passive_2'].keycode:
-            self.ship.ability_slots['passive_2'].toggle()
-        elif event.key == self.settings.data['keybinds']['passive_3'].keycode:
-            self.ship.ability_slots['passive_3'].toggle()
-        elif event.key == self.settings.data['keybinds']['passive_4'].keycode:
-            self.ship.ability_slots['passive_4'].toggle()
+        self.action_map.press_key(event.key)
                 
     def _handle_keyup_events(self, event: pygame.Event) -> None:
         """Handle what happens when certain keys are released."""
@@ -406,12 +580,38 @@ class Game:
         if not self.state.session_running:
             return
 
-        if event.key == self.settings.data['keybinds']['move_left'].keycode:
-            self.ship.moving_left = False
-        elif event.key == self.settings.data['keybinds']['move_right'].keycode:
-            self.ship.moving_right = False
-        elif event.key == self.settings.data['keybinds']['fire'].keycode:
-            self.ship.stop_ability_charge()
+        self.action_map.release_key(event.key)
+    
+    def _handle_joybutton_event(self, event: pygame.Event) -> None:
+        """Handle what happens when a gamepad button is pressed or released."""
+
+        if not self.state.session_running:
+            return
+        
+        if event.type == pygame.JOYBUTTONDOWN:
+            self.action_map.press_button(event.button)
+        else:
+            self.action_map.release_button(event.button)
+    
+    def _set_ship_moving(self, direction: str, moving: bool) -> None:
+        """Start or stop moving the ship in the given direction."""
+
+        if direction == 'left':
+            self.ship.moving_left = moving
+        elif direction == 'right':
+            self.ship.moving_right = moving
+    
+    def _start_firing(self) -> None:
+        """Fire a bullet and start charging the active abilities."""
+
+        if self.ship.fire_bullet():
+            self.latency.mark_effect('key', 'gamepad')
+        self.ship.start_ability_charge()
+    
+    def _stop_firing(self) -> None:
+        """Stop charging the active abilities."""
+
+        self.ship.stop_ability_charge()
     
     def _handle_resize_event(self) -> None:
         """Handle what happens when the window is resized."""
@@ -484,12 +684,10 @@ class Game:
             return
         
         # otherwise, control the ship
-        self.ship.fire_bullet()
+        if self.ship.fire_bullet():
+            self.latency.mark_effect('touch')
         self.ship.start_ability_charge()
-        self.ship.destination = (
-            self.touch.current_pos[0] - round(self.ship.rect.width / 2),
-            self.ship.y
-        )
+        self._steer_ship_to_touch()
     
     def _handle_mouseup_event(self, event: pygame.Event) -> None:
         """
@@ -552,10 +750,21 @@ class Game:
             return
 
         # move the ship
-        self.ship.destination = (
+        self._steer_ship_to_touch()
+    
+    def _steer_ship_to_touch(self) -> None:
+        """Set the ship's destination under the current touch."""
+
+        if self.touch.current_pos is None:
+            return
+
+        destination = (
             self.touch.current_pos[0] - round(self.ship.rect.width / 2),
             self.ship.y
         )
+        if destination != self.ship.destination:
+            self.ship.destination = destination
+            self.latency.mark_effect('touch', 'touch_move')
 
     # -------------------------------------------------------------------
     # endregion
@@ -586,14 +795,21 @@ class Game:
         
         self.state.track_duration()
         self._update_each_second()
+        # the level up, and its collection, are not spawning
+        self.profiler.lap('level')
 
         self.spawn_manager.spawn_random()
+        self.profiler.lap('spawn')
 
         # TODO: use an "entity" group to update them
         self.ship.update()
+        self.profiler.lap('ship')
         self.aliens.update()
+        self.profiler.lap('aliens')
         self.bullets.update()
+        self.profiler.lap('bullets')
         self.powerups.update()
+        self.profiler.lap('powerups')
     # -------------------------------------------------------------------
     # endregion
 
@@ -603,7 +819,25 @@ class Game:
         if self.touch:
             self.touch.track_touch_duration()
 
+        self.music_player.poll()
+        self.sound_bank.poll()
+        self._swap_loaded_images()
+        self.profiler.lap('poll')
         self._update_session()
+
+    def _swap_loaded_images(self) -> None:
+        """
+        Draw the images decoded in the background over their placeholders,
+        and redraw the menus showing them.
+        """
+
+        if not get_loader().poll():
+            return
+
+        for menu in self.menus.values():
+            if not isinstance(menu, menus.Menu):
+                continue
+            menu.needs_redraw = True
     
     # region DRAW HELPER FUNCTIONS
     # -------------------------------------------------------------------
@@ -617,21 +851,26 @@ class Game:
         # first, clear the play surface by drawing the background
         # TODO: use a background image
         pygame.draw.rect(self.play_surf, "yellow", self.play_rect)
+        self.profiler.lap('draw_clear')
 
         # TODO: use an entities group to draw the entities
         self.ship.draw()
+        self.profiler.lap('draw_ship')
         for bullet in self.bullets:
             if not isinstance(bullet, Bullet):
                 continue
             bullet.draw()
+        self.profiler.lap('draw_bullets')
         for powerup in self.powerups:
             if not isinstance(powerup, powerups.PowerUp):
                 continue
             powerup.draw()
+        self.profiler.lap('draw_powerups')
         for alien in self.aliens:
             if not isinstance(alien, Alien):
                 continue
             alien.draw()
+        self.profiler.lap('draw_aliens')
 
         # draw the play surface
         self.screen.blit(self.play_surf)
@@ -640,6 +879,7 @@ class Game:
         self.bot_tray.needs_redraw = True
         self.top_tray.draw()
         self.bot_tray.draw()
+        self.profiler.lap('draw_trays')
 
     # -------------------------------------------------------------------
     # endregion
@@ -647,14 +887,20 @@ class Game:
     def _draw(self) -> None:
         """Draw to the screen."""
 
-        self._draw_session()     
+        self._draw_session()
                 
         for menu in self.menus.values():
             if not isinstance(menu, menus.Menu):
                 continue
             menu.draw()
+        self.profiler.lap('menus')
+
+        self.profiler_overlay.draw()
+        self.profiler.lap('overlay')
 
         # draw everything to the screen
         pygame.display.flip()
+        self.profiler.lap('flip')
+        self.latency.frame_presented()
 
 __all__ = ["Game"]
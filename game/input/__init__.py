@@ -1,3 +1,5 @@
 """Initialize the input package."""
 
+from .actions import *
+from .event_pump import *
 from .touch import *
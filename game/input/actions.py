@@ -0,0 +1,158 @@
+"""
+Module which contains the ActionMap class, which maps keys and gamepad
+buttons to the actions they trigger.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable
+if TYPE_CHECKING:
+    from ..systems.settings import Settings
+
+import pygame
+
+from ..utils import config
+
+class ActionMap():
+    """
+    A class which compiles the keybinds into lookup tables,
+    so a key or button press is dispatched to its action directly.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        """Initialize the action map."""
+
+        self.settings: Settings = settings
+
+        # actions in order of priority, if they share a key
+        self.actions: list[str] = []
+        self.press_handlers: dict[str, Callable[[], None]] = {}
+        self.release_handlers: dict[str, Callable[[], None]] = {}
+
+        # compiled tables
+        self.key_press: dict[int, Callable[[], None]] = {}
+        self.key_release: dict[int, Callable[[], None]] = {}
+        self.button_press: dict[int, Callable[[], None]] = {}
+        self.button_release: dict[int, Callable[[], None]] = {}
+        self.compiled_version: int | None = None
+
+        self.gamepads: dict[int, pygame.joystick.JoystickType] = {}
+
+    def register(self,
+                 action: str,
+                 on_press: Callable[[], None] | None = None,
+                 on_release: Callable[[], None] | None = None
+                 ) -> None:
+        """
+        Register the handlers for the action with the given name.
+        The name should match a key in the KeybindsDict.
+        """
+
+        if action not in self.actions:
+            self.actions.append(action)
+        if on_press:
+            self.press_handlers[action] = on_press
+        if on_release:
+            self.release_handlers[action] = on_release
+
+        self.compiled_version = None
+
+    def get_keycodes(self, action: str) -> tuple[int, ...]:
+        """Return all the keycodes bound to the given action."""
+
+        keycodes: tuple[int, ...] = ()
+        keybind = self.settings.data['keybinds'].get(action, None)
+        if keybind is not None:
+            keycodes += (keybind.keycode,)
+        keycodes += config.extra_keybinds.get(action, ())
+
+        return keycodes
+
+    def rebuild(self) -> None:
+        """Compile the keybinds and gamepad buttons into the tables."""
+
+        self.key_press = {}
+        self.key_release = {}
+        self.button_press = {}
+        self.button_release = {}
+
+        for action in self.actions:
+            press = self.press_handlers.get(action, None)
+            release = self.release_handlers.get(action, None)
+
+            # the first registered action keeps a shared key
+            for keycode in self.get_keycodes(action):
+                if press:
+                    self.key_press.setdefault(keycode, press)
+                if release:
+                    self.key_release.setdefault(keycode, release)
+
+            for button in config.gamepad_buttons.get(action, ()):
+                if press:
+                    self.button_press.setdefault(button, press)
+                if release:
+                    self.button_release.setdefault(button, release)
+
+        self.compiled_version = self.settings.keybinds_version
+
+    def _ensure_compiled(self) -> None:
+        """Rebuild the tables if the keybinds changed since last time."""
+
+        if self.compiled_version != self.settings.keybinds_version:
+            self.rebuild()
+
+    def press_key(self, keycode: int) -> bool:
+        """Trigger the action bound to the key. Return True if any."""
+
+        self._ensure_compiled()
+        handler = self.key_press.get(keycode, None)
+        if handler is None:
+            return False
+
+        handler()
+        return True
+
+    def release_key(self, keycode: int) -> bool:
+        """Trigger the release of the action bound to the key."""
+
+        self._ensure_compiled()
+        handler = self.key_release.get(keycode, None)
+        if handler is None:
+            return False
+
+        handler()
+        return True
+
+    def press_button(self, button: int) -> bool:
+        """Trigger the action bound to the gamepad button."""
+
+        self._ensure_compiled()
+        handler = self.button_press.get(button, None)
+        if handler is None:
+            return False
+
+        handler()
+        return True
+
+    def release_button(self, button: int) -> bool:
+        """Trigger the release of the action bound to the button."""
+
+        self._ensure_compiled()
+        handler = self.button_release.get(button, None)
+        if handler is None:
+            return False
+
+        handler()
+        return True
+
+    def connect_gamepad(self, device_index: int) -> None:
+        """Open a newly connected gamepad, so it sends events."""
+
+        gamepad = pygame.joystick.Joystick(device_index)
+        self.gamepads[gamepad.get_instance_id()] = gamepad
+
+    def disconnect_gamepad(self, instance_id: int) -> None:
+        """Forget a gamepad which was disconnected."""
+
+        self.gamepads.pop(instance_id, None)
+
+__all__ = ["ActionMap"]
@@ -0,0 +1,145 @@
+"""
+Module which contains the EventPump class, which filters and coalesces
+the events from the pygame event queue before the game handles them.
+"""
+
+from typing import TypedDict
+
+import pygame
+
+from ..utils import events
+
+class EventStatsDict(TypedDict):
+    """
+    A class representing a dictionary containing the event pump stats.
+    The 'frame_' values are reset on each call to EventPump.get.
+    """
+
+    received: int
+    processed: int
+    coalesced: int
+    frame_received: int
+    frame_processed: int
+
+def _get_event_types() -> list[int]:
+    """Return every event type pygame has a constant for."""
+
+    return sorted({
+        value for name, value in vars(pygame.constants).items()
+        if name.isupper() and isinstance(value, int)
+        and pygame.event.event_name(value) not in ('Unknown', 'UserEvent')
+    })
+
+class EventPump():
+    """
+    A class which restricts the event queue to the event types
+    the game handles, and collapses mouse motion events.
+    """
+
+    # event types the game responds to; everything else is blocked
+    handled_types: tuple[int, ...] = (
+        pygame.QUIT,
+        events.MUSIC_STEP_FINISHED,
+        pygame.KEYDOWN,
+        pygame.KEYUP,
+        pygame.WINDOWSIZECHANGED,
+        pygame.MOUSEBUTTONDOWN,
+        pygame.MOUSEBUTTONUP,
+        pygame.MOUSEWHEEL,
+        pygame.MOUSEMOTION,
+        pygame.JOYBUTTONDOWN,
+        pygame.JOYBUTTONUP,
+        pygame.JOYDEVICEADDED,
+        pygame.JOYDEVICEREMOVED,
+    )
+
+    def __init__(self) -> None:
+        """Initialize the event pump and restrict the event queue."""
+
+        self.allowed_types: set[int] = set(EventPump.handled_types)
+        self._apply_allowed()
+
+        self.stats: EventStatsDict = {
+            'received': 0,
+            'processed': 0,
+            'coalesced': 0,
+            'frame_received': 0,
+            'frame_processed': 0
+        }
+
+    def _apply_allowed(self) -> None:
+        """Block every event type, except the allowed ones."""
+
+        # set_blocked(None) changes the state of all 65536 SDL event
+        # types, which takes ~30 ms at startup; pygame's types are enough
+        pygame.event.set_blocked(_get_event_types())
+        pygame.event.set_allowed(list(self.allowed_types))
+
+    def allow(self, *event_types: int) -> None:
+        """Let additional event types through to the queue."""
+
+        self.allowed_types.update(event_types)
+        pygame.event.set_allowed(list(event_types))
+
+    def get(self) -> list[pygame.Event]:
+        """
+        Return the queued events, in order. A run of consecutive
+        mouse motion events is collapsed into its latest position, so
+        discrete events (clicks, keys) keep their place in the order.
+        """
+
+        queued = pygame.event.get()
+
+        processed: list[pygame.Event] = []
+        run: list[pygame.Event] = []
+        for event in queued:
+            if event.type == pygame.MOUSEMOTION:
+                run.append(event)
+                continue
+            if run:
+                processed.append(self._collapse_motion(run))
+                run = []
+            processed.append(event)
+        if run:
+            processed.append(self._collapse_motion(run))
+
+        self.stats['frame_received'] = len(queued)
+        self.stats['frame_processed'] = len(processed)
+        self.stats['received'] += len(queued)
+        self.stats['processed'] += len(processed)
+        self.stats['coalesced'] += len(queued) - len(processed)
+
+        return processed
+
+    def _collapse_motion(self, run: list[pygame.Event]) -> pygame.Event:
+        """
+        Return a single motion event at the latest position,
+        with the relative movement of the whole run.
+        """
+
+        latest = run[-1]
+        if len(run) == 1:
+            return latest
+
+        rel_x = 0
+        rel_y = 0
+        for event in run:
+            rel_x += event.rel[0]
+            rel_y += event.rel[1]
+
+        attrs = dict(latest.dict)
+        attrs['rel'] = (rel_x, rel_y)
+        return pygame.event.Event(pygame.MOUSEMOTION, attrs)
+
+    def __str__(self) -> str:
+        """Returns a readable string containing the event stats."""
+
+        return f"""
+EventPump stats:
+    Received:           {self.stats['received']}
+    Processed:          {self.stats['processed']}
+    Coalesced:          {self.stats['coalesced']}
+    Last frame:         {self.stats['frame_received']} -> {self.stats['frame_processed']}
+"""
+
+__all__ = ["EventPump"]
@@ -10,14 +10,14 @@ if TYPE_CHECKING:
 
 import pygame
 
-from ..utils import helper_funcs
+from ..utils import assets, helper_funcs
 
 class Ability():
     """A grandparent class representing a ship's ability."""
 
     name: str = "Base Ability"
     description: str = "Base Ability description."
-    image: pygame.Surface = helper_funcs.load_image(None, 'gray', (10, 10))
+    image = assets.LazyImage(None, 'gray', (10, 10))
 
     def __init__(self,
                  game: Game,
@@ -65,7 +65,7 @@ class Active(Ability):
 
     name: str = "Base Active Ability"
     description: str = "Base Active Ability description."
-    image: pygame.Surface = helper_funcs.load_image(None, 'gray', (10, 10))
+    image = assets.LazyImage(None, 'gray', (10, 10))
 
     def __init__(self,
                  game: Game,
@@ -99,7 +99,7 @@ class Passive(Ability):
 
     name: str = "Base Passive Ability"
     description: str = "Base Passive Ability description."
-    image: pygame.Surface = helper_funcs.load_image(None, 'gray', (10, 10))
+    image = assets.LazyImage(None, 'gray', (10, 10))
 
     def __init__(self,
                  game: Game,
@@ -135,7 +135,7 @@ class DeathPulse(Active):
 
     name: str = "Death Pulse"
     description: str = "Deals damage to all enemies on screen."
-    image: pygame.Surface = helper_funcs.load_image(None, 'red', (10, 10))
+    image = assets.LazyImage(None, 'red', (10, 10))
 
     def __init__(self,
                  game: Game,
@@ -156,6 +156,8 @@ class DeathPulse(Active):
         base_fp = self.game.ship.stats['fire_power'].value
         from ..entities import Alien
 
+        self.game.sfx.play('death_pulse')
+
         for alien in self.game.aliens:
             if not isinstance(alien, Alien):
                 continue
@@ -171,7 +173,7 @@ class Spear(Passive):
 
     name: str = "Spear"
     description: str = "Fires a continuous stream of bullets."
-    image: pygame.Surface = helper_funcs.load_image(None, 'purple', (10, 10))
+    image = assets.LazyImage(None, 'purple', (10, 10))
 
     def __init__(self,
                  game: Game,
@@ -201,16 +203,16 @@ class Slot():
     class SlotImagesDict(TypedDict):
         """A class representing a dictionary of slot images."""
 
-        blank_active: pygame.Surface
-        blank_passive: pygame.Surface
-        locked_active: pygame.Surface
-        locked_passive: pygame.Surface
+        blank_active: assets.LazyImage
+        blank_passive: assets.LazyImage
+        locked_active: assets.LazyImage
+        locked_passive: assets.LazyImage
     
     img_options: SlotImagesDict = {
-        'blank_active': helper_funcs.load_image(None, 'grey', (12, 12)),
-        'blank_passive': helper_funcs.load_image(None, 'grey', (12, 12)),
-        'locked_active': helper_funcs.load_image(None, 'black', (12, 12)),
-        'locked_passive': helper_funcs.load_image(None, 'black', (12, 12)),
+        'blank_active': assets.LazyImage(None, 'grey', (12, 12)),
+        'blank_passive': assets.LazyImage(None, 'grey', (12, 12)),
+        'locked_active': assets.LazyImage(None, 'black', (12, 12)),
+        'locked_passive': assets.LazyImage(None, 'black', (12, 12)),
     }
 
     def __init__(self,
@@ -234,14 +236,14 @@ class Slot():
 
         if not self.is_locked:
             if self.ability_type is Active:
-                self.image = Slot.img_options["blank_active"]
+                self.image = Slot.img_options["blank_active"].get()
             else:
-                self.image = Slot.img_options["blank_passive"]
+                self.image = Slot.img_options["blank_passive"].get()
         else:
             if self.ability_type is Active:
-                self.image = Slot.img_options["locked_active"]
+                self.image = Slot.img_options["locked_active"].get()
             else:
-                self.image = Slot.img_options["locked_passive"]
+                self.image = Slot.img_options["locked_passive"].get()
     
     def set_is_locked(self, is_locked: bool):
         """Lock or unlock the slot."""
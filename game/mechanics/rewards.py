@@ -6,7 +6,7 @@ if TYPE_CHECKING:
     from ..game import Game
 
 import pygame
-from ..utils import helper_funcs
+from ..utils import assets, helper_funcs
 
 class Reward():
     """A base class representing a reward."""
@@ -14,7 +14,7 @@ class Reward():
     name: str = "Base Reward"
     instructions: str = "You can't earn this base reward."
     instructions += " This base reward gives nothing."
-    image: pygame.Surface = helper_funcs.load_image(None, 'gray', (10, 10))
+    image = assets.LazyImage(None, 'gray', (10, 10))
 
     def __init__(self,
                  game : Game,
@@ -53,8 +53,7 @@ class Reward():
             return
         
         self.is_unlocked = True
-        self.game.progress.data['rewards'][self.name]['is_unlocked'] = True
-        self.game.progress.save_data()
+        self.game.progress.set_reward_flag(self.name, 'is_unlocked', True)
 
 class ClaimableReward(Reward):
     """A class representing a reward that can be claimed once."""
@@ -62,7 +61,7 @@ class ClaimableReward(Reward):
     name: str = "Base Claimable Reward"
     instructions: str = "You can't earn this base claimable reward."
     instructions += " This base claimable reward gives nothing."
-    image: pygame.Surface = helper_funcs.load_image(None, 'gray', (10, 10))
+    image = assets.LazyImage(None, 'gray', (10, 10))
 
     def __init__(self,
                  game: Game,
@@ -90,12 +89,11 @@ class ClaimableReward(Reward):
         if self.is_claimed:
             return
         
-        self.game.progress.data['credits'] += self.credits
+        self.game.progress.add_credits(self.credits)
         
         # to be augmented by child classes maybe
         self.is_claimed = True
-        self.game.progress.data['rewards'][self.name]['is_claimed_or_toggled'] = True
-        self.game.progress.save_data()
+        self.game.progress.set_reward_flag(self.name, 'is_claimed_or_toggled', True)
 
 class ToggleableReward(Reward):
     """
@@ -107,7 +105,7 @@ class ToggleableReward(Reward):
     name: str = "Base Toggleable Reward"
     instructions: str = "You can't earn this base toggleable reward."
     instructions += " This base toggleable reward gives nothing."
-    image: pygame.Surface = helper_funcs.load_image(None, 'gray', (10, 10))
+    image = assets.LazyImage(None, 'gray', (10, 10))
 
     def __init__(self,
                  game: Game,
@@ -132,16 +130,14 @@ class ToggleableReward(Reward):
 
         # to be augmented by child classes
         self.is_toggled_on = True
-        self.game.progress.data['rewards'][self.name]['is_claimed_or_toggled'] = True
-        self.game.progress.save_data()
+        self.game.progress.set_reward_flag(self.name, 'is_claimed_or_toggled', True)
     
     def toggle_off(self) -> None:
         """Turn the reward off."""
 
         # to be augmented by child classes
         self.is_toggled_on = False
-        self.game.progress.data['rewards'][self.name]['is_claimed_or_toggled'] = False
-        self.game.progress.save_data()
+        self.game.progress.set_reward_flag(self.name, 'is_claimed_or_toggled', False)
 
     def toggle(self) -> None:
         """Toggles the reward on or off."""
@@ -157,7 +153,7 @@ class BakersDozen(ClaimableReward):
     name: str = "Baker's Dozen"
     instructions: str = "Kill at least 13 aliens in a single session"
     instructions += " to earn credit_amount credits."
-    image: pygame.Surface = helper_funcs.load_image(None, 'gold', (10, 10))
+    image = assets.LazyImage(None, 'gold', (10, 10))
 
     def __init__(self, game: Game):
         """Initialize the reward."""
@@ -187,7 +183,7 @@ class SpearFish(ToggleableReward):
     instructions += " to unlock the SpearFish ship."
     from ..entities import SpearFish as spearFishShip
     ship_class: type[spearFishShip] = spearFishShip
-    image: pygame.Surface = helper_funcs.load_image(None, 'darkslategray3', (10, 10))
+    image = assets.LazyImage(None, 'darkslategray3', (10, 10))
 
     def __init__(self, game: Game) -> None:
         """Initialize the reward."""
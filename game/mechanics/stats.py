@@ -7,14 +7,14 @@ if TYPE_CHECKING:
 
 import pygame
 
-from ..utils import config, helper_funcs
+from ..utils import assets, config
 
 class Stat():
     """A base class representing one of the ship's stats."""
 
     name: str = "Base Stat"
     description: str = "An abstract base stat."
-    image: pygame.Surface = helper_funcs.load_image(None, 'gray', (10, 10))
+    image = assets.LazyImage(None, 'gray', (10, 10))
 
     def __init__(self,
                  entity: Entity,
@@ -64,7 +64,7 @@ class HitPoints(Stat):
 
     name: str = "Hit Points"
     description: str = "Represents how much damage the ship can take before being destroyed."
-    image: pygame.Surface = helper_funcs.load_image(None, 'pink', (10, 10))
+    image = assets.LazyImage(None, 'pink', (10, 10))
 
     def __init__(self,
                  entity: Entity,
@@ -82,7 +82,7 @@ class Thrust(Stat):
 
     name: str = "Thrust"
     description: str = "Represents how quickly the ship can move."
-    image: pygame.Surface = helper_funcs.load_image(None, 'yellow', (10, 10))
+    image = assets.LazyImage(None, 'yellow', (10, 10))
 
     def __init__(self,
                  entity: Entity,
@@ -110,7 +110,7 @@ class FirePower(Stat):
 
     name: str = "Fire Power"
     description: str = "Represents the damage dealt by the ship's bullets."
-    image: pygame.Surface = helper_funcs.load_image(None, 'red', (10, 10))
+    image = assets.LazyImage(None, 'red', (10, 10))
 
     def __init__(self,
                  entity: Entity,
@@ -129,7 +129,7 @@ class FireRate(Stat):
 
     name: str = "Fire Rate"
     description: str = "Represents how quickly the ship can fire bullets."
-    image: pygame.Surface = helper_funcs.load_image(None, 'orange', (10, 10))
+    image = assets.LazyImage(None, 'orange', (10, 10))
 
     def __init__(self,
                  entity: Entity,
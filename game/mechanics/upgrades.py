@@ -6,7 +6,7 @@ if TYPE_CHECKING:
     from ..game import Game
     import pygame
 
-from ..utils import helper_funcs
+from ..utils import assets
 from . import abilities, stats
 
 class Upgrade():
@@ -16,7 +16,7 @@ class Upgrade():
     description: str = "An abstract base upgrade."
     max_level: int | None = None
     base_cost: int = 0
-    image: pygame.Surface = helper_funcs.load_image(None, 'gray', (10, 10))
+    image = assets.LazyImage(None, 'gray', (10, 10))
 
     def __init__(self,
                  game: Game,
@@ -79,9 +79,8 @@ class Upgrade():
         
         cost = self.get_cost()
         self.level += 1
-        self.game.progress.data['upgrades'][self.name]['level'] = self.level
-        self.game.progress.data['credits'] -= cost
-        self.game.progress.save_data()
+        self.game.progress.set_upgrade_level(self.name, self.level)
+        self.game.progress.add_credits(-cost)
         # child classes will do additional things
 
 class StatUpgrade(Upgrade):
@@ -113,7 +112,7 @@ class HitPoints(StatUpgrade):
     description: str = "Permanently increase the ship's HP by 1."
     max_level: int | None = None
     base_cost: int = 1200
-    image: pygame.Surface = stats.HitPoints.image
+    image = assets.LazyImage.of(stats.HitPoints)
 
     def __init__(self, game: Game) -> None:
         """Initialize the upgrade."""
@@ -132,7 +131,7 @@ class Thrust(StatUpgrade):
     description: str = "Permanently increase the ship's Thrust by 1."
     max_level: int | None = None
     base_cost: int = 1200
-    image: pygame.Surface = stats.Thrust.image
+    image = assets.LazyImage.of(stats.Thrust)
 
     def __init__(self, game: Game) -> None:
         """Initialize the upgrade."""
@@ -151,7 +150,7 @@ class FirePower(StatUpgrade):
     description: str = "Permanently increase the ship's Fire Power by 1."
     max_level: int | None = None
     base_cost: int = 1200
-    image: pygame.Surface = stats.FirePower.image
+    image = assets.LazyImage.of(stats.FirePower)
 
     def __init__(self, game: Game) -> None:
         """Initialize the upgrade."""
@@ -170,7 +169,7 @@ class FireRate(StatUpgrade):
     description: str = "Permanently increase the ship's Fire Rate by 1."
     max_level: int | None = None
     base_cost: int = 1200
-    image: pygame.Surface = stats.FireRate.image
+    image = assets.LazyImage.of(stats.FireRate)
 
     def __init__(self, game: Game) -> None:
         """Initialize the upgrade."""
@@ -189,7 +188,7 @@ class ActiveSlots(Upgrade):
     description: str = "Unlock an additional Active Ability slot."
     max_level: int | None = 2
     base_cost: int = 36000
-    image: pygame.Surface = abilities.Active.image
+    image = assets.LazyImage.of(abilities.Active)
 
     def __init__(self, game: Game) -> None:
         """Initialize the upgrade."""
@@ -215,7 +214,7 @@ class PassiveSlots(Upgrade):
     description: str = "Unlock an additional Passive Ability slot."
     max_level: int | None = 3
     base_cost: int = 24000
-    image: pygame.Surface = abilities.Passive.image
+    image = assets.LazyImage.of(abilities.Passive)
 
     def __init__(self, game: Game) -> None:
         """Initialize the upgrade."""
@@ -245,7 +244,7 @@ class ChargeTime(Upgrade):
     description += "an Active Ability by 10% of its current value."
     max_level: int | None = None
     base_cost: int = 120
-    image: pygame.Surface = helper_funcs.load_image(None, 'salmon', (10, 10))
+    image = assets.LazyImage(None, 'salmon', (10, 10))
 
     def __init__(self, game: Game) -> None:
         """Initialize the upgrade."""
@@ -274,7 +273,7 @@ class Luck(Upgrade):
     description: str = "Increase the chance of aliens dropping powerups by 1%."
     max_level: int | None = None
     base_cost: int = 480
-    image: pygame.Surface = helper_funcs.load_image(None, 'chartreuse3', (10, 10))
+    image = assets.LazyImage(None, 'chartreuse3', (10, 10))
 
     def __init__(self, game: Game) -> None:
         """Initialize the upgrade."""
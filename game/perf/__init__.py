@@ -0,0 +1,9 @@
+"""Initialize the performance instrumentation package."""
+
+from .gc_policy import *
+from .latency import *
+from .memory import *
+from .profiler import *
+from .startup import *
+from .telemetry import *
+from .tracer import *
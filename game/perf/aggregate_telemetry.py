@@ -0,0 +1,119 @@
+"""
+A command line tool which aggregates the session performance records
+written by SessionTelemetry.
+
+Usage:
+    python -m game.perf.aggregate_telemetry [telemetry_dir]
+"""
+
+from pathlib import Path
+import argparse
+import json
+
+from .telemetry import TelemetryDict
+from ..utils import config
+
+def load_records(directory: str | Path) -> list[TelemetryDict]:
+    """Load all the session records from the given directory."""
+
+    records: list[TelemetryDict] = []
+    for path in sorted(Path(directory).glob("session_*.json")):
+        try:
+            records.append(json.loads(path.read_text()))
+        except Exception as e:
+            print(f"Skipping {path}: {e}")
+
+    return records
+
+def _histogram_percentile(histogram: dict[int, int], pct: float) -> int:
+    """Return the bucket (in whole ms) at the given percentile."""
+
+    total = sum(histogram.values())
+    if total == 0:
+        return 0
+
+    target = pct / 100 * total
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= target:
+            return bucket
+
+    return max(histogram)
+
+def aggregate(records: list[TelemetryDict]) -> str:
+    """Return a readable summary of the records across sessions."""
+
+    if not records:
+        return "No session records found."
+
+    histogram: dict[int, int] = {}
+    phase_totals: dict[str, float] = {}
+    peaks: dict[str, int] = {}
+    rebuilds: dict[str, int] = {}
+    frames = 0
+    worst = 0.0
+    gc_count = 0
+    gc_total = 0.0
+    gc_max = 0.0
+    gc_safe_count = 0
+    gc_safe_total = 0.0
+
+    for record in records:
+        frames += record['frames']
+        worst = max(worst, record['frame_times']['max'])
+        for ms, count in record['histogram'].items():
+            histogram[int(ms)] = histogram.get(int(ms), 0) + count
+        for phase, ms in record['phase_totals'].items():
+            phase_totals[phase] = phase_totals.get(phase, 0) + ms
+        for group, peak in record['peak_entities'].items():
+            peaks[group] = max(peaks.get(group, 0), peak)
+        for name, count in record['rebuilds'].items():
+            rebuilds[name] = rebuilds.get(name, 0) + count
+        gc_count += record['gc_pauses']['count']
+        gc_total += record['gc_pauses']['total_ms']
+        gc_max = max(gc_max, record['gc_pauses']['max_ms'])
+        # version 1 records have no safe point collections
+        gc_safe_count += record['gc_pauses'].get('safe_point_count', 0)
+        gc_safe_total += record['gc_pauses'].get('safe_point_ms', 0.0)
+
+    lines = [
+        f"Sessions: {len(records)}    Frames: {frames}",
+        "Frame time (ms, 1 ms buckets): "
+        f"p50 {_histogram_percentile(histogram, 50)}  "
+        f"p95 {_histogram_percentile(histogram, 95)}  "
+        f"p99 {_histogram_percentile(histogram, 99)}  "
+        f"max {worst:.2f}",
+        "Average ms per frame:",
+    ]
+    for phase, ms in sorted(phase_totals.items(), key=lambda i: -i[1]):
+        lines.append(f"    {phase:<14} {ms / max(frames, 1):7.3f}")
+    lines.append("Peak entities: " + ", ".join(
+        f"{group} {peak}" for group, peak in peaks.items()
+    ))
+    lines.append(
+        f"GC pauses: {gc_count}, total {gc_total:.1f} ms, max {gc_max:.2f} ms "
+        f"({gc_safe_count} at safe points, {gc_safe_total:.1f} ms)"
+    )
+    lines.append("Rebuilds: " + ", ".join(
+        f"{name} {count}" for name, count in sorted(rebuilds.items())
+    ))
+
+    return "\n".join(lines)
+
+def main() -> None:
+    """Print the aggregated telemetry records."""
+
+    parser = argparse.ArgumentParser(
+        description="Aggregate the session performance records."
+    )
+    parser.add_argument(
+        'directory', nargs='?', default=config.telemetry_path,
+        help="directory containing the session_*.json records"
+    )
+    args = parser.parse_args()
+
+    print(aggregate(load_records(args.directory)))
+
+if __name__ == '__main__':
+    main()
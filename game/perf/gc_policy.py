@@ -0,0 +1,147 @@
+"""
+A module containing the GCPolicy class, which keeps the garbage
+collector from pausing the game in the middle of a frame.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, TypedDict
+if TYPE_CHECKING:
+    from ..game import Game
+
+from collections import deque
+import gc
+import time
+
+from ..utils import config
+
+class GCCollectionDict(TypedDict):
+    """A class representing a dictionary of a collection at a safe point."""
+
+    reason: str
+    generation: int
+    ms: float
+    collected: int # unreachable objects found
+
+class GCPolicy():
+    """
+    A class which decides when the garbage is collected.
+
+    Everything loaded at startup (assets, menus, upgrades) is moved to
+    the permanent generation, so later collections never traverse it.
+    During a session automatic collections are disabled, and garbage is
+    collected at safe points instead: level transitions, the pause menu
+    and the end of the session. If too many young objects pile up in
+    between, they are collected after the frame is drawn.
+    """
+
+    # collections at safe points which are kept
+    history_size: int = 100
+
+    def __init__(self, game: Game, enabled: bool | None = None) -> None:
+        """Initialize the policy."""
+
+        self.game: Game = game
+
+        if enabled is None:
+            enabled = config.gc_control
+        self.enabled: bool = enabled
+
+        self.is_frozen: bool = False
+        # True while a collection at a safe point runs (see telemetry)
+        self.is_collecting: bool = False
+
+        self.collections: deque[GCCollectionDict] = deque(
+            maxlen=GCPolicy.history_size
+        )
+        self.backstop_collections: int = 0
+
+    def freeze(self) -> None:
+        """
+        Collect the garbage left by startup, and move everything still
+        alive to the permanent generation.
+        """
+
+        if not self.enabled:
+            return
+
+        self.collect('startup')
+        gc.freeze()
+        self.is_frozen = True
+
+    def begin_session(self) -> None:
+        """Stop automatic collections while the session runs."""
+
+        if not self.enabled:
+            return
+
+        gc.disable()
+
+    def end_session(self) -> None:
+        """Collect the session's garbage and resume automatic collections."""
+
+        if not self.enabled:
+            return
+
+        self.collect('session_end')
+        gc.enable()
+
+    def end_frame(self) -> None:
+        """
+        Collect the young generation if too many objects were allocated
+        since the last collection. Called after the frame is presented.
+        """
+
+        if not self.enabled or gc.isenabled():
+            return
+
+        if gc.get_count()[0] < config.gc_backstop_allocations:
+            return
+
+        self.backstop_collections += 1
+        self.collect('backstop', 0)
+
+    def collect(self, reason: str, generation: int = 2) -> int:
+        """Collect the given generation now, and record the pause."""
+
+        if not self.enabled:
+            return 0
+
+        self.is_collecting = True
+        start = time.perf_counter()
+        collected = gc.collect(generation)
+        ms = (time.perf_counter() - start) * 1000
+        self.is_collecting = False
+
+        self.collections.append({
+            'reason': reason,
+            'generation': generation,
+            'ms': round(ms, 3),
+            'collected': collected,
+        })
+        return collected
+
+    def release(self) -> None:
+        """Undo the policy, when the game quits."""
+
+        if not self.enabled:
+            return
+
+        gc.enable()
+        if self.is_frozen:
+            gc.unfreeze()
+            self.is_frozen = False
+
+    def __str__(self) -> str:
+        """Returns a readable string of the collections at safe points."""
+
+        lines = ["GC collections at safe points:"]
+        for collection in self.collections:
+            lines.append(
+                f"    {collection['reason']:<12} gen {collection['generation']}"
+                f"  {collection['ms']:7.3f} ms  {collection['collected']} collected"
+            )
+        lines.append(f"    Backstop collections: {self.backstop_collections}")
+        lines.append(f"    Frozen objects: {gc.get_freeze_count()}")
+        return "\n".join(lines)
+
+__all__ = ["GCPolicy"]
@@ -0,0 +1,156 @@
+"""
+A module containing the LatencyTracker class, which measures the time
+from an input event to the frame that presents its effect.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..game import Game
+
+from collections import deque
+import time
+
+import pygame
+
+from ..utils import config, helper_funcs
+
+class LatencyTracker():
+    """
+    A class which tracks input-to-photon latency.
+
+    Each input which can control the ship is timestamped when it is
+    handled. The simulation step that acts on it (ship destination
+    change, bullet fired) marks the inputs of its type as consumed, and
+    the display flip completes the measurement. Every effect happens in
+    the frame that handles its input, so inputs still pending at the
+    flip had none, and are dropped.
+    """
+
+    # input event types which can cause a visible effect
+    input_types: dict[int, str] = {
+        pygame.KEYDOWN: "key",
+        pygame.KEYUP: "key",
+        pygame.MOUSEBUTTONDOWN: "touch",
+        pygame.MOUSEMOTION: "touch_move",
+        pygame.JOYBUTTONDOWN: "gamepad",
+        pygame.JOYBUTTONUP: "gamepad",
+    }
+
+    # actions whose keys and buttons control the ship
+    ship_actions: tuple[str, ...] = ('move_left', 'move_right', 'fire')
+
+    def __init__(self, game: Game, enabled: bool | None = None) -> None:
+        """Initialize the latency tracker."""
+
+        self.game: Game = game
+
+        if enabled is None:
+            enabled = config.measure_latency
+        self.enabled: bool = enabled
+
+        # (input type, timestamp) waiting for an effect
+        self.pending: list[tuple[str, float]] = []
+        # inputs whose effect waits to be presented
+        self.consumed: list[tuple[str, float]] = []
+
+        # latencies in ms, keyed by (input type, target fps)
+        self.samples: dict[tuple[str, int], deque[float]] = {}
+
+    def record_input(self, event: pygame.Event) -> None:
+        """Timestamp an input event as it is handled."""
+
+        if not self.enabled:
+            return
+
+        input_type = LatencyTracker.input_types.get(event.type, None)
+        if input_type is None or not self.game.state.session_running:
+            return
+
+        if input_type == "touch_move" and not event.buttons[0]:
+            # hovering the mouse has no effect on the ship
+            return
+
+        if input_type == "key" and not any(
+            event.key in self.game.action_map.get_keycodes(action)
+            for action in LatencyTracker.ship_actions
+        ):
+            # menus, abilities and debug keys
+            return
+
+        if input_type == "gamepad" and not any(
+            event.button in config.gamepad_buttons.get(action, ())
+            for action in LatencyTracker.ship_actions
+        ):
+            return
+
+        self.pending.append((input_type, time.perf_counter()))
+
+    def mark_effect(self, *input_types: str) -> None:
+        """
+        Mark the pending inputs of the given types as consumed by the
+        current simulation step. Called where an input changes what is
+        drawn, with the types of input that can cause the change.
+        """
+
+        if not self.enabled or not self.pending:
+            return
+
+        remaining: list[tuple[str, float]] = []
+        for input_type, timestamp in self.pending:
+            if input_type in input_types:
+                self.consumed.append((input_type, timestamp))
+            else:
+                remaining.append((input_type, timestamp))
+        self.pending = remaining
+
+    def frame_presented(self) -> None:
+        """Complete the measurement for inputs presented by the flip."""
+
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        fps = self.game.settings.data['fps']
+
+        for input_type, timestamp in self.consumed:
+            key = (input_type, fps)
+            if key not in self.samples:
+                self.samples[key] = deque(maxlen=config.latency_sample_count)
+            self.samples[key].append((now - timestamp) * 1000)
+        self.consumed = []
+
+        # forget inputs that did nothing visible (fire on cooldown, etc.)
+        self.pending = []
+
+    def report(self) -> dict[str, dict[str, float]]:
+        """
+        Return the p50/p95/p99 latency in ms and the sample count,
+        for each input type and target fps.
+        """
+
+        report: dict[str, dict[str, float]] = {}
+        for (input_type, fps), samples in sorted(self.samples.items()):
+            values = list(samples)
+            report[f"{input_type}@{fps}"] = {
+                'count': len(values),
+                'p50': helper_funcs.percentile(values, 50),
+                'p95': helper_funcs.percentile(values, 95),
+                'p99': helper_funcs.percentile(values, 99),
+            }
+
+        return report
+
+    def __str__(self) -> str:
+        """Returns a readable table of the latency report."""
+
+        lines = ["Input latency (ms):"]
+        for name, values in self.report().items():
+            lines.append(
+                f"    {name:<20} n={values['count']:<6} "
+                f"p50={values['p50']:6.1f} p95={values['p95']:6.1f} "
+                f"p99={values['p99']:6.1f}"
+            )
+        return "\n".join(lines)
+
+__all__ = ["LatencyTracker"]
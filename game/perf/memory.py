@@ -0,0 +1,275 @@
+"""
+A module containing the MemoryInspector class, which accounts for the
+memory held by surfaces, sounds and entities, and writes it to a report.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Iterable, TypedDict
+if TYPE_CHECKING:
+    from ..game import Game
+
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from ..utils import config
+from ..utils.assets import LazyImage
+
+class SurfaceStatsDict(TypedDict):
+    """A class representing a dictionary of the surfaces of an owner type."""
+
+    count: int
+    bytes: int
+
+class EntityStatsDict(TypedDict):
+    """A class representing a dictionary of the entities of a class."""
+
+    count: int
+    python_bytes: int # shallow estimate: the objects and their attributes
+    image_bytes: int
+
+class MemoryInspector():
+    """
+    A class which walks the game's menus, trays, entities, class images
+    and sound bank to count the bytes each of them holds.
+
+    Once tracing is started, a tracemalloc snapshot is taken at the
+    start of each session and at each level up, so the report can show
+    what was allocated between levels.
+    """
+
+    # snapshots kept, the oldest are dropped
+    max_snapshots: int = 10
+    # lines shown in the tracemalloc sections of the report
+    top_lines: int = 10
+
+    def __init__(self, game: Game) -> None:
+        """Initialize the inspector. Nothing is traced yet."""
+
+        self.game: Game = game
+        # (session start time, level or 0) -> snapshot
+        self.snapshots: dict[tuple[float, int], tracemalloc.Snapshot] = {}
+
+    # region SURFACES
+    # -------------------------------------------------------------------
+
+    def _get_surface_bytes(self, surface: pygame.Surface) -> int:
+        """Return the size of the surface's pixels. Subsurfaces own none."""
+
+        if surface.get_parent() is not None:
+            return 0
+        return surface.get_pitch() * surface.get_height()
+
+    def _get_surface_owners(self) -> Iterable[tuple[str, pygame.Surface]]:
+        """Yield each surface the game holds, with its owner type."""
+
+        yield "Display", self.game.screen
+        if hasattr(self.game, 'play_surf'):
+            yield "Display", self.game.play_surf
+
+        # first, so the instances sharing them are not charged for them
+        for lazy_image in LazyImage.instances:
+            if lazy_image.image is not None:
+                yield "Class images", lazy_image.image
+
+        containers: list[Any] = list(self.game.menus.values())
+        if hasattr(self.game, 'top_tray'):
+            containers += [self.game.top_tray, self.game.bot_tray]
+
+        for menu in containers:
+            owner = type(menu).__name__
+            yield f"{owner} surface", menu.surface
+            yield f"{owner} surface", menu.background
+            for element in menu.elements.values():
+                for part in getattr(element, 'elems', (element,)):
+                    yield type(part).__name__, part.content
+
+        for entity in self._get_entities():
+            yield type(entity).__name__, entity.image
+
+    def get_surface_stats(self) -> dict[str, SurfaceStatsDict]:
+        """Return the pixel bytes of the surfaces, by owner type."""
+
+        stats: dict[str, SurfaceStatsDict] = {}
+        seen: set[int] = set()
+        for owner, surface in self._get_surface_owners():
+            if id(surface) in seen:
+                continue
+            seen.add(id(surface))
+
+            owner_stats = stats.setdefault(owner, {'count': 0, 'bytes': 0})
+            owner_stats['count'] += 1
+            owner_stats['bytes'] += self._get_surface_bytes(surface)
+
+        return stats
+
+    # -------------------------------------------------------------------
+    # endregion
+
+    # region ENTITIES
+    # -------------------------------------------------------------------
+
+    def _get_entities(self) -> list[Any]:
+        """Return the entities of the running (or last) session."""
+
+        if not hasattr(self.game, 'ship'):
+            return []
+
+        entities: list[Any] = [self.game.ship]
+        for group in (self.game.aliens, self.game.bullets, self.game.powerups):
+            entities += group.sprites()
+        return entities
+
+    def _get_python_bytes(self, entity: Any) -> int:
+        """Estimate the size of the entity, its attributes and their values."""
+
+        size = sys.getsizeof(entity) + sys.getsizeof(entity.__dict__)
+        for value in entity.__dict__.values():
+            if value is self.game:
+                continue
+            size += sys.getsizeof(value)
+        return size
+
+    def get_entity_stats(self) -> dict[str, EntityStatsDict]:
+        """Return the count and estimated size of the entities, by class."""
+
+        stats: dict[str, EntityStatsDict] = {}
+        for entity in self._get_entities():
+            class_stats = stats.setdefault(
+                type(entity).__name__,
+                {'count': 0, 'python_bytes': 0, 'image_bytes': 0}
+            )
+            class_stats['count'] += 1
+            class_stats['python_bytes'] += self._get_python_bytes(entity)
+            class_stats['image_bytes'] += self._get_surface_bytes(entity.image)
+
+        return stats
+
+    # -------------------------------------------------------------------
+    # endregion
+
+    # region TRACEMALLOC
+    # -------------------------------------------------------------------
+
+    def start_tracing(self) -> None:
+        """Start tracing allocations, and take the first snapshot."""
+
+        if tracemalloc.is_tracing():
+            return
+
+        tracemalloc.start()
+        self.take_snapshot()
+
+    def take_snapshot(self) -> None:
+        """Take a snapshot keyed to the session and its level, if tracing."""
+
+        if not tracemalloc.is_tracing():
+            return
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        # level 0 stands for the menus, outside of a session
+        level = self.game.state.level if self.game.state.session_running else 0
+        self.snapshots[(self.game.state.start_time, level)] = snapshot
+
+        while len(self.snapshots) > MemoryInspector.max_snapshots:
+            del self.snapshots[next(iter(self.snapshots))]
+
+    def _get_tracemalloc_lines(self) -> list[str]:
+        """Return the report lines of the traced allocations."""
+
+        if not tracemalloc.is_tracing():
+            return ["Allocations are traced from the first report on."]
+
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"Traced now {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB."]
+
+        for (start_time, level), snapshot in self.snapshots.items():
+            total = sum(trace.size for trace in snapshot.traces)
+            session = time.strftime("%H:%M:%S", time.localtime(start_time))
+            where = f"level {level}" if level else "menus"
+            lines.append(
+                f"    Session {session} {where:<10} {total / 1024:10.1f} KiB"
+            )
+
+        snapshots = list(self.snapshots.values())
+        if len(snapshots) < 2:
+            return lines
+
+        lines.append("Growth since the previous snapshot:")
+        growth = snapshots[-1].compare_to(snapshots[-2], 'lineno')
+        for stat in growth[:MemoryInspector.top_lines]:
+            lines.append(f"    {stat}")
+
+        lines.append("Largest allocations at the latest snapshot:")
+        for stat in snapshots[-1].statistics('lineno')[:MemoryInspector.top_lines]:
+            lines.append(f"    {stat}")
+        return lines
+
+    # -------------------------------------------------------------------
+    # endregion
+
+    def get_report(self) -> str:
+        """Return a readable report of the memory held, by category."""
+
+        lines = [
+            f"Memory report, {time.strftime('%Y-%m-%d %H:%M:%S')}, "
+            f"level {self.game.state.level}"
+            f"{'' if self.game.state.session_running else ' (no session running)'}",
+            "",
+        ]
+
+        surfaces = self.get_surface_stats()
+        total = sum(stats['bytes'] for stats in surfaces.values())
+        lines.append(f"Surfaces: {total / 1024:.1f} KiB")
+        for owner, stats in sorted(surfaces.items(), key=lambda i: -i[1]['bytes']):
+            lines.append(
+                f"    {owner:<24} {stats['count']:>5} {stats['bytes'] / 1024:10.1f} KiB"
+            )
+
+        sounds = self.game.sound_bank.get_memory_report()
+        lines += ["", f"Sounds: {sum(sounds.values()) / 1024:.1f} KiB"]
+        for file_name, size in sorted(sounds.items(), key=lambda i: -i[1]):
+            lines.append(f"    {file_name:<30} {size / 1024:10.1f} KiB")
+
+        entities = self.get_entity_stats()
+        lines += ["", "Entities:                   count  python KiB   image KiB"]
+        for name, stats in sorted(entities.items(), key=lambda i: -i[1]['count']):
+            lines.append(
+                f"    {name:<24} {stats['count']:>5} "
+                f"{stats['python_bytes'] / 1024:11.1f} {stats['image_bytes'] / 1024:11.1f}"
+            )
+
+        lines += ["", *self._get_tracemalloc_lines()]
+        return "\n".join(lines)
+
+    def dump(self) -> Path | None:
+        """
+        Write the report to the reports directory, and start tracing
+        allocations for the next ones. Return the path of the report.
+        """
+
+        self.start_tracing()
+
+        directory = Path(config.memory_report_path)
+        now = time.time()
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now))
+        millis = int(now * 1000) % 1000
+        path = Path(directory, f"memory_{stamp}_{millis:03d}.txt")
+
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(self.get_report() + "\n")
+        except Exception as e:
+            print(f"Encountered an error while saving the memory report: {e}.")
+            return None
+
+        print(f"Saved the memory report to {path}.")
+        return path
+
+__all__ = ["MemoryInspector"]
@@ -0,0 +1,131 @@
+"""
+A module containing the FrameProfiler class, which records how long
+each phase of a frame takes into a ring buffer.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..game import Game
+
+from array import array
+import time
+
+from .tracer import Tracer, get_tracer
+from ..utils import config
+
+class FrameProfiler():
+    """
+    A class which times the phases of each frame.
+
+    Timing works like a lap timer: begin_frame starts the clock, and
+    each call to lap stores the time since the previous lap under the
+    given phase. Nothing is recorded while no user has enabled it.
+    While the tracer runs, each lap is also traced as a span.
+    """
+
+    phases: tuple[str, ...] = (
+        'events', 'poll',
+        'level', 'spawn', 'ship', 'aliens', 'bullets', 'powerups',
+        'draw_clear', 'draw_ship', 'draw_bullets', 'draw_powerups',
+        'draw_aliens', 'draw_trays', 'menus', 'overlay', 'flip',
+        'gc', 'idle',
+    )
+
+    def __init__(self,
+                 game: Game,
+                 size: int | None = None
+                 ) -> None:
+        """Initialize the profiler with an empty ring buffer."""
+
+        self.game: Game = game
+
+        if size is None:
+            size = config.profiler_ring_size
+        self.size: int = size
+
+        # names of whatever needs the profiler running (overlay, etc.)
+        self.users: set[str] = set()
+        self.enabled: bool = False
+
+        # one slot per frame for each phase, in ms
+        self.samples: dict[str, array[float]] = {
+            phase: array('d', [0.0]) * size for phase in FrameProfiler.phases
+        }
+        self.index: int = 0
+        self.frames_recorded: int = 0
+        self._last_lap: float = 0
+        self.tracer: Tracer = get_tracer()
+
+    def begin_frame(self) -> None:
+        """Move to the next slot in the ring buffer and start timing."""
+
+        if not self.enabled:
+            return
+
+        self.index = (self.index + 1) % self.size
+        for samples in self.samples.values():
+            samples[self.index] = 0.0
+
+        if self.frames_recorded < self.size:
+            self.frames_recorded += 1
+        self._last_lap = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """Add the time since the last lap to the given phase."""
+
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        self.samples[phase][self.index] += (now - self._last_lap) * 1000
+        if self.tracer.enabled:
+            self.tracer.complete(phase, 'phase', self._last_lap, now)
+        self._last_lap = now
+
+    def enable(self, user: str) -> None:
+        """Start recording for the given user. Clears old samples."""
+
+        if not self.enabled:
+            self.frames_recorded = 0
+            self._last_lap = time.perf_counter()
+        self.users.add(user)
+        self.enabled = True
+
+    def disable(self, user: str) -> None:
+        """Stop recording for the given user, if no one else needs it."""
+
+        self.users.discard(user)
+        self.enabled = bool(self.users)
+
+    def get_last_frame(self) -> dict[str, float]:
+        """Return the time in ms of each phase in the latest frame."""
+
+        return {
+            phase: samples[self.index] for phase, samples in self.samples.items()
+        }
+
+    def get_frame_times(self) -> list[float]:
+        """Return the recorded frame times in ms, oldest first."""
+
+        times: list[float] = []
+        for offset in range(self.frames_recorded - 1, -1, -1):
+            i = (self.index - offset) % self.size
+            times.append(sum(samples[i] for samples in self.samples.values()))
+
+        return times
+
+    def get_phase_averages(self, frames: int = 60) -> dict[str, float]:
+        """Return the average time in ms of each phase over recent frames."""
+
+        frames = min(frames, self.frames_recorded)
+        averages: dict[str, float] = {}
+        for phase, samples in self.samples.items():
+            total = 0.0
+            for offset in range(frames):
+                total += samples[(self.index - offset) % self.size]
+            averages[phase] = total / frames if frames else 0.0
+
+        return averages
+
+__all__ = ["FrameProfiler"]
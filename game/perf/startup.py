@@ -0,0 +1,96 @@
+"""
+A module containing the StartupTimeline class, which records how long
+each phase of starting the game takes, up to the first frame.
+"""
+
+from typing import TypedDict
+import time
+
+from ..utils import config
+
+class StartupPhaseDict(TypedDict):
+    """A class representing a dictionary of a recorded startup phase."""
+
+    name: str
+    start_ms: float
+    duration_ms: float
+
+class StartupTimeline():
+    """
+    A class which times the phases of the game's startup.
+
+    Works like the frame profiler's lap timer: each call to lap records
+    the time since the previous lap under the given phase. The timeline
+    starts when it is created, and is finished by the first frame.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the timeline and start the clock."""
+
+        self.start: float = time.perf_counter()
+        self._last_lap: float = self.start
+        self.phases: list[StartupPhaseDict] = []
+        self.is_finished: bool = False
+
+    def lap(self, name: str) -> None:
+        """Record the time since the last lap as the given phase."""
+
+        if self.is_finished:
+            return
+
+        now = time.perf_counter()
+        self.phases.append({
+            'name': name,
+            'start_ms': (self._last_lap - self.start) * 1000,
+            'duration_ms': (now - self._last_lap) * 1000,
+        })
+        self._last_lap = now
+
+    def finish(self, name: str = 'first_frame') -> None:
+        """Record the last phase. Later laps are ignored."""
+
+        if self.is_finished:
+            return
+
+        self.lap(name)
+        self.is_finished = True
+
+        if config.print_startup_timeline:
+            print(self)
+
+    def get_total_ms(self) -> float:
+        """Return the time in ms from the start to the last lap."""
+
+        return (self._last_lap - self.start) * 1000
+
+    def get_durations(self) -> dict[str, float]:
+        """Return the time in ms of each phase, by name."""
+
+        durations: dict[str, float] = {}
+        for phase in self.phases:
+            durations[phase['name']] = (
+                durations.get(phase['name'], 0.0) + phase['duration_ms']
+            )
+
+        return durations
+
+    def __str__(self) -> str:
+        """Return the timeline as a table, with a bar for each phase."""
+
+        total = self.get_total_ms()
+        width = max((len(phase['name']) for phase in self.phases), default=0)
+
+        lines = ["Startup timeline:"]
+        for phase in self.phases:
+            start = round(phase['start_ms'] / total * 40) if total else 0
+            length = max(1, round(phase['duration_ms'] / total * 40)) if total else 1
+            lines.append(
+                f"\t{phase['name']:<{width}} "
+                f"{phase['start_ms']:8.1f} ms {phase['duration_ms']:7.1f} ms "
+                f"{' ' * start}{'#' * length}"
+            )
+        lines.append(f"\t{'total':<{width}} {total:8.1f} ms")
+
+        return "\n".join(lines)
+
+__all__ = ["StartupTimeline"]
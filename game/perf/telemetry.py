@@ -0,0 +1,239 @@
+"""
+A module containing the SessionTelemetry class, which writes a compact
+performance record to disk when a session ends.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, TypedDict
+if TYPE_CHECKING:
+    from ..game import Game
+
+from array import array
+from pathlib import Path
+import gc
+import json
+import time
+
+from ..utils import config, helper_funcs
+
+class FrameTimesDict(TypedDict):
+    """A class representing a dictionary of frame time percentiles."""
+
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+class GCPausesDict(TypedDict):
+    """A class representing a dictionary of garbage collection pauses."""
+
+    count: int
+    total_ms: float
+    max_ms: float
+    per_generation: list[int]
+    # collections run by the gc policy at safe points, included above
+    safe_point_count: int
+    safe_point_ms: float
+
+class TelemetryDict(TypedDict):
+    """
+    A class representing the dictionary containing the performance
+    record of a single session.
+    """
+
+    version: int
+    start_time: float
+    duration_ms: int
+    level: int
+    target_fps: int
+    frames: int
+
+    # frame time in whole ms -> number of frames
+    histogram: dict[str, int]
+    frame_times: FrameTimesDict
+    # total ms spent in each phase over the session
+    phase_totals: dict[str, float]
+    peak_entities: dict[str, int]
+    gc_pauses: GCPausesDict
+    rebuilds: dict[str, int]
+
+class SessionTelemetry():
+    """A class which records the performance of the current session."""
+
+    version: int = 2
+
+    def __init__(self, game: Game, enabled: bool | None = None) -> None:
+        """Initialize the session telemetry."""
+
+        self.game: Game = game
+
+        if enabled is None:
+            enabled = config.record_telemetry
+        self.enabled: bool = enabled
+
+        self.is_recording: bool = False
+        # the record of the last finished session
+        self.last_record: TelemetryDict | None = None
+        self._gc_start: float | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        """Clear the data recorded for the previous session."""
+
+        self.start_time: float = time.time()
+        self.frame_times: array[float] = array('f')
+        self.histogram: dict[int, int] = {}
+        self.phase_totals: dict[str, float] = {}
+        self.peak_entities: dict[str, int] = {
+            'aliens': 0, 'bullets': 0, 'powerups': 0
+        }
+        self.gc_pauses: GCPausesDict = {
+            'count': 0, 'total_ms': 0, 'max_ms': 0, 'per_generation': [0, 0, 0],
+            'safe_point_count': 0, 'safe_point_ms': 0
+        }
+        self.rebuilds: dict[str, int] = {}
+
+    def start(self) -> None:
+        """Start recording a new session."""
+
+        if not self.enabled:
+            return
+
+        self._reset()
+        self.last_record = None
+        self.is_recording = True
+        self.game.profiler.enable("Session Telemetry")
+        if self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase: str, info: dict[str, int]) -> None:
+        """Time the garbage collection pauses during the session."""
+
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+            return
+
+        if self._gc_start is None:
+            return
+
+        pause = (time.perf_counter() - self._gc_start) * 1000
+        self._gc_start = None
+
+        self.gc_pauses['count'] += 1
+        self.gc_pauses['total_ms'] += pause
+        if pause > self.gc_pauses['max_ms']:
+            self.gc_pauses['max_ms'] = pause
+        self.gc_pauses['per_generation'][info['generation']] += 1
+        if self.game.gc_policy.is_collecting:
+            self.gc_pauses['safe_point_count'] += 1
+            self.gc_pauses['safe_point_ms'] += pause
+
+    def count_rebuild(self, name: str) -> None:
+        """Count a rebuild of the menu or tray with the given name."""
+
+        if not self.is_recording:
+            return
+
+        self.rebuilds[name] = self.rebuilds.get(name, 0) + 1
+
+    def record_frame(self) -> None:
+        """Add the latest profiled frame to the session record."""
+
+        if not self.is_recording or not self.game.state.session_running:
+            return
+
+        profiler = self.game.profiler
+        if profiler.frames_recorded == 0:
+            # the profiler started mid-frame
+            return
+
+        frame_time = 0.0
+        for phase, ms in profiler.get_last_frame().items():
+            frame_time += ms
+            self.phase_totals[phase] = self.phase_totals.get(phase, 0) + ms
+
+        self.frame_times.append(frame_time)
+        bucket = int(frame_time)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+        self._track_peak('aliens', len(self.game.aliens))
+        self._track_peak('bullets', len(self.game.bullets))
+        self._track_peak('powerups', len(self.game.powerups))
+
+    def _track_peak(self, group: str, count: int) -> None:
+        """Keep the highest entity count seen for the group."""
+
+        if count > self.peak_entities[group]:
+            self.peak_entities[group] = count
+
+    def finish(self) -> None:
+        """Stop recording and write the session record to disk."""
+
+        if not self.is_recording:
+            return
+
+        self.is_recording = False
+        self.game.profiler.disable("Session Telemetry")
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+        self.last_record = self.make_record()
+        self.save_record(self.last_record)
+
+    def make_record(self) -> TelemetryDict:
+        """Return the performance record of the session."""
+
+        frame_times = list(self.frame_times)
+        record: TelemetryDict = {
+            'version': SessionTelemetry.version,
+            'start_time': round(self.start_time, 3),
+            'duration_ms': self.game.state.session_duration,
+            'level': self.game.state.level,
+            'target_fps': self.game.settings.data['fps'],
+            'frames': len(frame_times),
+            'histogram': {
+                str(ms): count for ms, count in sorted(self.histogram.items())
+            },
+            'frame_times': {
+                'p50': round(helper_funcs.percentile(frame_times, 50), 3),
+                'p95': round(helper_funcs.percentile(frame_times, 95), 3),
+                'p99': round(helper_funcs.percentile(frame_times, 99), 3),
+                'max': round(max(frame_times, default=0), 3),
+            },
+            'phase_totals': {
+                phase: round(ms, 3) for phase, ms in self.phase_totals.items()
+            },
+            'peak_entities': dict(self.peak_entities),
+            'gc_pauses': {
+                'count': self.gc_pauses['count'],
+                'total_ms': round(self.gc_pauses['total_ms'], 3),
+                'max_ms': round(self.gc_pauses['max_ms'], 3),
+                'per_generation': list(self.gc_pauses['per_generation']),
+                'safe_point_count': self.gc_pauses['safe_point_count'],
+                'safe_point_ms': round(self.gc_pauses['safe_point_ms'], 3),
+            },
+            'rebuilds': dict(self.rebuilds),
+        }
+
+        return record
+
+    def save_record(self, record: TelemetryDict) -> None:
+        """Write the record as compact json, and prune old records."""
+
+        directory = Path(config.telemetry_path)
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(self.start_time))
+        millis = int(self.start_time * 1000) % 1000
+        path = Path(directory, f"session_{stamp}_{millis:03d}.json")
+
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(record, separators=(',', ':')))
+        except Exception as e:
+            print(f"Encountered an error while saving telemetry: {e}.")
+            return
+
+        records = sorted(directory.glob("session_*.json"))
+        for old in records[:-config.telemetry_max_records]:
+            old.unlink(missing_ok=True)
+
+__all__ = ["SessionTelemetry"]
@@ -0,0 +1,262 @@
+"""
+A module containing the Tracer class, which streams spans and counters
+to a file in the Chrome trace event format, for chrome://tracing or
+ui.perfetto.dev.
+"""
+
+from __future__ import annotations
+from typing import Any
+
+from contextlib import nullcontext
+from pathlib import Path
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+from ..utils import config
+
+# (phase, name, category, timestamp in us, duration in us, thread id, args)
+EventTuple = tuple[str, str, str, float, float, int, dict[str, Any] | None]
+
+class Span():
+    """A context manager which records a complete event when it exits."""
+
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self,
+                 tracer: Tracer,
+                 name: str,
+                 category: str,
+                 args: dict[str, Any] | None
+                 ) -> None:
+        """Initialize the span. It starts when entered."""
+
+        self.tracer: Tracer = tracer
+        self.name: str = name
+        self.category: str = category
+        self.args: dict[str, Any] | None = args
+        self.start: float = 0
+
+    def __enter__(self) -> Span:
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.tracer.complete(self.name, self.category, self.start, args=self.args)
+
+class Tracer():
+    """
+    A class which records trace events while it is started.
+
+    Recording an event only stores a tuple, from any thread. The events
+    of each frame are handed to a writer thread when the frame ends
+    (see submit), which formats them and writes them to the file, so
+    the frames being traced pay as little as possible for it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracer. Nothing is recorded until it starts."""
+
+        self.enabled: bool = False
+        self.path: Path | None = None
+
+        self.events: list[EventTuple] = []
+        self.lock = threading.Lock()
+        # thread id -> name, for the threads seen since the tracer started
+        self.thread_names: dict[int, str] = {}
+        self._origin: float = 0
+
+        self.batches: queue.Queue[list[EventTuple] | None] = queue.Queue()
+        self.thread: threading.Thread | None = None
+
+    # region RECORDING
+    # -------------------------------------------------------------------
+
+    def trace(self,
+              name: str,
+              category: str = 'game',
+              args: dict[str, Any] | None = None
+              ) -> Span | nullcontext[None]:
+        """Return a context manager which records the code it wraps."""
+
+        if not self.enabled:
+            return nullcontext()
+        return Span(self, name, category, args)
+
+    def complete(self,
+                 name: str,
+                 category: str,
+                 start: float,
+                 end: float | None = None,
+                 args: dict[str, Any] | None = None
+                 ) -> None:
+        """Record a span between the perf_counter times start and end (now)."""
+
+        if not self.enabled:
+            return
+
+        if end is None:
+            end = time.perf_counter()
+        self._record((
+            'X', name, category, (start - self._origin) * 1e6,
+            (end - start) * 1e6, threading.get_ident(), args
+        ))
+
+    def counter(self, name: str, values: dict[str, int | float]) -> None:
+        """Record the current values of a counter track."""
+
+        if not self.enabled:
+            return
+
+        self._record((
+            'C', name, 'counter', (time.perf_counter() - self._origin) * 1e6,
+            0, threading.get_ident(), values
+        ))
+
+    def _record(self, event: EventTuple) -> None:
+        """Store the event until the end of the frame."""
+
+        with self.lock:
+            if event[5] not in self.thread_names:
+                self.thread_names[event[5]] = threading.current_thread().name
+                self.events.append((
+                    'M', 'thread_name', '', 0, 0, event[5],
+                    {'name': threading.current_thread().name}
+                ))
+            self.events.append(event)
+
+    def submit(self) -> None:
+        """Hand the events recorded so far to the writer thread."""
+
+        if not self.enabled or not self.events:
+            return
+
+        with self.lock:
+            events, self.events = self.events, []
+        self.batches.put(events)
+
+    # -------------------------------------------------------------------
+    # endregion
+
+    # region WRITING
+    # -------------------------------------------------------------------
+
+    def start(self, path: str | Path | None = None) -> None:
+        """
+        Start recording into the file at the given path, by default a
+        new one in the traces directory.
+        """
+
+        if self.enabled:
+            return
+
+        if path is None:
+            now = time.time()
+            stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now))
+            millis = int(now * 1000) % 1000
+            path = Path(config.trace_path, f"trace_{stamp}_{millis:03d}.json")
+        self.path = Path(path)
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            file = open(self.path, 'w', encoding='utf-8')
+        except Exception as e:
+            print(f"Encountered an error while starting the trace: {e}.")
+            return
+
+        self.events = []
+        self.thread_names = {}
+        self._origin = time.perf_counter()
+        self.thread = threading.Thread(
+            target=self._work, args=(file,), name="Tracer", daemon=True
+        )
+        self.thread.start()
+
+        self.enabled = True
+        # in case the game exits without calling Game.quit
+        atexit.register(self.stop)
+        self._record((
+            'M', 'process_name', '', 0, 0, threading.get_ident(),
+            {'name': "Deep Space Survivors"}
+        ))
+        print(f"Tracing to {self.path}.")
+
+    def _work(self, file: Any) -> None:
+        """Write the batches of events as they come, until told to stop."""
+
+        pid = os.getpid()
+        file.write("[\n")
+        is_first = True
+
+        while True:
+            events = self.batches.get()
+            if events is None:
+                break
+
+            lines: list[str] = []
+            for phase, name, category, ts, dur, tid, args in events:
+                event: dict[str, Any] = {
+                    'ph': phase, 'name': name, 'pid': pid, 'tid': tid,
+                    'ts': round(ts, 3),
+                }
+                if category:
+                    event['cat'] = category
+                if phase == 'X':
+                    event['dur'] = round(dur, 3)
+                if args is not None:
+                    event['args'] = args
+                lines.append(json.dumps(event, separators=(',', ':'), default=str))
+
+            try:
+                if not is_first:
+                    file.write(",\n")
+                file.write(",\n".join(lines))
+                # a trace cut short is still readable up to here
+                file.flush()
+                is_first = False
+            except Exception as e:
+                print(f"Encountered an error while writing the trace: {e}.")
+
+        file.write("\n]\n")
+        file.close()
+
+    def stop(self) -> None:
+        """Stop recording, and wait for the writer to finish the file."""
+
+        if not self.enabled:
+            return
+
+        self.submit()
+        self.enabled = False
+        self.batches.put(None)
+        atexit.unregister(self.stop)
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        print(f"Saved the trace to {self.path}.")
+
+    def toggle(self) -> None:
+        """Start or stop recording."""
+
+        if self.enabled:
+            self.stop()
+        else:
+            self.start()
+
+    # -------------------------------------------------------------------
+    # endregion
+
+_tracer: Tracer | None = None
+
+def get_tracer() -> Tracer:
+    """Return the process's tracer, which every thread records into."""
+
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+__all__ = ["Tracer", "get_tracer"]
@@ -1,8 +1,16 @@
 """Initialize the game systems package."""
 
+from .history import *
+from .journal import *
 from .music import *
+from .premix import *
 from .progress import *
 from .random_drop import *
+from .save_service import *
 from .settings import *
+from .sfx import *
+from .snapshot import *
+from .sound_bank import *
 from .spawn_manager import *
 from .state import *
+from .streaming import *
@@ -0,0 +1,309 @@
+"""
+A module containing the SessionHistory class, which keeps a row for
+every finished session in a local SQLite database.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, TypedDict
+if TYPE_CHECKING:
+    from ..game import Game
+
+from pathlib import Path
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+
+from ..utils import config
+
+class SessionRowDict(TypedDict):
+    """A class representing a dictionary of a stored session."""
+
+    start_time: float
+    duration_ms: int
+    ship_class: str
+    upgrades: dict[str, int]
+    kills: int
+    credits: int
+    level: int
+    # frame time percentiles and gc pauses, if telemetry was recorded
+    perf: dict[str, Any] | None
+
+class SessionTotalsDict(TypedDict):
+    """A class representing a dictionary of totals over all sessions."""
+
+    sessions: int
+    duration_ms: int
+    kills: int
+    credits: int
+
+class SessionHistory():
+    """
+    A class which stores finished sessions. Rows are queued on the main
+    thread, and a writer thread inserts them in batches.
+    """
+
+    schema: tuple[str, ...] = (
+        """CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY,
+            start_time REAL NOT NULL,
+            duration_ms INTEGER NOT NULL,
+            ship_class TEXT NOT NULL,
+            upgrades TEXT NOT NULL,
+            kills INTEGER NOT NULL,
+            credits INTEGER NOT NULL,
+            level INTEGER NOT NULL,
+            perf TEXT
+        )""",
+        # recent sessions, and recent sessions with a ship
+        "CREATE INDEX IF NOT EXISTS sessions_start ON sessions (start_time)",
+        "CREATE INDEX IF NOT EXISTS sessions_ship ON sessions (ship_class, start_time)",
+        # best sessions, for the stats screen and reward checks
+        "CREATE INDEX IF NOT EXISTS sessions_duration ON sessions (duration_ms)",
+        "CREATE INDEX IF NOT EXISTS sessions_credits ON sessions (credits)",
+        "CREATE INDEX IF NOT EXISTS sessions_kills ON sessions (kills)",
+        "CREATE INDEX IF NOT EXISTS sessions_level ON sessions (level)",
+    )
+
+    # columns sessions can be ranked by
+    rankable: tuple[str, ...] = ('duration_ms', 'credits', 'kills', 'level')
+
+    # queued by flush, so the writer stores its batch without waiting
+    # for the rest of the batch window
+    flush_marker: str = 'flush'
+
+    def __init__(self, game: Game, path: str | Path | None = None) -> None:
+        """Initialize the session history. The thread starts on first use."""
+
+        self.game: Game = game
+
+        if path is None:
+            path = config.history_path
+        self.path: Path = Path(path)
+
+        # rows, the flush marker, or None to stop the writer
+        self.rows: queue.Queue[SessionRowDict | str | None] = queue.Queue()
+        self.thread: threading.Thread | None = None
+        self._reader: sqlite3.Connection | None = None
+
+        # in case the game exits without calling Game.quit
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating the table and indexes if needed."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.row_factory = sqlite3.Row
+        # lets the main thread read while the writer thread writes
+        connection.execute("PRAGMA journal_mode=WAL")
+        with connection:
+            for statement in SessionHistory.schema:
+                connection.execute(statement)
+
+        return connection
+
+    def record_session(self) -> None:
+        """Queue the session that just ended to be stored."""
+
+        telemetry = self.game.telemetry.last_record
+        perf = None
+        if telemetry is not None:
+            perf = {
+                'frame_times': telemetry['frame_times'],
+                'gc_pauses': telemetry['gc_pauses'],
+            }
+
+        row: SessionRowDict = {
+            'start_time': self.game.state.start_time,
+            'duration_ms': self.game.state.session_duration,
+            'ship_class': self.game.ship_class.__name__,
+            'upgrades': {
+                upgrade.name: upgrade.level
+                for upgrade in self.game.upgrades.values()
+            },
+            'kills': self.game.state.killcount,
+            'credits': self.game.state.credits_earned,
+            'level': self.game.state.level,
+            'perf': perf,
+        }
+        self.rows.put(row)
+
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(
+                target=self._work, name="SessionHistory", daemon=True
+            )
+            self.thread.start()
+
+    def _work(self) -> None:
+        """Insert the queued rows in batches, until told to stop."""
+
+        try:
+            connection = self._connect()
+        except Exception as e:
+            print(f"Encountered an error while opening the history: {e}.")
+            connection = None
+
+        is_running = True
+        while is_running:
+            batch = [self.rows.get()]
+            try:
+                # gather whatever else arrives within the batch window,
+                # unless told to stop or flush
+                while isinstance(batch[-1], dict):
+                    batch.append(self.rows.get(timeout=config.history_batch_ms / 1000))
+            except queue.Empty:
+                pass
+
+            if None in batch:
+                is_running = False
+            rows = [row for row in batch if isinstance(row, dict)]
+
+            if connection is not None and rows:
+                self._insert(connection, rows)
+
+            for _ in batch:
+                self.rows.task_done()
+
+        if connection is not None:
+            connection.close()
+
+    def _insert(self, connection: sqlite3.Connection, rows: list[SessionRowDict]) -> None:
+        """Insert the rows in a single transaction."""
+
+        values = [
+            (
+                row['start_time'], row['duration_ms'], row['ship_class'],
+                json.dumps(row['upgrades']), row['kills'], row['credits'],
+                row['level'],
+                None if row['perf'] is None else json.dumps(row['perf']),
+            )
+            for row in rows
+        ]
+
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO sessions (start_time, duration_ms, ship_class, "
+                    "upgrades, kills, credits, level, perf) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    values
+                )
+        except Exception as e:
+            print(f"Encountered an error while saving the history: {e}.")
+
+    def flush(self) -> None:
+        """Wait until every queued session is stored."""
+
+        if self.thread is not None and self.thread.is_alive():
+            self.rows.put(SessionHistory.flush_marker)
+            self.rows.join()
+
+    def close(self) -> None:
+        """Store the queued sessions and stop the writer thread."""
+
+        if self.thread is not None and self.thread.is_alive():
+            self.rows.put(None)
+            self.thread.join()
+        self.thread = None
+
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    # region QUERIES
+    # -------------------------------------------------------------------
+
+    def _query(self, sql: str, parameters: tuple = ()) -> list[sqlite3.Row]:
+        """Run a query on the main thread's connection."""
+
+        self.flush()
+        try:
+            if self._reader is None:
+                self._reader = self._connect()
+            return self._reader.execute(sql, parameters).fetchall()
+        except Exception as e:
+            print(f"Encountered an error while reading the history: {e}.")
+            return []
+
+    def _to_row(self, row: sqlite3.Row) -> SessionRowDict:
+        """Convert a database row to a SessionRowDict."""
+
+        return {
+            'start_time': row['start_time'],
+            'duration_ms': row['duration_ms'],
+            'ship_class': row['ship_class'],
+            'upgrades': json.loads(row['upgrades']),
+            'kills': row['kills'],
+            'credits': row['credits'],
+            'level': row['level'],
+            'perf': None if row['perf'] is None else json.loads(row['perf']),
+        }
+
+    def get_recent(self,
+                   limit: int = 10,
+                   ship_class: str | None = None
+                   ) -> list[SessionRowDict]:
+        """Return the latest sessions, optionally only with one ship."""
+
+        if ship_class is None:
+            rows = self._query(
+                "SELECT * FROM sessions ORDER BY start_time DESC LIMIT ?",
+                (limit,)
+            )
+        else:
+            rows = self._query(
+                "SELECT * FROM sessions WHERE ship_class = ? "
+                "ORDER BY start_time DESC LIMIT ?",
+                (ship_class, limit)
+            )
+
+        return [self._to_row(row) for row in rows]
+
+    def get_best(self, column: str, limit: int = 10) -> list[SessionRowDict]:
+        """Return the sessions with the highest value in the column."""
+
+        if column not in SessionHistory.rankable:
+            print(f"Sessions cannot be ranked by {column}.")
+            return []
+
+        rows = self._query(
+            f"SELECT * FROM sessions ORDER BY {column} DESC LIMIT ?", (limit,)
+        )
+        return [self._to_row(row) for row in rows]
+
+    def count_at_least(self, column: str, value: int) -> int:
+        """Return how many sessions reached the value in the column."""
+
+        if column not in SessionHistory.rankable:
+            print(f"Sessions cannot be ranked by {column}.")
+            return 0
+
+        rows = self._query(
+            f"SELECT COUNT(*) FROM sessions WHERE {column} >= ?", (value,)
+        )
+        return rows[0][0] if rows else 0
+
+    def get_totals(self) -> SessionTotalsDict:
+        """Return the totals over all stored sessions."""
+
+        rows = self._query(
+            "SELECT COUNT(*), TOTAL(duration_ms), TOTAL(kills), TOTAL(credits) "
+            "FROM sessions"
+        )
+        if not rows:
+            return {'sessions': 0, 'duration_ms': 0, 'kills': 0, 'credits': 0}
+
+        sessions, duration, kills, credits = rows[0]
+        return {
+            'sessions': sessions,
+            'duration_ms': int(duration),
+            'kills': int(kills),
+            'credits': int(credits),
+        }
+
+    # -------------------------------------------------------------------
+    # endregion queries
+
+__all__ = ["SessionHistory"]
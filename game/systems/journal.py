@@ -0,0 +1,123 @@
+"""
+A module containing the Journal class, an append-only file of small
+change records, one json object per line.
+"""
+
+from pathlib import Path
+from typing import Any
+import json
+
+class Journal():
+    """
+    A class which appends records to a file and reads them back.
+
+    Compacting the journal starts by rotating it: the current file is
+    renamed and new records go to a fresh file. The rotated file is
+    discarded once the snapshot which covers it is safely written.
+    Until then, both files are read back.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize the journal for the file at the given path."""
+
+        self.path: Path = Path(path)
+        self.rotated_path: Path = self.path.with_name(f"{self.path.name}.old")
+
+        # records in the current and the rotated file
+        self.size: int = 0
+        self.rotated_size: int = 0
+
+    def append(self, record: dict[str, Any]) -> None:
+        """Add the record to the end of the journal."""
+
+        line = json.dumps(record, separators=(',', ':')) + "\n"
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a') as file:
+                file.write(line)
+        except Exception as e:
+            print(f"Encountered an error while appending to {self.path}: {e}.")
+            return
+
+        self.size += 1
+
+    def read(self) -> list[dict[str, Any]]:
+        """
+        Return the records from the rotated and the current file,
+        oldest first. Reading a file stops at the first damaged line,
+        which is left by a crash in the middle of an append.
+        """
+
+        records: list[dict[str, Any]] = []
+        for path in (self.rotated_path, self.path):
+            file_records = self._read_file(path)
+            if path == self.path:
+                self.size = len(file_records)
+            else:
+                self.rotated_size = len(file_records)
+            records += file_records
+
+        return records
+
+    def _read_file(self, path: Path) -> list[dict[str, Any]]:
+        """Return the records from a single journal file."""
+
+        if not path.exists():
+            return []
+
+        records: list[dict[str, Any]] = []
+        try:
+            lines = path.read_bytes().splitlines(keepends=True)
+        except Exception as e:
+            print(f"Encountered an error while reading {path}: {e}.")
+            return []
+
+        valid_bytes = 0
+        is_damaged = False
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                print(f"\tSkipping the damaged end of {path}.")
+                # cut it off, so new records are not appended to it
+                with open(path, 'r+b') as file:
+                    file.truncate(valid_bytes)
+                is_damaged = True
+                break
+            valid_bytes += len(line)
+
+        if lines and not is_damaged and not lines[-1].endswith(b"\n"):
+            # the last record is whole, but the crash cut its line ending
+            with open(path, 'ab') as file:
+                file.write(b"\n")
+
+        return records
+
+    def is_rotated(self) -> bool:
+        """Return True if a rotated file is waiting to be discarded."""
+
+        return self.rotated_path.exists()
+
+    def rotate(self) -> bool:
+        """Start a fresh file, keeping the current one until discarded."""
+
+        if self.is_rotated() or not self.path.exists():
+            return False
+
+        try:
+            self.path.replace(self.rotated_path)
+        except Exception as e:
+            print(f"Encountered an error while rotating {self.path}: {e}.")
+            return False
+
+        self.rotated_size = self.size
+        self.size = 0
+        return True
+
+    def discard_rotated(self) -> None:
+        """Delete the rotated file, once its records are no longer needed."""
+
+        self.rotated_path.unlink(missing_ok=True)
+        self.rotated_size = 0
+
+__all__ = ["Journal"]
@@ -14,7 +14,11 @@ import json
 import pygame
 from pygame.mixer import Channel, Sound
 
+from .premix import Premixer
+from .sound_bank import SoundBank
+from .streaming import AudioStream
 from ..utils import config, events
+from ..utils.asset_pack import get_pack
 
 class MusicPlayer():
     """A class which handles playing music from a sequence of sounds."""
@@ -23,8 +27,27 @@ class MusicPlayer():
         """Initialize the music player."""
 
         self.game: Game = game
+        self.sound_bank: SoundBank = self.game.sound_bank
 
-        pygame.mixer.set_reserved(4)
+        # 'premix' plays the whole sequence as one Sound on one channel,
+        # 'queued' keeps the next step queued on each channel (gapless),
+        # 'event' starts each step when the drum channel ends
+        self.scheduling: str = config.music_scheduling
+        if self.scheduling == 'premix' and not Premixer.is_available():
+            print("Premixing is unavailable. Using queued scheduling.")
+            self.scheduling = 'queued'
+
+        self.premixer = Premixer(self.sound_bank)
+        self.premixed: Sound | None = None
+        # a premixed sequence streamed from its cached file instead
+        self.stream: AudioStream | None = None
+        self.is_paused: bool = False
+
+        # stems play on the first four channels; a premixed sequence
+        # plays on the drum channel alone, and lends the rest to the
+        # sound effects (see _reserve_channels)
+        self.reserved_channels: int = config.music_channels
+        pygame.mixer.set_reserved(self.reserved_channels)
 
         self.drum_ch = Channel(0)
         self.bass_ch = Channel(1)
@@ -42,6 +65,13 @@ class MusicPlayer():
 
         self.sequence_sounds: list[str] = []
         self.sequence: list[list[int]] = []
+
+        # decoded Sounds, indexed like sequence_sounds
+        self.step_sounds: list[Sound | None] = []
+        self.silence: Sound | None = self.sound_bank.get("silence.wav")
+
+        # (file name, autoplay) of a sequence whose sounds are decoding
+        self.loading: tuple[str, bool] | None = None
     
     def load_sequence(self,
                       file_name: str,
@@ -51,13 +81,14 @@ class MusicPlayer():
         """Load a sequence of sounds."""
 
         path = Path(config.sequences_path, file_name)
-        if not path.exists():
+        pack = get_pack()
+        if not pack.exists(path):
             print(f"No sequence at: {path}")
             return
         
         contents = None
         try:
-            contents = json.loads(path.read_text())
+            contents = json.loads(pack.read_bytes(path))
         except Exception as e:
             print(f"Encountered an error while parsing sequence contents:\n{e}")
             return
@@ -68,9 +99,43 @@ class MusicPlayer():
         
         self.sequence_sounds = contents['sounds']
         self.sequence = contents['sequence']
-
         self.max_step = len(self.sequence) - 1
         self.loop_sequence = loop_sequence
+        self.stop()
+
+        # the stems are decoded in the background, see poll
+        self.loading = (file_name, autoplay)
+        for sound_name in self.sequence_sounds:
+            self.sound_bank.load_async(sound_name)
+        self.poll()
+
+    def poll(self) -> None:
+        """
+        Keep a streamed sequence fed, and finish loading the sequence
+        once all its sounds are decoded.
+        """
+
+        if self.stream is not None and not self.is_paused:
+            self.stream.update()
+
+        if self.loading is None or not self.sound_bank.poll():
+            return
+
+        file_name, autoplay = self.loading
+        self.loading = None
+        self.step_sounds = self.sound_bank.resolve(self.sequence_sounds)
+
+        self.premixed = None
+        self.stream = None
+        if self.scheduling == 'premix':
+            path = None
+            if config.stream_music:
+                path = self.premixer.render_file(file_name)
+            if path is not None:
+                self.stream = AudioStream(path, self.drum_ch, self.loop_sequence)
+            else:
+                self.premixed = self.premixer.render(file_name)
+        self._reserve_channels()
 
         self.reset_sequence()
 
@@ -86,17 +151,13 @@ class MusicPlayer():
         if step > self.max_step:
             return
 
-        dir = config.sounds_path
-        drum = self.sequence_sounds[self.sequence[step][0]]
-        bass = self.sequence_sounds[self.sequence[step][1]]
-        chrd = self.sequence_sounds[self.sequence[step][2]]
-        mldy = self.sequence_sounds[self.sequence[step][3]]
-        self.drum_snd = None if not drum else Sound(Path(dir, drum))
-        self.bass_snd = None if not bass else Sound(Path(dir, bass))
-        self.chrd_snd = None if not chrd else Sound(Path(dir, chrd))
-        self.mldy_snd = None if not mldy else Sound(Path(dir, mldy))
-
-        self._insert_silence()
+        with self.game.tracer.trace('load_step', 'audio', {'step': step}):
+            self.drum_snd = self.step_sounds[self.sequence[step][0]]
+            self.bass_snd = self.step_sounds[self.sequence[step][1]]
+            self.chrd_snd = self.step_sounds[self.sequence[step][2]]
+            self.mldy_snd = self.step_sounds[self.sequence[step][3]]
+
+            self._insert_silence()
     
     def _insert_silence(self) -> None:
         """
@@ -105,8 +166,7 @@ class MusicPlayer():
         """
 
         if self.drum_snd is None:
-            dir = config.sounds_path
-            self.drum_snd = Sound(Path(dir, "silence.wav"))
+            self.drum_snd = self.silence
 
     def _play(self) -> None:
         """Play the loaded sounds."""
@@ -124,6 +184,94 @@ class MusicPlayer():
         if self.mldy_snd:
             self.mldy_ch.play(self.mldy_snd)
     
+    def _get_channel_sounds(self) -> list[tuple[Channel, Sound | None]]:
+        """
+        Return the loaded sounds paired with their channels. Empty parts
+        are filled with silence, so every channel stays on the same step.
+        """
+
+        return [
+            (self.drum_ch, self.drum_snd or self.silence),
+            (self.bass_ch, self.bass_snd or self.silence),
+            (self.chrd_ch, self.chrd_snd or self.silence),
+            (self.mldy_ch, self.mldy_snd or self.silence),
+        ]
+
+    def _schedule_next_step(self) -> bool:
+        """
+        Load the step to be scheduled next, wrapping around if looping.
+        Return False if the sequence has ended.
+        """
+
+        if self.current_step > self.max_step:
+            if not self.loop_sequence:
+                return False
+            self.current_step = 0
+
+        self._load_step(self.current_step)
+        self.current_step += 1
+        return True
+
+    def _update_queued(self) -> None:
+        """
+        Keep one step queued behind the playing one on every channel,
+        so the mixer moves on to it without waiting for the game loop.
+        """
+
+        if not self.drum_ch.get_busy():
+            # nothing is playing (first step, or the queue ran dry)
+            if not self._schedule_next_step():
+                return
+            for channel, sound in self._get_channel_sounds():
+                if sound:
+                    channel.play(sound)
+            self.drum_ch.set_endevent(events.MUSIC_STEP_FINISHED)
+
+        if self.drum_ch.get_queue() is not None:
+            return
+
+        if not self._schedule_next_step():
+            return
+        for channel, sound in self._get_channel_sounds():
+            if sound:
+                channel.queue(sound)
+
+    def _play_premixed(self) -> None:
+        """Play the premixed sequence on the drum channel."""
+
+        if self.premixed is None or self.drum_ch.get_busy():
+            return
+
+        loops = -1 if self.loop_sequence else 0
+        self.drum_ch.play(self.premixed, loops)
+
+    def _is_premixed(self) -> bool:
+        """Return True if the sequence plays premixed, on one channel."""
+
+        return self.premixed is not None or self.stream is not None
+
+    def _reserve_channels(self) -> None:
+        """
+        Keep only the drum channel while a premixed sequence plays, and
+        take the other three back from the sound effects for stems.
+        """
+
+        count = 1 if self._is_premixed() else config.music_channels
+        if count == self.reserved_channels:
+            return
+
+        self.reserved_channels = count
+        pygame.mixer.set_reserved(count)
+        self.game.sfx.set_first_channel(count)
+        self.set_volume()
+
+    def _get_channels(self) -> list[Channel]:
+        """Return the channels the music is playing on."""
+
+        if self._is_premixed():
+            return [self.drum_ch]
+        return [self.drum_ch, self.bass_ch, self.chrd_ch, self.mldy_ch]
+
     def reset_sequence(self) -> None:
         """Set the sequence to step 0."""
         self.stop()
@@ -133,27 +281,26 @@ class MusicPlayer():
     def pause(self) -> None:
         """Pauses playback on all channels."""
 
-        self.drum_ch.pause()
-        self.bass_ch.pause()
-        self.chrd_ch.pause()
-        self.mldy_ch.pause()
+        self.is_paused = True
+        for channel in self._get_channels():
+            channel.pause()
     
     def unpause(self) -> None:
         """Resumes playback on all channels."""
 
-        self.drum_ch.unpause()
-        self.bass_ch.unpause()
-        self.chrd_ch.unpause()
-        self.mldy_ch.unpause()
+        self.is_paused = False
+        for channel in self._get_channels():
+            channel.unpause()
     
     def stop(self) -> None:
         """Stop playback on all channels."""
 
+        if self.stream is not None:
+            self.stream.stop()
+        self.is_paused = False
         self.drum_ch.set_endevent()
-        self.drum_ch.stop()
-        self.bass_ch.stop()
-        self.chrd_ch.stop()
-        self.mldy_ch.stop()
+        for channel in self._get_channels():
+            channel.stop()
     
     def set_volume(self, volume: int | None = None) -> None:
         """Sets the volume for all channels."""
@@ -166,16 +313,32 @@ class MusicPlayer():
         elif volume > 10:
             volume = 10
         
-        self.drum_ch.set_volume(volume * 0.1)
-        self.bass_ch.set_volume(volume * 0.1)
-        self.chrd_ch.set_volume(volume * 0.1)
-        self.mldy_ch.set_volume(volume * 0.1)
+        # the lent channels are set when they are taken back
+        for channel in self._get_channels():
+            channel.set_volume(volume * 0.1)
     
     def update(self) -> None:
         """
         Update the music player. Play step, load next, increment step.
         """
 
+        if self.loading is not None:
+            return
+
+        if self.stream is not None:
+            if not self.stream.is_started:
+                self.stream.start()
+            return
+
+        if self.premixed is not None:
+            self._play_premixed()
+            return
+
+        if self.scheduling in ('queued', 'premix'):
+            # a sequence that failed to premix is played step by step
+            self._update_queued()
+            return
+
         if self.loop_sequence and self.current_step > self.max_step:
             self.reset_sequence()
         
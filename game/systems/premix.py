@@ -0,0 +1,231 @@
+"""
+A module containing the Premixer class, which renders a music sequence
+into a single Sound ahead of time, so it plays on one channel.
+
+Requires numpy (for pygame.sndarray). Without it, the MusicPlayer
+falls back to playing the sequence step by step. With soundfile too,
+the mix can be written as a WAV file, which is streamed rather than
+held in memory (see render_file).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import hashlib
+import json
+
+import pygame
+from pygame.mixer import Sound
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+from .sound_bank import SoundBank
+from .streaming import StreamDecoder
+from ..utils import config
+from ..utils.asset_pack import get_pack
+
+class Premixer():
+    """
+    A class which mixes the parts of each step of a sequence together
+    and joins the steps into one buffer. Rendered mixes are cached in
+    memory and on disk, keyed by the contents of the sequence and sounds.
+    """
+
+    def __init__(self, sound_bank: SoundBank) -> None:
+        """Initialize the premixer."""
+
+        self.sound_bank: SoundBank = sound_bank
+
+        self.mixes: dict[str, Sound] = {}
+        # path -> (size, mtime, hash), so unchanged files are not re-read
+        self._file_hashes: dict[Path, tuple[int, int, str]] = {}
+
+    @staticmethod
+    def is_available() -> bool:
+        """Return True if premixing is possible."""
+
+        return numpy is not None and pygame.mixer.get_init() is not None
+
+    def _hash_file(self, path: Path) -> str:
+        """Return the hash of the file's contents."""
+
+        # the asset pack stores the hash of each packed file
+        packed_hash = get_pack().get_hash(path)
+        if packed_hash is not None:
+            return packed_hash
+
+        stat = path.stat()
+        cached = self._file_hashes.get(path, None)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+
+        digest = hashlib.sha1(path.read_bytes()).hexdigest()
+        self._file_hashes[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def _get_key(self, file_name: str) -> str:
+        """
+        Return the cache key for the sequence: a hash of the sequence
+        file, the sound files it uses and the mixer format.
+        """
+
+        key = hashlib.sha1()
+        key.update(str(pygame.mixer.get_init()).encode())
+        key.update(self._hash_file(Path(config.sequences_path, file_name)).encode())
+
+        contents = json.loads(get_pack().read_bytes(Path(config.sequences_path, file_name)))
+        for sound_name in contents['sounds']:
+            if not sound_name:
+                continue
+            path = self.sound_bank.find_path(sound_name)
+            if path is not None:
+                key.update(self._hash_file(path).encode())
+
+        return key.hexdigest()
+
+    def render(self, file_name: str) -> Sound | None:
+        """
+        Return the premixed Sound for the sequence with the given file
+        name, rendering it if it is not cached. Returns None on failure.
+        """
+
+        if not Premixer.is_available():
+            return None
+
+        try:
+            key = self._get_key(file_name)
+        except Exception as e:
+            print(f"Could not hash the sequence {file_name}:\n{e}")
+            return None
+
+        if key in self.mixes:
+            return self.mixes[key]
+
+        cache_path = Path(config.premix_cache_path, f"{key}.npy")
+        mix = self._load_cached(cache_path)
+        if mix is None:
+            mix = self._mix(file_name)
+            if mix is None:
+                return None
+            self._save_cached(cache_path, mix)
+
+        sound = pygame.sndarray.make_sound(mix)
+        self.mixes[key] = sound
+        return sound
+
+    def render_file(self, file_name: str) -> Path | None:
+        """
+        Return the path of the premix of the sequence as a WAV file, in
+        the mixer's format, rendering it if it is not cached, so it can
+        be played with an AudioStream. Returns None on failure.
+        """
+
+        if not Premixer.is_available() or not StreamDecoder.can_stream():
+            return None
+
+        try:
+            key = self._get_key(file_name)
+        except Exception as e:
+            print(f"Could not hash the sequence {file_name}:\n{e}")
+            return None
+
+        path = Path(config.premix_cache_path, f"{key}.wav")
+        if path.exists():
+            return path
+
+        mix = self._load_cached(path.with_suffix(".npy"))
+        if mix is None:
+            mix = self._mix(file_name)
+            if mix is None:
+                return None
+
+        frequency = pygame.mixer.get_init()[0]
+        subtype = 'PCM_16' if mix.dtype == numpy.int16 else 'FLOAT'
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            soundfile.write(path, mix, frequency, subtype=subtype)
+        except Exception as e:
+            print(f"Encountered an error while caching a mix: {e}.")
+            path.unlink(missing_ok=True)
+            return None
+
+        return path
+
+    def _mix(self, file_name: str) -> numpy.ndarray | None:
+        """Mix the sequence into a single array of samples."""
+
+        try:
+            contents = json.loads(get_pack().read_bytes(Path(config.sequences_path, file_name)))
+        except Exception as e:
+            print(f"Encountered an error while parsing sequence contents:\n{e}")
+            return None
+
+        sounds = self.sound_bank.resolve(contents['sounds'])
+        silence = self.sound_bank.get("silence.wav")
+        arrays: dict[int, numpy.ndarray] = {}
+
+        def get_array(sound: Sound) -> numpy.ndarray:
+            """Return the samples of the sound, copying them once."""
+            if id(sound) not in arrays:
+                arrays[id(sound)] = pygame.sndarray.array(sound)
+            return arrays[id(sound)]
+
+        steps: list[numpy.ndarray] = []
+        sample_type = None
+        for step in contents['sequence']:
+            parts = [sounds[index] for index in step]
+
+            # the drum part (or silence) sets the length of the step
+            drum = parts[0] or silence
+            if drum is None:
+                print("Cannot premix a sequence without silence.wav.")
+                return None
+
+            base = get_array(drum)
+            sample_type = base.dtype
+            mixed = numpy.zeros(base.shape, dtype=numpy.int32)
+            for sound in parts:
+                if sound is None:
+                    continue
+                samples = get_array(sound)[:len(mixed)]
+                mixed[:len(samples)] += samples
+            steps.append(mixed)
+
+        if not steps or sample_type is None:
+            return None
+
+        limits = numpy.iinfo(sample_type)
+        mix = numpy.concatenate(steps)
+        numpy.clip(mix, limits.min, limits.max, out=mix)
+        return mix.astype(sample_type)
+
+    def _load_cached(self, path: Path) -> numpy.ndarray | None:
+        """Load a previously rendered mix from disk."""
+
+        if not path.exists():
+            return None
+
+        try:
+            return numpy.load(path)
+        except Exception as e:
+            print(f"Encountered an error while loading a cached mix: {e}.")
+            return None
+
+    def _save_cached(self, path: Path, mix: numpy.ndarray) -> None:
+        """Save a rendered mix to disk."""
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            numpy.save(path, mix)
+        except Exception as e:
+            print(f"Encountered an error while caching a mix: {e}.")
+
+__all__ = ["Premixer"]
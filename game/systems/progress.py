@@ -1,15 +1,20 @@
 """
 A module containing the Progress class,
 which saves, loads, and keeps track of player progress.
+
+Changes are appended to a journal as small records. The save file is
+a snapshot, rewritten only when the journal is compacted. Loading
+replays the journal onto the snapshot.
 """
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, TypedDict
+from typing import TYPE_CHECKING, Any, Callable, TypedDict
 if TYPE_CHECKING:
     from ..game import Game
 
-from pathlib import Path
-import json
+import copy
+from . import save_format
+from .journal import Journal
 from ..utils import config
 from ..mechanics import rewards
 
@@ -31,6 +36,9 @@ class ProgressDict(TypedDict):
     upgrades: dict[str, UpgradesProgressDict]
     rewards: dict[str, RewardsProgressDict]
 
+    # the last journal record included in this data
+    journal_seq: int
+
 class UpgradesProgressDict(TypedDict):
     """
     A class representing a dictionary containing information on the
@@ -56,24 +64,31 @@ class Progress():
 
         self.game: Game = game
 
+        self.data: ProgressDict = self._load_snapshot()
+
+        self.journal = Journal(config.journal_path)
+        self._replay_journal()
+    
+    def _load_snapshot(self) -> ProgressDict:
+        """Load the main save, or the backup, or the defaults."""
+
         data = self._load_data(config.main_save_path)
         if data:
             # loading main file successful
-            self.data: ProgressDict = data
+            self.data = data
             self.save_data(True) # save current data as backup
-            return
+            return data
         
         # otherwise, try loading the backup
         print("Failed to load the main save. Loading backup...")
         data = self._load_data(config.back_save_path)
         if data:
             # at least the backup worked
-            self.data: ProgressDict = data
-            return
+            return data
         
         # otherwise, just use the defaults
         print("Failed to load backup save. Using defaults.")
-        self.data: ProgressDict = self._defaults()
+        return self._defaults()
     
     def _defaults(self) -> ProgressDict:
         """Returns default progress data (new game)."""
@@ -89,7 +104,9 @@ class Progress():
             'total_session_duration' : 0,
 
             'upgrades': {},
-            'rewards': {}
+            'rewards': {},
+
+            'journal_seq': 0
         }
 
         for upgrade in self.game.upgrades.values():
@@ -112,17 +129,17 @@ class Progress():
         return data
     
     def _load_data(self, path: str) -> ProgressDict | None:
-        """Load progress data from a .json file."""
+        """Load progress data from a .json or binary save file."""
 
-        p = Path(path)
-        if not p.exists():
-            print(f"\tFile not found at: {p}.")
+        p = save_format.find(path)
+        if p is None:
+            print(f"\tFile not found at: {save_format.get_path(path)}.")
             return None
         
         data = self._defaults()
         
         try:
-            loaded_data = json.loads(p.read_text())
+            loaded_data = save_format.load('progress', p)
             self._copy_ProgressDict_values(loaded_data, data)
         except Exception as e:
             print(f"\t\tEncountered an error while loading progress data: {e}.")
@@ -156,38 +173,150 @@ class Progress():
     def save_data(self,
                   save_as_backup: bool = False
                   ) -> None:
-        """Save the current progress data to a .json file."""
+        """
+        Save the current progress data in the configured format.
+        The file is written in the background by the save service.
+        """
 
         if save_as_backup:
-            path = Path(config.back_save_path)
+            path = config.back_save_path
         else:
-            path = Path(config.main_save_path)
+            path = config.main_save_path
         
-        try:
-            data = json.dumps(self.data, indent=4)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(data)
-        except Exception as e:
-            print(f"Encountered an error while saving progress: {e}.")
-    
-    def update(self) -> None:
-        """Updates the progress after the session ends, and saves."""
+        with self.game.tracer.trace('save_data', 'io', {'path': path}):
+            self._request_save(path)
+
+    def _request_save(self,
+                      path: str,
+                      on_written: Callable[[], None] | None = None
+                      ) -> None:
+        """Hand a copy of the data to the save service."""
+
+        self.game.save_service.request(
+            save_format.get_path(path),
+            copy.deepcopy(self.data),
+            save_format.get_encoder('progress'),
+            on_written
+        )
+
+    # region JOURNAL
+    # -------------------------------------------------------------------
+
+    def _replay_journal(self) -> None:
+        """Apply the journal records newer than the loaded snapshot."""
+
+        snapshot_seq = self.data['journal_seq']
+        all_records = self.journal.read()
+        records = [
+            record for record in all_records
+            if record['seq'] > snapshot_seq
+        ]
+        if records and records[0]['seq'] != snapshot_seq + 1:
+            print("\tSome progress records are missing. Replaying the rest.")
+
+        for record in records:
+            try:
+                self._apply(record)
+            except Exception as e:
+                print(f"\tSkipping a bad progress record: {e}.")
+            self.data['journal_seq'] = record['seq']
+
+        if not self.journal.is_rotated():
+            return
+
+        # left by a compaction which did not finish, so compaction would
+        # stay off until it is gone
+        rotated = all_records[:self.journal.rotated_size]
+        if all(record['seq'] <= snapshot_seq for record in rotated):
+            self.journal.discard_rotated()
+        else:
+            self._request_save(config.main_save_path, self.journal.discard_rotated)
 
-        self.data['credits'] += self.game.state.credits_earned
+    def _apply(self, record: dict[str, Any]) -> None:
+        """Apply the change described by the record to the data."""
+
+        op = record['op']
+        if op == 'credits':
+            self.data['credits'] += record['delta']
+        elif op == 'upgrade':
+            if record['name'] in self.data['upgrades']:
+                self.data['upgrades'][record['name']]['level'] = record['level']
+        elif op == 'reward':
+            if record['name'] in self.data['rewards']:
+                self.data['rewards'][record['name']][record['key']] = record['value']
+        elif op == 'session':
+            self._apply_session(record['credits_earned'], record['duration'])
+
+    def _apply_session(self, credits_earned: int, duration: int) -> None:
+        """Fold a finished session into the data."""
+
+        self.data['credits'] += credits_earned
 
         if self.data['credits'] > self.data['max_credits_owned']:
             self.data['max_credits_owned'] = self.data['credits']
         
-        if self.game.state.credits_earned > self.data['max_credits_session']:
-            self.data['max_credits_session'] = self.game.state.credits_earned
+        if credits_earned > self.data['max_credits_session']:
+            self.data['max_credits_session'] = credits_earned
         
         self.data['num_of_sessions'] += 1
 
-        if self.game.state.session_duration > self.data['longest_session']:
-            self.data['longest_session'] = self.game.state.session_duration
+        if duration > self.data['longest_session']:
+            self.data['longest_session'] = duration
         
-        self.data['total_session_duration'] += self.game.state.session_duration
+        self.data['total_session_duration'] += duration
+
+    def _record(self, record: dict[str, Any]) -> None:
+        """Apply the record, add it to the journal, and compact if needed."""
+
+        record['seq'] = self.data['journal_seq'] + 1
+        self._apply(record)
+        self.data['journal_seq'] = record['seq']
+        self.journal.append(record)
+
+        if self.journal.size >= config.journal_compact_records:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Write the current data as the new snapshot, in the background.
+        The journal is rotated first, and the rotated part is discarded
+        once the snapshot is on disk.
+        """
+
+        if not self.journal.rotate():
+            # empty, or the previous snapshot is still being written
+            return
+
+        self._request_save(config.main_save_path, self.journal.discard_rotated)
+
+    def add_credits(self, delta: int) -> None:
+        """Add the given (possibly negative) amount of credits."""
+
+        self._record({'op': 'credits', 'delta': delta})
+
+    def set_upgrade_level(self, name: str, level: int) -> None:
+        """Set the saved level of the upgrade with the given name."""
+
+        self._record({'op': 'upgrade', 'name': name, 'level': level})
+
+    def set_reward_flag(self, name: str, key: str, value: bool) -> None:
+        """
+        Set one of the saved flags (is_unlocked, is_claimed_or_toggled)
+        of the reward with the given name.
+        """
+
+        self._record({'op': 'reward', 'name': name, 'key': key, 'value': value})
+
+    # -------------------------------------------------------------------
+    # endregion journal
+    
+    def update(self) -> None:
+        """Updates the progress after the session ends."""
 
-        self.save_data()
+        self._record({
+            'op': 'session',
+            'credits_earned': self.game.state.credits_earned,
+            'duration': self.game.state.session_duration,
+        })
 
 __all__ = ["Progress"]
@@ -0,0 +1,351 @@
+"""
+A module for reading and writing save files, as json or in a compact
+binary format.
+
+A binary save starts with a header holding the format version, the kind
+of save (progress, settings) and the version of its schema. Keys and
+other strings are stored once in a string table, and values are tagged
+and packed. Saves with an older schema are brought up to date by the
+registered migration steps, whichever format they were read from.
+"""
+
+from pathlib import Path
+from typing import Any, Callable
+import json
+import struct
+
+from ..utils import config
+
+MAGIC = b"DSSV"
+FORMAT_VERSION = 1
+# magic, format version, kind, schema version
+HEADER = struct.Struct("<4sBBH")
+
+kinds: tuple[str, ...] = ('progress', 'settings', 'session')
+
+# the current schema version of each kind of save
+schema_versions: dict[str, int] = {
+    'progress': 2,
+    'settings': 1,
+    'session': 1,
+}
+
+# kind -> version -> step migrating data from that version to the next
+migrations: dict[str, dict[int, Callable[[dict], dict]]] = {
+    kind: {} for kind in kinds
+}
+
+def migration(kind: str, from_version: int):
+    """Register the decorated function as a migration step."""
+
+    def register(step: Callable[[dict], dict]) -> Callable[[dict], dict]:
+        migrations[kind][from_version] = step
+        return step
+
+    return register
+
+@migration('progress', 1)
+def _add_journal_seq(data: dict) -> dict:
+    """Progress saves from before the journal have not seen any records."""
+
+    data.setdefault('journal_seq', 0)
+    return data
+
+def migrate(kind: str, version: int, data: dict) -> dict:
+    """Run the migration steps from the given version to the current one."""
+
+    current = schema_versions[kind]
+    if version > current:
+        raise ValueError(f"{kind} save has schema {version}, newer than {current}")
+
+    while version < current:
+        if version not in migrations[kind]:
+            raise ValueError(f"No migration for {kind} schema {version}")
+        data = migrations[kind][version](data)
+        version += 1
+
+    return data
+
+# region VALUE PACKING
+# -------------------------------------------------------------------
+
+TAG_NONE, TAG_FALSE, TAG_TRUE, TAG_INT, TAG_FLOAT, TAG_STR, TAG_LIST, TAG_DICT = range(8)
+# a list of dicts which all have the same keys, stored once
+TAG_RECORDS = 8
+DOUBLE = struct.Struct("<d")
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Write a non-negative int, 7 bits per byte."""
+
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(blob: bytes, pos: int) -> tuple[int, int]:
+    """Read a non-negative int. Return it and the new position."""
+
+    value = 0
+    shift = 0
+    while True:
+        byte = blob[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+class _Packer():
+    """A class which packs a value, collecting its strings in a table."""
+
+    def __init__(self) -> None:
+        """Initialize the packer."""
+
+        self.strings: dict[str, int] = {}
+        self.body = bytearray()
+
+    def _string(self, value: str) -> None:
+        """Write the index of the string, adding it to the table."""
+
+        index = self.strings.get(value, None)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        _write_varint(self.body, index)
+
+    def pack(self, value: Any) -> None:
+        """Write the tagged value."""
+
+        out = self.body
+        if value is None:
+            out.append(TAG_NONE)
+        elif value is True:
+            out.append(TAG_TRUE)
+        elif value is False:
+            out.append(TAG_FALSE)
+        elif isinstance(value, int):
+            out.append(TAG_INT)
+            # zigzag, so small negative numbers stay small
+            _write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+        elif isinstance(value, float):
+            out.append(TAG_FLOAT)
+            out += DOUBLE.pack(value)
+        elif isinstance(value, str):
+            out.append(TAG_STR)
+            self._string(value)
+        elif isinstance(value, (list, tuple)):
+            self._pack_list(value)
+        elif isinstance(value, dict):
+            out.append(TAG_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                self._string(str(key))
+                self.pack(item)
+        else:
+            raise TypeError(f"Cannot save a value of type {type(value).__name__}")
+
+    def _pack_list(self, value: list | tuple) -> None:
+        """Write a list, as records if all its items share their keys."""
+
+        out = self.body
+        keys = None
+        if len(value) > 1 and isinstance(value[0], dict):
+            keys = list(value[0])
+            for item in value:
+                if not isinstance(item, dict) or list(item) != keys:
+                    keys = None
+                    break
+
+        if keys is None:
+            out.append(TAG_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                self.pack(item)
+            return
+
+        out.append(TAG_RECORDS)
+        _write_varint(out, len(value))
+        _write_varint(out, len(keys))
+        for key in keys:
+            self._string(str(key))
+        for item in value:
+            for key in keys:
+                self.pack(item[key])
+
+    def get_table(self) -> bytes:
+        """Return the packed string table."""
+
+        out = bytearray()
+        _write_varint(out, len(self.strings))
+        for value in self.strings:
+            encoded = value.encode()
+            _write_varint(out, len(encoded))
+            out += encoded
+
+        return bytes(out)
+
+def _unpack(blob: bytes, pos: int, strings: list[str]) -> tuple[Any, int]:
+    """Read a tagged value. Return it and the new position."""
+
+    tag = blob[pos]
+    pos += 1
+
+    # most values are small ints and strings, which fit in one byte
+    if tag == TAG_INT:
+        value = blob[pos]
+        if value < 0x80:
+            pos += 1
+        else:
+            value, pos = _read_varint(blob, pos)
+        return (value >> 1) if not value & 1 else -((value + 1) >> 1), pos
+    if tag == TAG_STR:
+        index = blob[pos]
+        if index < 0x80:
+            return strings[index], pos + 1
+        index, pos = _read_varint(blob, pos)
+        return strings[index], pos
+    if tag == TAG_DICT:
+        length, pos = _read_varint(blob, pos)
+        result = {}
+        for _ in range(length):
+            index, pos = _read_varint(blob, pos)
+            result[strings[index]], pos = _unpack(blob, pos, strings)
+        return result, pos
+    if tag == TAG_RECORDS:
+        length, pos = _read_varint(blob, pos)
+        key_count, pos = _read_varint(blob, pos)
+        keys = []
+        for _ in range(key_count):
+            index, pos = _read_varint(blob, pos)
+            keys.append(strings[index])
+        records = []
+        for _ in range(length):
+            values = []
+            for _ in range(key_count):
+                item, pos = _unpack(blob, pos, strings)
+                values.append(item)
+            records.append(dict(zip(keys, values)))
+        return records, pos
+    if tag == TAG_LIST:
+        length, pos = _read_varint(blob, pos)
+        items = []
+        for _ in range(length):
+            item, pos = _unpack(blob, pos, strings)
+            items.append(item)
+        return items, pos
+    if tag == TAG_FALSE:
+        return False, pos
+    if tag == TAG_TRUE:
+        return True, pos
+    if tag == TAG_FLOAT:
+        return DOUBLE.unpack_from(blob, pos)[0], pos + DOUBLE.size
+    if tag == TAG_NONE:
+        return None, pos
+
+    raise ValueError(f"Unknown tag {tag} at byte {pos - 1}")
+
+# -------------------------------------------------------------------
+# endregion value packing
+
+def encode(kind: str, data: dict) -> bytes:
+    """Return the data as a binary save of the given kind."""
+
+    packer = _Packer()
+    packer.pack(data)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, kinds.index(kind), schema_versions[kind])
+    return header + packer.get_table() + bytes(packer.body)
+
+def decode(kind: str, blob: bytes) -> dict:
+    """Return the data from a binary save, migrated to the current schema."""
+
+    magic, format_version, kind_id, version = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Not a binary save")
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"Unknown save format version {format_version}")
+    if kinds[kind_id] != kind:
+        raise ValueError(f"Expected a {kind} save, found {kinds[kind_id]}")
+
+    pos = HEADER.size
+    count, pos = _read_varint(blob, pos)
+    strings: list[str] = []
+    for _ in range(count):
+        length, pos = _read_varint(blob, pos)
+        strings.append(blob[pos:pos + length].decode())
+        pos += length
+
+    data, _ = _unpack(blob, pos, strings)
+    return migrate(kind, version, data)
+
+def encode_json(kind: str, data: dict) -> bytes:
+    """
+    Return the data as an indented json save, wrapped with its kind and
+    schema version like an export, so it is only migrated once older.
+    """
+
+    return export_json(kind, data).encode()
+
+def decode_json(kind: str, text: str | bytes) -> dict:
+    """
+    Return the data from a json save, migrated to the current schema.
+    Accepts both wrapped saves and exports, and the plain saves written
+    before json saves were wrapped (schema 1).
+    """
+
+    loaded = json.loads(text)
+    if isinstance(loaded, dict) and 'schema' in loaded and 'data' in loaded:
+        if loaded.get('kind', kind) != kind:
+            raise ValueError(f"Expected a {kind} save, found {loaded['kind']}")
+        return migrate(kind, loaded['schema'], loaded['data'])
+
+    return migrate(kind, 1, loaded)
+
+def get_encoder(kind: str) -> Callable[[dict], bytes]:
+    """Return a function encoding data of the kind in the configured format."""
+
+    if config.save_format == 'binary':
+        return lambda data: encode(kind, data)
+    return lambda data: encode_json(kind, data)
+
+def get_path(path: str | Path) -> Path:
+    """Return the path to save to, with the suffix of the configured format."""
+
+    if config.save_format == 'binary':
+        return Path(path).with_suffix(".bin")
+    return Path(path).with_suffix(".json")
+
+def find(path: str | Path) -> Path | None:
+    """
+    Return the existing save for the path. If there are saves in both
+    formats (the format was switched), return the newer one.
+    """
+
+    candidates = [
+        candidate for candidate in (
+            get_path(path),
+            Path(path).with_suffix(".json"),
+            Path(path).with_suffix(".bin"),
+        )
+        if candidate.exists()
+    ]
+    if not candidates:
+        return None
+
+    # on a tie, the configured format comes first
+    return max(candidates, key=lambda candidate: candidate.stat().st_mtime_ns)
+
+def load(kind: str, path: str | Path) -> dict:
+    """Load a save of either format, telling them apart by the header."""
+
+    blob = Path(path).read_bytes()
+    if blob.startswith(MAGIC):
+        return decode(kind, blob)
+    return decode_json(kind, blob)
+
+def export_json(kind: str, data: dict) -> str:
+    """Return the data as readable json, wrapped with its schema version."""
+
+    return json.dumps({
+        'kind': kind,
+        'schema': schema_versions[kind],
+        'data': data,
+    }, indent=4)
@@ -0,0 +1,244 @@
+"""
+A module containing the SaveService class, which writes save files
+on a background thread.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, TypedDict
+import atexit
+import json
+import os
+import threading
+import time
+
+from ..utils import config
+
+class SaveStatsDict(TypedDict):
+    """A class representing a dictionary of save service stats."""
+
+    requested: int
+    coalesced: int
+    written: int
+    failed: int
+
+class SaveRequest():
+    """A class representing a file waiting to be written."""
+
+    def __init__(self, data: Any, encoder: Callable[[Any], bytes]) -> None:
+        """Initialize the request."""
+
+        self.data: Any = data
+        self.encoder: Callable[[Any], bytes] = encoder
+        # called on the writer thread, once the data is on disk
+        self.on_written: list[Callable[[], None]] = []
+
+def encode_json(data: Any) -> bytes:
+    """Encode the data as indented json, like the save files always were."""
+
+    return json.dumps(data, indent=4).encode()
+
+class SaveService():
+    """
+    A class which writes files behind the game's back. Requests to save
+    the same file within the coalescing window are merged, so only the
+    latest data is written. Each write goes to a temp file, which is
+    synced and then renamed over the old file, so a crash never leaves
+    a half-written save.
+    """
+
+    def __init__(self, window_ms: int | None = None) -> None:
+        """Initialize the save service. The thread starts on first use."""
+
+        if window_ms is None:
+            window_ms = config.save_coalesce_ms
+        self.window_ms: int = window_ms
+
+        # path -> the latest request for the file
+        self.pending: dict[Path, SaveRequest] = {}
+        self.first_pending: float = 0
+        self.is_writing: bool = False
+        self.is_closed: bool = False
+        self.flush_requested: bool = False
+
+        self.condition = threading.Condition()
+        self.thread: threading.Thread | None = None
+
+        self.stats: SaveStatsDict = {
+            'requested': 0, 'coalesced': 0, 'written': 0, 'failed': 0
+        }
+
+        # in case the game exits without calling Game.quit
+        atexit.register(self.close)
+
+    def request(self,
+                path: str | Path,
+                data: Any,
+                encoder: Callable[[Any], bytes] = encode_json,
+                on_written: Callable[[], None] | None = None
+                ) -> None:
+        """
+        Ask for the data to be saved to the path. The data must not be
+        modified afterwards, so pass a copy of anything still in use.
+        If given, on_written is called from the writer thread once this
+        data (or newer data for the same file) is on disk.
+        """
+
+        path = Path(path)
+        request = SaveRequest(data, encoder)
+        with self.condition:
+            if path in self.pending:
+                # the newer data replaces the older, but both callers wait
+                request.on_written = self.pending[path].on_written
+            if on_written is not None:
+                request.on_written.append(on_written)
+
+            if self.is_closed:
+                # too late for the thread, write it right away
+                self._write(path, request)
+                return
+
+            self.stats['requested'] += 1
+            if path in self.pending:
+                self.stats['coalesced'] += 1
+            elif not self.pending:
+                self.first_pending = time.monotonic()
+            self.pending[path] = request
+
+            self._start_thread()
+            self.condition.notify_all()
+
+    def _start_thread(self) -> None:
+        """Start the writer thread if it is not running."""
+
+        if self.thread is not None and self.thread.is_alive():
+            return
+
+        self.thread = threading.Thread(
+            target=self._work, name="SaveService", daemon=True
+        )
+        self.thread.start()
+
+    def _work(self) -> None:
+        """Write the pending files after each coalescing window."""
+
+        while True:
+            with self.condition:
+                while not self.pending and not self.is_closed:
+                    self.condition.wait()
+
+                if not self.pending:
+                    return
+
+                # wait for the window to pass, unless asked to hurry
+                while not self.flush_requested and not self.is_closed:
+                    remaining = (self.first_pending + self.window_ms / 1000
+                                 - time.monotonic())
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+
+                batch = self.pending
+                self.pending = {}
+                self.flush_requested = False
+                self.is_writing = True
+
+            try:
+                for path, request in batch.items():
+                    self._write(path, request)
+            finally:
+                # or flush and close would wait forever
+                with self.condition:
+                    self.is_writing = False
+                    self.condition.notify_all()
+
+    def _write(self, path: Path, request: SaveRequest) -> None:
+        """Atomically replace the file at the path with the data."""
+
+        temp_path = path.with_name(f"{path.name}.tmp")
+
+        try:
+            contents = request.encoder(request.data)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'wb') as file:
+                file.write(contents)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+            self._sync_directory(path.parent)
+        except Exception as e:
+            self.stats['failed'] += 1
+            print(f"Encountered an error while saving {path}: {e}.")
+            return
+
+        self.stats['written'] += 1
+        for callback in request.on_written:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Encountered an error after saving {path}: {e}.")
+
+    def _sync_directory(self, directory: Path) -> None:
+        """Sync the directory, so the rename itself survives a crash."""
+
+        if os.name != 'posix':
+            return
+
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def discard(self, path: str | Path) -> None:
+        """Drop any pending save for the path and delete the file."""
+
+        path = Path(path)
+        with self.condition:
+            self.pending.pop(path, None)
+            # let a write of the file in progress finish first
+            while self.is_writing:
+                self.condition.wait()
+
+            try:
+                path.unlink(missing_ok=True)
+            except Exception as e:
+                print(f"Encountered an error while deleting {path}: {e}.")
+
+    def flush(self) -> None:
+        """Write everything pending now, and wait until it is written."""
+
+        with self.condition:
+            if not self.pending and not self.is_writing:
+                return
+
+            self.flush_requested = True
+            self.condition.notify_all()
+            while self.pending or self.is_writing:
+                self.condition.wait()
+
+    def close(self) -> None:
+        """Flush the pending saves and stop the writer thread."""
+
+        self.flush()
+        atexit.unregister(self.close)
+
+        with self.condition:
+            self.is_closed = True
+            self.condition.notify_all()
+
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def __str__(self) -> str:
+        """Returns a readable string containing the save stats."""
+
+        return f"""
+SaveService stats:
+    Requested:          {self.stats['requested']}
+    Coalesced:          {self.stats['coalesced']}
+    Written:            {self.stats['written']}
+    Failed:             {self.stats['failed']}
+"""
+
+__all__ = ["SaveService"]
@@ -0,0 +1,57 @@
+"""
+A command line tool which exports saves to readable json and imports
+them back, for debugging.
+
+Usage:
+    python -m game.systems.save_tool export progress game/data/saves/main_save.bin out.json
+    python -m game.systems.save_tool import progress out.json game/data/saves/main_save.bin
+
+Import writes in the format given by the destination's suffix.
+Either command accepts json or binary saves as the source.
+"""
+
+from pathlib import Path
+import argparse
+
+from . import save_format
+
+def export_save(kind: str, source: Path, destination: Path) -> None:
+    """Write the save as json, wrapped with its kind and schema version."""
+
+    data = save_format.load(kind, source)
+    destination.write_text(save_format.export_json(kind, data))
+
+def import_save(kind: str, source: Path, destination: Path) -> None:
+    """Write the save in the format matching the destination's suffix."""
+
+    data = save_format.load(kind, source)
+    if destination.suffix == ".bin":
+        destination.write_bytes(save_format.encode(kind, data))
+    else:
+        destination.write_bytes(save_format.encode_json(kind, data))
+
+def main() -> None:
+    """Run the export or import command."""
+
+    parser = argparse.ArgumentParser(
+        description="Convert saves between json and the binary format."
+    )
+    parser.add_argument('command', choices=('export', 'import'))
+    parser.add_argument('kind', choices=save_format.kinds)
+    parser.add_argument('source', type=Path)
+    parser.add_argument('destination', type=Path)
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'export':
+            export_save(args.kind, args.source, args.destination)
+        else:
+            import_save(args.kind, args.source, args.destination)
+    except Exception as e:
+        print(f"Could not {args.command} {args.source}: {e}")
+        return
+
+    print(f"Wrote {args.destination}.")
+
+if __name__ == '__main__':
+    main()
@@ -4,15 +4,13 @@ for user-defined settings and keybindings.
 """
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, TypedDict
+from typing import TYPE_CHECKING, TypedDict, Callable
 if TYPE_CHECKING:
     from ..game import Game
 
-from pathlib import Path
-import json
-
 import pygame
 
+from . import save_format
 from ..utils import config
 
 class SettingsDict(TypedDict):
@@ -51,6 +49,9 @@ class Keybind():
 
         self.control: str = control
         self.keycode: int = keycode
+
+        # called when the keycode changes, set by the Settings
+        self.on_change: Callable[[], None] | None = None
     
     def get_key_name(self) -> str:
         """Return the name of the key set to this keybind."""
@@ -61,6 +62,9 @@ class Keybind():
         """Sets the keybind to the given keycode."""
 
         self.keycode = keycode
+
+        if self.on_change:
+            self.on_change()
     
     def serialize(self) -> SerializedKeybind:
         """Return a dictionary containing the control and keycode."""
@@ -111,6 +115,9 @@ class Settings():
 
         self.game: Game = game
 
+        # increases each time a keybind changes
+        self.keybinds_version: int = 0
+
         data = self._load_data(config.settings_path)
 
         if data:
@@ -123,16 +130,16 @@ class Settings():
         self.save_data()
       
     def _load_data(self, path: str) -> SerializedSettingsDict | None:
-        """Load the settings and controls from a .json file."""
+        """Load the settings and controls from a .json or binary file."""
 
-        p = Path(path)
-        if not p.exists():
-            print(f"\t\tSettings not found at: {p}.")
+        p = save_format.find(path)
+        if p is None:
+            print(f"\t\tSettings not found at: {save_format.get_path(path)}.")
             return None
         
         data = self._defaults()
         try:
-            loaded_data: SerializedSettingsDict = json.loads(p.read_text())
+            loaded_data: SerializedSettingsDict = save_format.load('settings', p)
             for key in data:
                 if key in loaded_data:
                     data[key] = loaded_data[key]
@@ -274,6 +281,10 @@ class Settings():
             'music_volume' : data['music_volume']
         }
 
+        for keybind in deserialized['keybinds'].values():
+            if isinstance(keybind, Keybind):
+                keybind.on_change = self._mark_keybinds_changed
+
         return deserialized
 
     def serialize_settings(self) -> SerializedSettingsDict:
@@ -343,20 +354,23 @@ class Settings():
         return serialized
 
     def save_data(self) -> None:
-        "Save the current settings to a .json file."
+        "Save the current settings in the configured format, in the background."
 
-        path = Path(config.settings_path)
-
-        try:
-            data = json.dumps(self.serialize_settings(), indent=4)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(data)
-        except Exception as e:
-            print(f"Encountered an error while saving settings: {e}.")
+        self.game.save_service.request(
+            save_format.get_path(config.settings_path),
+            self.serialize_settings(),
+            save_format.get_encoder('settings')
+        )
     
     def restore_to_defaults(self) -> None:
         """Restore the settings to default values."""
 
         self.data = self.deserialize_settings(self._defaults())
+        self._mark_keybinds_changed()
+    
+    def _mark_keybinds_changed(self) -> None:
+        """Let the keybind users know that the keybinds have changed."""
+
+        self.keybinds_version += 1
 
 __all__ = ["Settings"]
@@ -0,0 +1,218 @@
+"""
+A module containing the SoundEffects class, which plays sound effects
+on a bounded pool of mixer channels.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, TypedDict
+if TYPE_CHECKING:
+    from ..game import Game
+
+import pygame
+from pygame.mixer import Channel
+
+from .sound_bank import SoundBank
+from ..utils import config
+
+class SoundEffectDict(TypedDict):
+    """A class representing a dictionary describing a sound effect."""
+
+    file: str
+    priority: int # higher priority effects steal lower priority voices
+    max_instances: int # how many can play at once
+    merge_window_ms: int # repeated triggers within this are merged
+    volume: float
+
+class VoiceDict(TypedDict):
+    """A class representing what a pooled channel is playing."""
+
+    effect: str | None
+    priority: int
+    started: int
+
+class SfxStatsDict(TypedDict):
+    """A class representing a dictionary of sound effect stats."""
+
+    triggered: int
+    played: int
+    merged: int
+    capped: int
+    stolen: int
+    dropped: int
+
+class SoundEffects():
+    """
+    A class which manages the channels not reserved for music.
+    Bursts of identical triggers are merged, the number of instances
+    of each effect is capped, and when every channel is busy a new
+    effect steals the voice of the oldest lower priority effect.
+    """
+
+    effects: dict[str, SoundEffectDict] = {
+        'bullet_fired': {
+            'file': "bullet_fired.wav", 'priority': 1,
+            'max_instances': 2, 'merge_window_ms': 40, 'volume': 0.4
+        },
+        'alien_destroyed': {
+            'file': "alien_destroyed.wav", 'priority': 2,
+            'max_instances': 3, 'merge_window_ms': 60, 'volume': 0.6
+        },
+        'powerup_collected': {
+            'file': "powerup_collected.wav", 'priority': 3,
+            'max_instances': 1, 'merge_window_ms': 100, 'volume': 0.8
+        },
+        'ship_hit': {
+            'file': "ship_hit.wav", 'priority': 4,
+            'max_instances': 1, 'merge_window_ms': 100, 'volume': 1.0
+        },
+        'death_pulse': {
+            'file': "death_pulse.wav", 'priority': 5,
+            'max_instances': 1, 'merge_window_ms': 250, 'volume': 1.0
+        },
+    }
+
+    def __init__(self, game: Game) -> None:
+        """Initialize the sound effects and their channel pool."""
+
+        self.game: Game = game
+        self.sound_bank: SoundBank = self.game.sound_bank
+
+        # the channels before the first are reserved for the music,
+        # which lends some of them while it plays a premixed sequence
+        pygame.mixer.set_num_channels(config.music_channels + config.sfx_channels)
+        self.first_channel: int = config.music_channels
+        self.channels: list[Channel] = []
+        self.voices: list[VoiceDict] = []
+        self.set_first_channel(self.game.music_player.reserved_channels)
+
+        # effects without a sound file yet are skipped when triggered
+        self.available: set[str] = {
+            name for name, effect in SoundEffects.effects.items()
+            if self.sound_bank.exists(effect['file'])
+        }
+
+        if config.load_assets_async:
+            for name in self.available:
+                self.sound_bank.preload(SoundEffects.effects[name]['file'])
+
+        # effect name -> ticks when it was last started
+        self.last_started: dict[str, int] = {}
+
+        self.stats: SfxStatsDict = {
+            'triggered': 0, 'played': 0, 'merged': 0,
+            'capped': 0, 'stolen': 0, 'dropped': 0
+        }
+
+    def play(self, name: str) -> None:
+        """Trigger the sound effect with the given name."""
+
+        self.stats['triggered'] += 1
+        if name not in self.available:
+            return
+
+        effect = SoundEffects.effects[name]
+        now = pygame.time.get_ticks()
+
+        last = self.last_started.get(name, None)
+        if last is not None and now - last < effect['merge_window_ms']:
+            self.stats['merged'] += 1
+            return
+
+        # an effect still decoding is skipped rather than waited for
+        sound = self.sound_bank.get(effect['file'], wait=False)
+        if sound is None:
+            return
+
+        free: int | None = None
+        instances = 0
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                self.voices[i]['effect'] = None
+                if free is None:
+                    free = i
+            elif self.voices[i]['effect'] == name:
+                instances += 1
+
+        if instances >= effect['max_instances']:
+            self.stats['capped'] += 1
+            return
+
+        if free is None:
+            free = self._steal_voice(effect['priority'])
+            if free is None:
+                self.stats['dropped'] += 1
+                return
+
+        channel = self.channels[free]
+        channel.set_volume(effect['volume'])
+        channel.play(sound)
+        self.voices[free] = {
+            'effect': name, 'priority': effect['priority'], 'started': now
+        }
+        self.last_started[name] = now
+        self.stats['played'] += 1
+
+    def _steal_voice(self, priority: int) -> int | None:
+        """
+        Stop the oldest of the lowest priority voices, if its priority
+        is not higher than the given one. Return its index.
+        """
+
+        victim: int | None = None
+        for i, voice in enumerate(self.voices):
+            if voice['priority'] > priority:
+                continue
+            if victim is None:
+                victim = i
+                continue
+            lowest = self.voices[victim]
+            if (voice['priority'], voice['started']) < (lowest['priority'], lowest['started']):
+                victim = i
+
+        if victim is None:
+            return None
+
+        self.channels[victim].stop()
+        self.stats['stolen'] += 1
+        return victim
+
+    def set_first_channel(self, first: int) -> None:
+        """
+        Pool the channels from the given one on, as the music lends or
+        takes back channels. Effects on channels taken back are stopped.
+        """
+
+        last = config.music_channels + config.sfx_channels
+        kept = {
+            self.first_channel + i: voice for i, voice in enumerate(self.voices)
+        }
+        for i in range(self.first_channel, first):
+            Channel(i).stop()
+
+        self.first_channel = first
+        self.channels = [Channel(i) for i in range(first, last)]
+        self.voices = [
+            kept.get(i, {'effect': None, 'priority': 0, 'started': 0})
+            for i in range(first, last)
+        ]
+
+    def stop(self) -> None:
+        """Stop all the sound effects."""
+
+        for channel in self.channels:
+            channel.stop()
+
+    def __str__(self) -> str:
+        """Returns a readable string containing the effect stats."""
+
+        return f"""
+SoundEffects stats:
+    Triggered:          {self.stats['triggered']}
+    Played:             {self.stats['played']}
+    Merged:             {self.stats['merged']}
+    Capped:             {self.stats['capped']}
+    Stolen:             {self.stats['stolen']}
+    Dropped:            {self.stats['dropped']}
+"""
+
+__all__ = ["SoundEffects"]
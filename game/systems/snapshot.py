@@ -0,0 +1,369 @@
+"""
+A module containing the SessionSnapshot class, which suspends the
+running session to disk and rebuilds it later.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, TypedDict
+if TYPE_CHECKING:
+    from ..game import Game
+
+from pathlib import Path
+import random
+import time
+
+import pygame
+
+from . import save_format
+from ..entities import Alien, Bullet, ImproveStat, AddAbility, Ship
+from ..entities.entity import Entity
+from ..entities.powerups import PowerUp
+from ..mechanics import abilities, stats
+from ..utils import config
+
+class EntitySnapshotDict(TypedDict):
+    """A class representing a dictionary of an entity's state."""
+
+    cls: str
+    x: float
+    y: float
+    destination: list[float] | None
+    bounds: dict[str, int]
+    # anything particular to the entity type (hp, damage, etc.)
+    extra: dict[str, Any]
+
+class SlotSnapshotDict(TypedDict):
+    """A class representing a dictionary of an ability slot's state."""
+
+    ability: str | None
+    level: int
+    is_locked: bool
+    is_enabled: bool
+
+class SnapshotDict(TypedDict):
+    """A class representing a dictionary of the whole session."""
+
+    play_size: list[int]
+    state: dict[str, Any]
+    ship: EntitySnapshotDict
+    stats: dict[str, int]
+    slots: dict[str, SlotSnapshotDict]
+    aliens: list[EntitySnapshotDict]
+    bullets: list[EntitySnapshotDict]
+    powerups: list[EntitySnapshotDict]
+    spawn: dict[str, float]
+    rng: list[Any]
+
+def _find_class(base: type, name: str) -> type:
+    """Return the class, or subclass of the base, with the given name."""
+
+    if base.__name__ == name:
+        return base
+
+    for subclass in base.__subclasses__():
+        try:
+            return _find_class(subclass, name)
+        except LookupError:
+            continue
+
+    raise LookupError(f"No {base.__name__} class named {name}")
+
+class SessionSnapshot():
+    """
+    A class which saves everything needed to continue a session later:
+    the state, the ship, every alien, bullet and powerup, the spawn
+    timers and the random number generator.
+    """
+
+    state_fields: tuple[str, ...] = (
+        'session_duration', 'last_second_tracked', 'credits_earned',
+        'level', 'killcount', 'start_time',
+    )
+    ship_fields: tuple[str, ...] = (
+        'charging_ability', 'charge_time', 'bullet_cooldown_ms',
+    )
+    spawn_fields: tuple[str, ...] = (
+        'random_spawn_delay', 'random_spawn_cooldown', 'random_spawn_count',
+    )
+
+    def __init__(self, game: Game, path: str | Path | None = None) -> None:
+        """Initialize the session snapshot."""
+
+        self.game: Game = game
+
+        if path is None:
+            path = config.snapshot_path
+        self.path: Path = Path(path)
+
+        # how long the last capture took on the main thread, in ms
+        self.capture_ms: float = 0
+
+    # region CAPTURE
+    # -------------------------------------------------------------------
+
+    def capture(self) -> SnapshotDict:
+        """Return the state of the running session."""
+
+        start = time.perf_counter()
+        game = self.game
+
+        snapshot: SnapshotDict = {
+            'play_size': list(game.play_rect.size),
+            'state': {
+                field: getattr(game.state, field)
+                for field in SessionSnapshot.state_fields
+            },
+            'ship': self._capture_entity(game.ship, {
+                field: getattr(game.ship, field)
+                for field in SessionSnapshot.ship_fields
+            }),
+            'stats': {
+                name: stat.value for name, stat in game.ship.stats.items()
+            },
+            'slots': {
+                name: self._capture_slot(slot)
+                for name, slot in game.ship.ability_slots.items()
+            },
+            'aliens': [
+                self._capture_entity(alien, {'hp': alien.hp})
+                for alien in game.aliens
+            ],
+            'bullets': [
+                self._capture_entity(bullet, {'damage': bullet.damage})
+                for bullet in game.bullets
+            ],
+            'powerups': [
+                self._capture_entity(powerup, self._get_powerup_extra(powerup))
+                for powerup in game.powerups
+            ],
+            'spawn': {
+                field: getattr(game.spawn_manager, field)
+                for field in SessionSnapshot.spawn_fields
+            },
+            'rng': self._capture_rng(),
+        }
+
+        self.capture_ms = (time.perf_counter() - start) * 1000
+        return snapshot
+
+    def _capture_entity(self,
+                        entity: Entity,
+                        extra: dict[str, Any]
+                        ) -> EntitySnapshotDict:
+        """Return the position and movement of the entity."""
+
+        destination = None
+        if entity.destination is not None:
+            destination = [float(entity.destination[0]), float(entity.destination[1])]
+
+        return {
+            'cls': type(entity).__name__,
+            'x': entity.x,
+            'y': entity.y,
+            'destination': destination,
+            'bounds': dict(entity.bounds),
+            'extra': extra,
+        }
+
+    def _capture_slot(self, slot: abilities.Slot) -> SlotSnapshotDict:
+        """Return the ability in the slot and the slot's state."""
+
+        level = 1
+        if isinstance(slot.ability, abilities.Passive):
+            level = slot.ability.level
+
+        return {
+            'ability': None if slot.ability is None else type(slot.ability).__name__,
+            'level': level,
+            'is_locked': slot.is_locked,
+            'is_enabled': slot.is_enabled,
+        }
+
+    def _get_powerup_extra(self, powerup: PowerUp) -> dict[str, Any]:
+        """Return what the powerup gives, to recreate it."""
+
+        if isinstance(powerup, ImproveStat):
+            return {'stat_name': powerup.stat_name, 'magnitude': powerup.magnitude}
+        if isinstance(powerup, AddAbility):
+            return {'ability': powerup.ability_class.__name__}
+        return {}
+
+    def _capture_rng(self) -> list[Any]:
+        """Return the state of the random module as a flat list."""
+
+        version, internal, gauss_next = random.getstate()
+        return [version, list(internal), gauss_next]
+
+    # -------------------------------------------------------------------
+    # endregion capture
+
+    def take(self) -> None:
+        """Capture the session and write it to disk in the background."""
+
+        if not hasattr(self.game, 'ship'):
+            return
+
+        self.game.save_service.request(
+            self.path, self.capture(), lambda data: save_format.encode('session', data)
+        )
+
+    def exists(self) -> bool:
+        """Return True if there is a suspended session on disk."""
+
+        return self.path.exists()
+
+    def discard(self) -> None:
+        """Delete the suspended session, once it has ended."""
+
+        self.game.save_service.discard(self.path)
+
+    # region RESTORE
+    # -------------------------------------------------------------------
+
+    def load(self) -> bool:
+        """
+        Rebuild the session from the snapshot on disk, and pause it.
+        Return False if there is no usable snapshot.
+        """
+
+        if not self.exists():
+            return False
+
+        try:
+            snapshot = save_format.load('session', self.path)
+        except Exception as e:
+            print(f"Encountered an error while loading the session: {e}.")
+            self.discard()
+            return False
+
+        try:
+            self.restore(snapshot)
+        except Exception as e:
+            print(f"Encountered an error while restoring the session: {e}.")
+            self.discard()
+            self.game.abandon_session()
+            return False
+
+        self.game.menus['pause'].open()
+        return True
+
+    def restore(self, snapshot: SnapshotDict) -> None:
+        """Replace the current session with the one in the snapshot."""
+
+        game = self.game
+
+        # start a fresh session with the snapshot's ship
+        selected_ship = game.ship_class
+        game.ship_class = _find_class(Ship, snapshot['ship']['cls'])
+        try:
+            game.start_session()
+        finally:
+            game.ship_class = selected_ship
+
+        for field, value in snapshot['state'].items():
+            setattr(game.state, field, value)
+        game.state.last_session_tick = pygame.time.get_ticks()
+
+        self._restore_ship(snapshot)
+
+        game.aliens.empty()
+        for entity in snapshot['aliens']:
+            alien = _find_class(Alien, entity['cls'])(game)
+            alien.hp = entity['extra']['hp']
+            game.aliens.add(self._restore_entity(alien, entity, snapshot))
+
+        game.bullets.empty()
+        for entity in snapshot['bullets']:
+            bullet = _find_class(Bullet, entity['cls'])(game)
+            bullet.damage = entity['extra']['damage']
+            game.bullets.add(self._restore_entity(bullet, entity, snapshot))
+
+        game.powerups.empty()
+        for entity in snapshot['powerups']:
+            powerup = self._make_powerup(entity)
+            game.powerups.add(self._restore_entity(powerup, entity, snapshot))
+
+        for field, value in snapshot['spawn'].items():
+            setattr(game.spawn_manager, field, value)
+
+        version, internal, gauss_next = snapshot['rng']
+        random.setstate((version, tuple(internal), gauss_next))
+
+        game.top_tray.update()
+        game.bot_tray.update()
+
+    def _restore_ship(self, snapshot: SnapshotDict) -> None:
+        """Restore the ship's position, stats and ability slots."""
+
+        ship = self.game.ship
+        self._restore_entity(ship, snapshot['ship'], snapshot)
+        for field, value in snapshot['ship']['extra'].items():
+            setattr(ship, field, value)
+
+        for name, value in snapshot['stats'].items():
+            ship.stats[name].set_value(value)
+
+        for name, saved in snapshot['slots'].items():
+            slot: abilities.Slot = ship.ability_slots[name]
+            slot.set_is_locked(saved['is_locked'])
+            slot.ability = None
+            if saved['ability'] is not None:
+                slot.ability = _find_class(abilities.Ability, saved['ability'])(self.game)
+                if isinstance(slot.ability, abilities.Passive):
+                    slot.ability.level = saved['level']
+            slot.is_enabled = saved['is_enabled']
+
+    def _make_powerup(self, entity: EntitySnapshotDict) -> PowerUp:
+        """Create a powerup like the one in the snapshot."""
+
+        cls = _find_class(PowerUp, entity['cls'])
+        extra = entity['extra']
+        position = (0, 0)
+
+        if cls is ImproveStat:
+            stat_class = next(
+                stat for stat in stats.Stat.__subclasses__()
+                if stat.name == extra['stat_name']
+            )
+            return ImproveStat(self.game, position, stat_class, extra['magnitude'])
+        if cls is AddAbility:
+            ability_class = _find_class(abilities.Ability, extra['ability'])
+            return AddAbility(self.game, position, ability_class)
+        return cls(self.game, position)
+
+    def _restore_entity(self,
+                        entity: Entity,
+                        saved: EntitySnapshotDict,
+                        snapshot: SnapshotDict
+                        ) -> Entity:
+        """
+        Move the entity to its saved position, scaled to the play surface
+        if its size changed since the snapshot was taken.
+        """
+
+        scale_x = self.game.play_rect.width / snapshot['play_size'][0]
+        scale_y = self.game.play_rect.height / snapshot['play_size'][1]
+
+        entity.x = saved['x'] * scale_x
+        entity.y = saved['y'] * scale_y
+        entity.destination = None
+        if saved['destination'] is not None:
+            entity.destination = (
+                saved['destination'][0] * scale_x,
+                saved['destination'][1] * scale_y,
+            )
+        entity.bounds = {
+            'top': round(saved['bounds']['top'] * scale_y),
+            'bottom': round(saved['bounds']['bottom'] * scale_y),
+            'left': round(saved['bounds']['left'] * scale_x),
+            'right': round(saved['bounds']['right'] * scale_x),
+        }
+
+        entity.rect.x = round(entity.x)
+        entity.rect.y = round(entity.y)
+        return entity
+
+    # -------------------------------------------------------------------
+    # endregion restore
+
+__all__ = ["SessionSnapshot"]
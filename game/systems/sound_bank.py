@@ -0,0 +1,271 @@
+"""
+A module containing the SoundBank class, which decodes each sound file
+once and shares the Sounds between the systems that play them.
+
+Compressed files (see config.audio_formats) are preferred over a WAV
+with the same name, so assets can be swapped without touching code.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+import pygame
+from pygame.mixer import Sound
+
+from .streaming import DecodeJob, StreamDecoder
+from ..utils import config
+from ..utils.asset_pack import get_pack, trace_load
+from ..utils.asset_loader import get_loader
+
+class SoundBank():
+    """
+    A class which caches decoded Sounds by file name, evicting the
+    least recently used ones when the memory cap is exceeded.
+    """
+
+    def __init__(self, max_bytes: int | None = None) -> None:
+        """Initialize the sound bank."""
+
+        if max_bytes is None:
+            max_bytes = config.sound_bank_max_bytes
+        self.max_bytes: int = max_bytes
+
+        # most recently used last
+        self.sounds: OrderedDict[str, Sound] = OrderedDict()
+        self.sizes: dict[str, int] = {}
+        self.bytes_used: int = 0
+
+        # files which failed to load, so they are not retried
+        self.missing: set[str] = set()
+
+        # long files being decoded in the background
+        self.decoder = StreamDecoder()
+        self.loading: dict[str, DecodeJob] = {}
+        # short files being decoded by the asset loader
+        self.preloading: dict[str, Future[Sound]] = {}
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, file_name: str | None, wait: bool = True) -> Sound | None:
+        """
+        Return the Sound for the given file in the sounds directory,
+        decoding it on first use. Returns None for a blank file name
+        or a file that cannot be loaded. If the file is being preloaded
+        and wait is False, returns None rather than waiting for it.
+        """
+
+        if not file_name or file_name in self.missing:
+            return None
+
+        sound = self.sounds.get(file_name, None)
+        if sound is not None:
+            self.hits += 1
+            self.sounds.move_to_end(file_name)
+            return sound
+
+        future = self.preloading.get(file_name, None)
+        if future is not None:
+            if not wait and not future.done():
+                return None
+            self._collect(file_name)
+            return self.sounds.get(file_name, None)
+
+        self.misses += 1
+        sound = self._decode(file_name)
+        if sound is None:
+            self.missing.add(file_name)
+            return None
+
+        self._store(file_name, sound)
+        return sound
+
+    def load_async(self, file_name: str | None) -> Sound | None:
+        """
+        Return the Sound for the given file if it is decoded. Otherwise,
+        start decoding it in the background and return None.
+        Meant for long music stems; short effects should use get.
+        """
+
+        if not file_name or file_name in self.missing:
+            return None
+
+        if file_name in self.sounds:
+            return self.get(file_name)
+
+        if file_name in self.loading:
+            return None
+
+        path = self.find_path(file_name)
+        if path is None:
+            self.missing.add(file_name)
+            return None
+
+        if get_pack().has(path):
+            # packed sounds are already decoded
+            return self.get(file_name)
+
+        self.misses += 1
+        self.loading[file_name] = self.decoder.submit(path)
+        return None
+
+    def preload(self, file_name: str | None) -> None:
+        """
+        Start decoding the file on the asset loader's threads, so that
+        it is decoded by the time it is first played.
+        """
+
+        if (not file_name or file_name in self.missing
+                or file_name in self.sounds or file_name in self.preloading):
+            return
+
+        path = self.find_path(file_name)
+        if path is None:
+            self.missing.add(file_name)
+            return
+
+        self.misses += 1
+        self.preloading[file_name] = get_loader().load_sound(path)
+
+    def _collect(self, file_name: str) -> None:
+        """Store the preloaded Sound, waiting for it if needed."""
+
+        future = self.preloading.pop(file_name)
+        try:
+            self._store(file_name, future.result())
+        except Exception as e:
+            print(f"Error while loading sound!\n{e}")
+            self.missing.add(file_name)
+
+    def poll(self) -> bool:
+        """
+        Store the Sounds which finished decoding in the background.
+        Return True if no music stem is left loading.
+        """
+
+        for file_name, future in list(self.preloading.items()):
+            if future.done():
+                self._collect(file_name)
+
+        for file_name, job in list(self.loading.items()):
+            if not job.done.is_set():
+                continue
+
+            del self.loading[file_name]
+            if job.sound is None:
+                self.missing.add(file_name)
+            else:
+                self._store(file_name, job.sound)
+
+        return not self.loading
+
+    def _store(self, file_name: str, sound: Sound) -> None:
+        """Cache the decoded Sound and evict old ones if needed."""
+
+        self.sounds[file_name] = sound
+        self.sizes[file_name] = self._get_size(sound)
+        self.bytes_used += self.sizes[file_name]
+        self._evict()
+
+    def resolve(self, file_names: list[str | None]) -> list[Sound | None]:
+        """Return the Sounds for a list of file names, in order."""
+
+        return [self.get(file_name) for file_name in file_names]
+
+    def find_path(self, file_name: str) -> Path | None:
+        """
+        Return the path of the sound file, preferring a compressed file
+        with the same name. Returns None if no file exists, packed or loose.
+        """
+
+        path = self._locate(file_name)
+        if path is None:
+            print(f"Sound not found at: {Path(config.sounds_path, file_name)}.")
+        return path
+
+    def exists(self, file_name: str) -> bool:
+        """Return True if the sound file exists, packed or loose."""
+
+        return self._locate(file_name) is not None
+
+    def _locate(self, file_name: str) -> Path | None:
+        """Return the path of the sound file, or None, without printing."""
+
+        pack = get_pack()
+        path = Path(config.sounds_path, file_name)
+        for suffix in config.audio_formats:
+            sibling = path.with_suffix(suffix)
+            if pack.exists(sibling):
+                return sibling
+
+        if not pack.exists(path):
+            return None
+        return path
+
+    def _decode(self, file_name: str) -> Sound | None:
+        """Load and decode the sound file."""
+
+        path = self.find_path(file_name)
+        if path is None:
+            return None
+
+        try:
+            with trace_load('load_sound', path):
+                return get_pack().load_sound(path)
+        except Exception as e:
+            print(f"Error while loading sound!\n{e}")
+            return None
+
+    def _get_size(self, sound: Sound) -> int:
+        """Return the size of the decoded sound in bytes."""
+
+        mixer_init = pygame.mixer.get_init()
+        if not mixer_init:
+            return 0
+
+        frequency, size, channels = mixer_init
+        samples = round(sound.get_length() * frequency)
+        return samples * channels * abs(size) // 8
+
+    def _evict(self) -> None:
+        """
+        Drop the least recently used Sounds until under the memory cap.
+        The most recent Sound is always kept.
+        """
+
+        while self.bytes_used > self.max_bytes and len(self.sounds) > 1:
+            file_name, _ = self.sounds.popitem(last=False)
+            self.bytes_used -= self.sizes.pop(file_name)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all the cached Sounds."""
+
+        self.sounds.clear()
+        self.sizes.clear()
+        self.missing.clear()
+        self.loading.clear()
+        for future in self.preloading.values():
+            future.cancel()
+        self.preloading.clear()
+        self.bytes_used = 0
+
+    def get_memory_report(self) -> dict[str, int]:
+        """Return the bytes held by each cached Sound."""
+
+        return dict(self.sizes)
+
+    def __str__(self) -> str:
+        """Returns a readable string containing the bank's usage."""
+
+        return f"""
+SoundBank:
+    Sounds cached:      {len(self.sounds)}
+    Memory used:        {self.bytes_used / 1024:.1f} / {self.max_bytes / 1024:.1f} KiB
+    Hits / misses:      {self.hits} / {self.misses}
+    Evictions:          {self.evictions}
+"""
+
+__all__ = ["SoundBank"]
@@ -2,6 +2,8 @@
 A module containing the State class, which tracks the current game state.
 """
 
+import time
+
 import pygame
 
 class State():
@@ -11,7 +13,10 @@ class State():
         """Initialize the game state object."""
 
         self.session_running: bool = False
+        # set to end the session once the current frame is over
+        self.session_over: bool = False
         self.session_start: int = pygame.time.get_ticks()
+        self.start_time: float = time.time()
         self.last_session_tick: int = pygame.time.get_ticks()
         self.session_duration: int = 0 # in miliseconds
         self.last_second_tracked: int = -1
@@ -0,0 +1,286 @@
+"""
+A module containing the StreamDecoder class, which decodes sound files
+on a background thread, and the AudioStream class, which plays a long
+file on a channel while decoding it, a few chunks ahead.
+
+Chunked decoding requires soundfile and numpy. Without them, the whole
+file is decoded by pygame, still on the background thread, and nothing
+can be streamed.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import queue
+import threading
+
+import pygame
+from pygame.mixer import Sound
+
+try:
+    import numpy
+    import soundfile
+except ImportError:
+    numpy = None
+    soundfile = None
+
+from ..utils import config
+from ..utils.asset_pack import trace_load
+
+class DecodeJob():
+    """A class representing a sound file being decoded."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the job."""
+
+        self.path: Path = path
+        self.sound: Sound | None = None
+        self.failed: bool = False
+        self.chunks_decoded: int = 0
+        self.done = threading.Event()
+
+class StreamDecoder():
+    """
+    A class which owns a single worker thread that decodes the sound
+    files it is given, one after another, off the main thread.
+    """
+
+    # sample size reported by the mixer -> matching numpy dtype
+    sample_types: dict[int, str] = {-16: 'int16', 32: 'float32'}
+
+    def __init__(self, chunk_frames: int | None = None) -> None:
+        """Initialize the decoder. The thread starts on the first job."""
+
+        if chunk_frames is None:
+            chunk_frames = config.stream_chunk_frames
+        self.chunk_frames: int = chunk_frames
+
+        self.jobs: queue.Queue[DecodeJob] = queue.Queue()
+        self.thread: threading.Thread | None = None
+        # held while queueing a job and while the idle worker exits,
+        # so a job is never left behind by a worker on its way out
+        self.lock = threading.Lock()
+        self.jobs_submitted: int = 0
+
+    @staticmethod
+    def can_stream() -> bool:
+        """Return True if files can be decoded in chunks."""
+
+        mixer_init = pygame.mixer.get_init()
+        return (soundfile is not None and mixer_init is not None
+                and mixer_init[1] in StreamDecoder.sample_types)
+
+    def submit(self, path: Path) -> DecodeJob:
+        """Queue the file for decoding and return its job."""
+
+        job = DecodeJob(path)
+        with self.lock:
+            self.jobs.put(job)
+            self.jobs_submitted += 1
+
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._work, name="StreamDecoder", daemon=True
+                )
+                self.thread.start()
+
+        return job
+
+    def _work(self) -> None:
+        """Decode queued files until there are none left."""
+
+        while True:
+            try:
+                job = self.jobs.get(timeout=1)
+            except queue.Empty:
+                with self.lock:
+                    if self.jobs.empty():
+                        self.thread = None
+                        return
+                continue
+
+            try:
+                with trace_load('decode_sound', job.path):
+                    if StreamDecoder.can_stream():
+                        job.sound = self._decode_chunked(job)
+                    else:
+                        job.sound = Sound(job.path)
+            except Exception as e:
+                print(f"Error while decoding {job.path}!\n{e}")
+
+            job.failed = job.sound is None
+            job.done.set()
+
+    def _decode_chunked(self, job: DecodeJob) -> Sound | None:
+        """
+        Read the whole file a chunk at a time, for a Sound played over
+        and over (stems, effects). Long files are played with an
+        AudioStream instead, which holds only a few chunks.
+        """
+
+        chunks: list[numpy.ndarray] = []
+        with soundfile.SoundFile(job.path) as file:
+            samplerate = file.samplerate
+            while True:
+                chunk = file.read(self.chunk_frames, dtype='float32', always_2d=True)
+                if not len(chunk):
+                    break
+                chunks.append(chunk)
+                job.chunks_decoded += 1
+
+        if not chunks:
+            return None
+        return pygame.sndarray.make_sound(
+            _to_mixer_format(numpy.concatenate(chunks), samplerate)
+        )
+
+class AudioStream():
+    """
+    A class which plays a sound file on a channel as it is decoded.
+
+    A thread of its own decodes the file a chunk at a time into a small
+    buffer, and update (called every frame) keeps the next chunk queued
+    on the channel, so the mixer moves on to it without a gap. Only the
+    chunk playing, the one queued and those in the buffer are held in
+    memory, however long the file is.
+    """
+
+    def __init__(self,
+                 path: Path,
+                 channel: pygame.mixer.Channel,
+                 loop: bool = False,
+                 chunk_frames: int | None = None
+                 ) -> None:
+        """Initialize the stream. It plays once started."""
+
+        if chunk_frames is None:
+            chunk_frames = config.stream_chunk_frames
+        self.chunk_frames: int = chunk_frames
+
+        self.path: Path = path
+        self.channel: pygame.mixer.Channel = channel
+        self.loop: bool = loop
+
+        # decoded chunks, or None once the file has ended
+        self.chunks: queue.Queue[Sound | None] = queue.Queue(config.stream_buffer_chunks)
+        self.stopping = threading.Event()
+        self.thread: threading.Thread | None = None
+        self.is_finished: bool = False
+        self.chunks_decoded: int = 0
+
+    @property
+    def is_started(self) -> bool:
+        """Return True if the stream was started, and not stopped since."""
+
+        return self.thread is not None
+
+    def start(self) -> None:
+        """Start decoding and playing the file from the beginning."""
+
+        self.stop()
+        self.stopping.clear()
+        self.is_finished = False
+        self.thread = threading.Thread(
+            target=self._work, name="AudioStream", daemon=True
+        )
+        self.thread.start()
+
+    def _work(self) -> None:
+        """Decode chunks into the buffer, waiting while it is full."""
+
+        try:
+            with soundfile.SoundFile(self.path) as file:
+                while not self.stopping.is_set():
+                    samples = file.read(self.chunk_frames, dtype='float32', always_2d=True)
+                    if not len(samples):
+                        if not self.loop:
+                            break
+                        file.seek(0)
+                        continue
+
+                    chunk = pygame.sndarray.make_sound(
+                        _to_mixer_format(samples, file.samplerate)
+                    )
+                    self.chunks_decoded += 1
+                    if not self._put(chunk):
+                        return
+        except Exception as e:
+            print(f"Encountered an error while streaming {self.path}: {e}.")
+
+        self._put(None)
+
+    def _put(self, chunk: Sound | None) -> bool:
+        """Add the chunk to the buffer. Return False if stopped meanwhile."""
+
+        while not self.stopping.is_set():
+            try:
+                self.chunks.put(chunk, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def update(self) -> None:
+        """Keep a decoded chunk queued behind the one playing."""
+
+        if (not self.is_started or self.is_finished
+                or self.channel.get_queue() is not None):
+            return
+
+        try:
+            chunk = self.chunks.get_nowait()
+        except queue.Empty:
+            # the decoder fell behind; the channel goes quiet until it catches up
+            return
+
+        if chunk is None:
+            self.is_finished = True
+        elif self.channel.get_busy():
+            self.channel.queue(chunk)
+        else:
+            self.channel.play(chunk)
+
+    def stop(self) -> None:
+        """Stop playing, and stop the thread, dropping the buffered chunks."""
+
+        if self.thread is None:
+            return
+
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+        while not self.chunks.empty():
+            self.chunks.get_nowait()
+        self.channel.stop()
+
+def _to_mixer_format(samples: numpy.ndarray, samplerate: int) -> numpy.ndarray:
+    """
+    Convert float samples, one column per channel, to the mixer's rate,
+    channel count and sample type.
+    """
+
+    frequency, size, channels = pygame.mixer.get_init()
+
+    if samplerate != frequency:
+        length = round(len(samples) * frequency / samplerate)
+        positions = numpy.linspace(0, len(samples) - 1, length)
+        samples = numpy.column_stack([
+            numpy.interp(positions, numpy.arange(len(samples)), samples[:, i])
+            for i in range(samples.shape[1])
+        ])
+
+    if samples.shape[1] != channels:
+        # fold down to mono, then spread to the mixer's channels
+        mono = samples.mean(axis=1, keepdims=True)
+        samples = numpy.repeat(mono, channels, axis=1)
+
+    sample_type = StreamDecoder.sample_types[size]
+    if sample_type == 'int16':
+        samples = numpy.clip(samples * 32767, -32768, 32767)
+    samples = numpy.ascontiguousarray(samples.astype(sample_type))
+    if channels == 1:
+        samples = samples[:, 0]
+
+    return samples
+
+__all__ = ["AudioStream", "StreamDecoder"]
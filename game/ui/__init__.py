@@ -1,4 +1,5 @@
 """Initialize the user interface package."""
 
 from .menus import *
+from .overlays import *
 from .trays import *
@@ -8,7 +8,7 @@ if TYPE_CHECKING:
 
 import pygame
 
-from ..utils import config, helper_funcs
+from ..utils import assets, config, helper_funcs
 
 class Menu():
     """A base class representing a menu."""
@@ -103,7 +103,7 @@ class Menu():
             name: str = element['name']
             content: str | pygame.Surface = element['content']
 
-            font: pygame.Font = element['font']
+            font: pygame.Font | None = element['font']
             wraplength: int | None = element['wraplength']
 
             x_offset: int = element['x_offset']
@@ -211,8 +211,10 @@ class Menu():
     def update(self) -> None:
         """Re-renders the menu with current values."""
 
-        self._load_elements()        
+        with self.game.tracer.trace('rebuild', 'ui', {'menu': self.name}):
+            self._load_elements()
         self.needs_redraw = True
+        self.game.telemetry.count_rebuild(self.name)
     
     def open(self) -> None:
         """Make the menu visible and interactive."""
@@ -482,7 +484,7 @@ class TextBox(UIElement):
         """Initialize the text box."""
 
         if font is None:
-            font = config.font_normal
+            font = assets.get_font('normal')
         
         if wraplength is None:
             wraplength = container.rect.width - \
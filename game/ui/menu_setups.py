@@ -19,7 +19,7 @@ if TYPE_CHECKING:
 import pygame
 
 from ..mechanics import stats, rewards
-from ..utils import config, helper_funcs
+from ..utils import assets, config, helper_funcs
 from ..systems import settings
 
 class ElementDict(TypedDict):
@@ -28,7 +28,7 @@ class ElementDict(TypedDict):
     type: str
     name: str
     content: str | pygame.Surface
-    font: pygame.Font
+    font: pygame.Font | None
     wraplength: int | None
     linked_to: str | None
     x_offset: int
@@ -42,7 +42,7 @@ class ElementDict(TypedDict):
 def _create_ElementDict(type: str,
                         name: str,
                         content: str | pygame.Surface,
-                        font: pygame.Font = config.font_normal,
+                        font: pygame.Font | None = None,
                         wraplength: int | None = None,
                         linked_to: str | None = None,
                         x_offset: int = 0,
@@ -150,7 +150,7 @@ def build_upgrade_menu_elements(menu: UpgradeMenu) -> list[ElementDict]:
                 type='label',
                 name='title',
                 content='Upgrades',
-                font=config.font_large,
+                font=assets.get_font('large'),
                 x_offset=menu.rect.width // 2, y_offset=22,
                 anchor='midtop',
             ),
@@ -249,7 +249,7 @@ def build_rewards_menu_elements(menu: RewardsMenu) -> list[ElementDict]:
                 type='label',
                 name='title',
                 content='Rewards',
-                font=config.font_large,
+                font=assets.get_font('large'),
                 x_offset=menu.rect.width // 2, y_offset=22,
                 anchor='midtop'
             )
@@ -340,7 +340,7 @@ def build_settings_menu_elements(menu: SettingsMenu) -> list[ElementDict]:
             type='label',
             name='title',
             content='Settings',
-            font=config.font_large,
+            font=assets.get_font('large'),
             x_offset=menu.rect.width // 2,
             y_offset=22,
             anchor='midtop'
@@ -734,7 +734,7 @@ def build_info_menu_elements(menu: InfoMenu) -> list[ElementDict]:
             type='label',
             name='title',
             content='Info',
-            font=config.font_large,
+            font=assets.get_font('large'),
             x_offset=menu.rect.width // 2,
             y_offset=22,
             anchor='midtop'
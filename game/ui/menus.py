@@ -242,6 +242,9 @@ class Pause(Menu):
 
         self.game.state.session_running = False
         self.game.music_player.pause()
+        # suspend to disk, in case the game is closed while paused
+        self.game.snapshot.take()
+        self.game.gc_policy.collect('pause')
         return super().open()
 
     def continue_session(self) -> None:
@@ -0,0 +1,118 @@
+"""
+A module containing the debug overlays, drawn on top of everything else.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..game import Game
+
+import pygame
+
+from .base import Menu
+from ..utils import assets
+
+class ProfilerOverlay():
+    """
+    A class representing an overlay which shows a rolling frame time
+    graph, the time spent in each phase, and the live entity counts.
+    """
+
+    name: str = "Profiler Overlay"
+    graph_height: int = 30
+    alpha: int = 200
+
+    def __init__(self, game: Game) -> None:
+        """Initialize the overlay, hidden by default."""
+
+        self.game: Game = game
+        self.is_visible: bool = False
+
+    def toggle(self) -> None:
+        """Show or hide the overlay, and start or stop profiling."""
+
+        self.is_visible = not self.is_visible
+
+        if self.is_visible:
+            self.game.profiler.enable(ProfilerOverlay.name)
+        else:
+            self.game.profiler.disable(ProfilerOverlay.name)
+
+            # let the menus paint over the overlay
+            for menu in self.game.menus.values():
+                if not isinstance(menu, Menu):
+                    continue
+                menu.needs_redraw = True
+
+    def _get_lines(self) -> list[str]:
+        """Return the lines of text shown below the graph."""
+
+        profiler = self.game.profiler
+        frame_times = profiler.get_frame_times()[-60:]
+        average = sum(frame_times) / len(frame_times) if frame_times else 0
+        worst = max(frame_times) if frame_times else 0
+
+        lines = [f"frame {average:.2f} max {worst:.2f} ms"]
+        for phase, ms in profiler.get_phase_averages().items():
+            lines.append(f"{phase:<13} {ms:6.2f}")
+
+        if hasattr(self.game, 'aliens'):
+            lines.append(
+                f"A {len(self.game.aliens)} B {len(self.game.bullets)} "
+                f"P {len(self.game.powerups)}"
+            )
+
+        stats = self.game.event_pump.stats
+        lines.append(
+            f"events {stats['frame_received']} -> {stats['frame_processed']}"
+        )
+        return lines
+
+    def _draw_graph(self, surface: pygame.Surface, top: int) -> None:
+        """Draw the rolling frame time graph, scaled to the target fps."""
+
+        width = surface.width
+        height = ProfilerOverlay.graph_height
+        frame_times = self.game.profiler.get_frame_times()[-width:]
+
+        # the target frame time sits in the middle of the graph
+        target_ms = 1000 / self.game.settings.data['fps']
+        scale = height / (target_ms * 2)
+
+        pygame.draw.line(
+            surface, 'green', (0, top + height // 2), (width, top + height // 2)
+        )
+        x = width - len(frame_times)
+        for ms in frame_times:
+            bar = min(height, round(ms * scale))
+            color = 'white' if ms <= target_ms else 'red'
+            pygame.draw.line(
+                surface, color, (x, top + height), (x, top + height - bar)
+            )
+            x += 1
+
+    def draw(self) -> None:
+        """Draw the overlay to the top of the screen."""
+
+        if not self.is_visible:
+            return
+
+        font = assets.get_font('normal')
+        rendered = [
+            font.render(line, False, 'white') for line in self._get_lines()
+        ]
+        line_height = font.get_linesize()
+
+        height = ProfilerOverlay.graph_height + line_height * len(rendered) + 2
+        surface = pygame.Surface((self.game.screen.width, height))
+        surface.set_alpha(ProfilerOverlay.alpha)
+
+        self._draw_graph(surface, 0)
+        y = ProfilerOverlay.graph_height + 2
+        for text in rendered:
+            surface.blit(text, (1, y))
+            y += line_height
+
+        self.game.screen.blit(surface, (0, 0))
+
+__all__ = ["ProfilerOverlay"]
@@ -1,5 +1,8 @@
 """Initialize the utils package."""
 
 from .config import *
+from .asset_pack import *
+from .asset_loader import *
 from .events import *
 from .helper_funcs import *
+from .assets import *
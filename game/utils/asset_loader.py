@@ -0,0 +1,166 @@
+"""
+A module containing the AssetLoader class, which decodes images and
+sounds on a thread pool, so the game never waits for them.
+
+An image requested without waiting is returned at once as the same
+placeholder helper_funcs.load_image falls back to. When its decode
+finishes, poll draws the real image into the placeholder, so every
+menu and entity holding it shows the real image without being rebuilt.
+"""
+
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+import weakref
+
+import pygame
+from pygame.mixer import Sound
+
+from . import config
+from .asset_pack import get_pack, trace_load
+
+class AssetLoader():
+    """
+    A class which runs asset decodes on worker threads. Futures are
+    collected on the main thread by poll, once per frame.
+    """
+
+    def __init__(self, workers: int | None = None) -> None:
+        """Initialize the loader. The threads start on the first request."""
+
+        if workers is None:
+            workers = config.asset_loader_workers
+        self.workers: int = workers
+        self.executor: ThreadPoolExecutor | None = None
+
+        # image decodes, and the placeholder each one replaces
+        self.images: dict[Future[pygame.Surface], pygame.Surface] = {}
+        # placeholder -> copies made of it, which are swapped with it
+        self.copies: dict[pygame.Surface, list[weakref.ref[pygame.Surface]]] = {}
+
+        self.swapped: int = 0
+        self.failed: int = 0
+
+    def _submit(self, function, *args) -> Future:
+        """Run the function on a worker thread."""
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                self.workers, thread_name_prefix="AssetLoader"
+            )
+        return self.executor.submit(function, *args)
+
+    def load_image(self, path: Path, placeholder: pygame.Surface) -> pygame.Surface:
+        """
+        Start decoding the image and return the placeholder, which the
+        image is drawn into once it is decoded.
+        """
+
+        future = self._submit(self._decode_image, path)
+        self.images[future] = placeholder
+        self.copies[placeholder] = []
+        return placeholder
+
+    def _decode_image(self, path: Path) -> pygame.Surface:
+        """
+        Load the image on a worker thread, in the placeholder's pixel
+        format once there is a display, so swapping it in is a plain copy.
+        """
+
+        with trace_load('load_image', path):
+            image = get_pack().load_image(path)
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+        return image
+
+    def load_sound(self, path: Path) -> Future[Sound]:
+        """Start decoding the sound and return its future."""
+
+        return self._submit(self._decode_sound, path)
+
+    def _decode_sound(self, path: Path) -> Sound:
+        """Load the sound on a worker thread."""
+
+        with trace_load('load_sound', path):
+            return get_pack().load_sound(path)
+
+    def track_copy(self, source: pygame.Surface, copy: pygame.Surface) -> None:
+        """If the source is still a placeholder, swap the copy along with it."""
+
+        if source in self.copies:
+            self.copies[source].append(weakref.ref(copy))
+
+    def is_pending(self, surface: pygame.Surface) -> bool:
+        """Return True if the surface is a placeholder still loading."""
+
+        return surface in self.images.values()
+
+    def poll(self) -> int:
+        """
+        Swap in the images which finished decoding. Return how many
+        were swapped, so whatever draws them can redraw.
+        """
+
+        swapped = 0
+        for future in [future for future in self.images if future.done()]:
+            placeholder = self.images.pop(future)
+            copies = self.copies.pop(placeholder, [])
+
+            try:
+                image = future.result()
+            except Exception as e:
+                print(f"Error while loading image!\n{e}")
+                print("Keeping the default.")
+                self.failed += 1
+                continue
+
+            if image.get_size() != placeholder.get_size():
+                # rects and layouts were made for the placeholder's size;
+                # only loose images are not known in advance
+                image = pygame.transform.scale(image, placeholder.get_size())
+
+            # adding onto a cleared surface copies the pixels and alpha
+            placeholder.fill((0, 0, 0, 0))
+            placeholder.blit(image, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            for reference in copies:
+                copy = reference()
+                if copy is not None:
+                    # as copy_image would have made it from the image
+                    copy.fill((0, 0, 0))
+                    copy.blit(image, (0, 0))
+
+            swapped += 1
+
+        self.swapped += swapped
+        return swapped
+
+    def wait(self) -> None:
+        """Block until every requested image is decoded, then swap them in."""
+
+        for future in list(self.images):
+            try:
+                future.result()
+            except Exception:
+                pass
+        self.poll()
+
+    def shutdown(self) -> None:
+        """Cancel the decodes which have not started, and stop the threads."""
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.images.clear()
+        self.copies.clear()
+
+_loader: AssetLoader | None = None
+
+def get_loader() -> AssetLoader:
+    """Return the game's asset loader, creating it on first use."""
+
+    global _loader
+    if _loader is None:
+        _loader = AssetLoader()
+    return _loader
+
+__all__ = ["AssetLoader", "get_loader"]
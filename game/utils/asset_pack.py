@@ -0,0 +1,267 @@
+"""
+A module containing the AssetPack class, which reads the game's assets
+from a single packed archive, built by `python -m game.utils.pack_tool`.
+
+The archive starts with a header holding the offset of its index, a
+json object describing each entry: where its data is, how big it is,
+the hash of the source file, and the format of pre-decoded data.
+Images are stored as raw pixels and sounds as raw samples, so neither
+is decoded when loaded. A packed image is a view of the memory-mapped
+archive; a packed sound copies its samples out of it into the mixer.
+
+Assets missing from the archive, or every asset if there is no archive
+(in development), are read from the loose files instead.
+"""
+
+from __future__ import annotations
+from typing import TypedDict
+from contextlib import AbstractContextManager
+from pathlib import Path
+import hashlib
+import json
+import mmap
+import struct
+
+import pygame
+from pygame.mixer import Sound
+
+from . import config
+
+MAGIC = b"DSAP"
+FORMAT_VERSION = 1
+# magic, format version, index offset, index size
+HEADER = struct.Struct("<4sB3xQQ")
+# data is aligned, so pixel rows start on a boundary
+ALIGNMENT = 64
+
+class AssetEntryDict(TypedDict, total=False):
+    """A class representing a dictionary of an entry in the index."""
+
+    kind: str # 'image', 'sound' or 'raw'
+    offset: int
+    size: int
+    # sha1 of the source file, as the premixer hashes loose files
+    hash: str
+
+    # images
+    width: int
+    height: int
+    format: str
+
+    # sounds, in the mixer's format when they were packed
+    frequency: int
+    bits: int
+    channels: int
+
+class AssetPack():
+    """
+    A class which memory-maps the archive once, and loads assets from
+    views of it. Every path is given relative to the project root, the
+    way the config paths are, e.g. game/audio/sounds/drums.wav.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        """Open and map the archive, if there is one."""
+
+        if path is None:
+            path = config.asset_pack_path
+        self.path: Path = Path(path)
+
+        self.entries: dict[str, AssetEntryDict] = {}
+        self._map: mmap.mmap | None = None
+        self._view: memoryview | None = None
+
+        # paths of sounds packed in a different mixer format
+        self.mismatched: set[str] = set()
+
+        # assets loaded from the archive, and from loose files
+        self.packed_loads: int = 0
+        self.loose_loads: int = 0
+
+        if config.use_asset_pack:
+            self._open()
+
+    def _open(self) -> None:
+        """Map the archive and read its index."""
+
+        try:
+            with open(self.path, 'rb') as file:
+                # a private mapping: surfaces made from it can be drawn
+                # on without writing to the file
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Encountered an error while opening {self.path}: {e}.")
+            return
+
+        try:
+            magic, version, index_offset, index_size = HEADER.unpack_from(self._map)
+            if magic != MAGIC:
+                raise ValueError("not an asset pack")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"unknown format version {version}")
+
+            self._view = memoryview(self._map)
+            index = json.loads(bytes(self._view[index_offset:index_offset + index_size]))
+            self.entries = index['entries']
+        except Exception as e:
+            print(f"Encountered an error while reading {self.path}: {e}.")
+            print("Using the loose asset files.")
+            self.close()
+
+    def is_open(self) -> bool:
+        """Return True if the archive is mapped."""
+
+        return self._view is not None
+
+    def has(self, path: str | Path) -> bool:
+        """Return True if the asset is in the archive."""
+
+        return Path(path).as_posix() in self.entries
+
+    def exists(self, path: str | Path) -> bool:
+        """Return True if the asset is in the archive or a loose file."""
+
+        return self.has(path) or Path(path).exists()
+
+    def get_view(self, path: str | Path) -> memoryview | None:
+        """Return a view of the asset's data in the archive, without copying."""
+
+        entry = self.entries.get(Path(path).as_posix(), None)
+        if entry is None or self._view is None:
+            return None
+        return self._view[entry['offset']:entry['offset'] + entry['size']]
+
+    def get_hash(self, path: str | Path) -> str | None:
+        """Return the hash of the packed source file, if it is packed."""
+
+        entry = self.entries.get(Path(path).as_posix(), None)
+        return None if entry is None else entry['hash']
+
+    def get_image_size(self, path: str | Path) -> tuple[int, int] | None:
+        """Return the size of the packed image, without loading it."""
+
+        entry = self.entries.get(Path(path).as_posix(), None)
+        if entry is None or entry['kind'] != 'image':
+            return None
+        return entry['width'], entry['height']
+
+    def read_bytes(self, path: str | Path) -> bytes:
+        """Return the contents of the asset (for sequences and the like)."""
+
+        with trace_load('read_bytes', path):
+            view = self.get_view(path)
+            if view is not None:
+                self.packed_loads += 1
+                return bytes(view)
+
+            self.loose_loads += 1
+            return Path(path).read_bytes()
+
+    def load_image(self, path: str | Path) -> pygame.Surface:
+        """
+        Return the image. A packed image is a surface over the archive's
+        pixels, shared by every load of that image, so copy it before
+        drawing on it. A loose one is decoded. Raises an error if neither
+        loads.
+        """
+
+        view = self.get_view(path)
+        if view is None:
+            self.loose_loads += 1
+            return pygame.image.load(path)
+
+        self.packed_loads += 1
+        entry = self.entries[Path(path).as_posix()]
+        return pygame.image.frombuffer(
+            view, (entry['width'], entry['height']), entry['format']
+        )
+
+    def load_sound(self, path: str | Path) -> Sound:
+        """
+        Return the sound. A packed sound is built from a copy of the
+        archive's samples, if they are in the mixer's format; otherwise
+        the loose file is decoded. Raises an error if neither loads.
+        """
+
+        key = Path(path).as_posix()
+        view = self.get_view(path)
+        if view is not None:
+            entry = self.entries[key]
+            if self._matches_mixer(entry):
+                self.packed_loads += 1
+                return Sound(buffer=view)
+            if key not in self.mismatched:
+                self.mismatched.add(key)
+                print(f"Packed {key} does not match the mixer format. "
+                      "Rebuild the asset pack. Loading the loose file.")
+
+        self.loose_loads += 1
+        return Sound(path)
+
+    def _matches_mixer(self, entry: AssetEntryDict) -> bool:
+        """Return True if the packed samples are in the mixer's format."""
+
+        mixer_init = pygame.mixer.get_init()
+        if not mixer_init:
+            return False
+
+        frequency, size, channels = mixer_init
+        return (entry['frequency'], entry['bits'], entry['channels']) == (
+            frequency, size, channels
+        )
+
+    def verify(self) -> list[str]:
+        """
+        Return the packed paths whose loose source file has changed
+        since the archive was built (missing files are not reported).
+        """
+
+        changed: list[str] = []
+        for key, entry in self.entries.items():
+            source = Path(key)
+            if not source.exists():
+                continue
+            if hashlib.sha1(source.read_bytes()).hexdigest() != entry['hash']:
+                changed.append(key)
+
+        return changed
+
+    def close(self) -> None:
+        """Unmap the archive. Assets loaded from it must be dropped first."""
+
+        self.entries = {}
+        self._view = None
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # surfaces still view it; it is unmapped with them
+                pass
+            self._map = None
+
+_pack: AssetPack | None = None
+
+def get_pack() -> AssetPack:
+    """Return the game's asset pack, opening it on first use."""
+
+    global _pack
+    if _pack is None:
+        _pack = AssetPack()
+    return _pack
+
+def trace_load(name: str, path: str | Path) -> AbstractContextManager:
+    """
+    Return a context manager tracing the load of the asset, packed or
+    loose, if tracing. Wrap the load where it is decoded, not where it
+    is requested, so each load is traced once, on the thread running it.
+    """
+
+    # the perf package imports this one, so it is imported on use
+    from ..perf.tracer import get_tracer
+    return get_tracer().trace(name, 'assets', {
+        'path': str(path), 'packed': get_pack().has(path)
+    })
+
+__all__ = ["AssetPack", "get_pack", "trace_load"]
@@ -0,0 +1,94 @@
+"""
+A module containing the lazily loaded assets: class images, which are
+loaded on first access, and fonts, which are created on first use.
+Importing the game does not create any surfaces or fonts.
+"""
+
+from __future__ import annotations
+from typing import Any
+import inspect
+
+import pygame
+
+from . import config, helper_funcs
+
+class LazyImage():
+    """
+    A descriptor for a class image, loaded with helper_funcs.load_image
+    the first time it is accessed, in the background if
+    config.load_assets_async is set. Instances may still assign their
+    own image, which takes precedence.
+    """
+
+    # every class image, for the memory inspector
+    instances: list[LazyImage] = []
+
+    def __init__(self,
+                 filename: str | None = None,
+                 dflt_color: str = "pink",
+                 dflt_size: tuple[int, int] = (24, 24)
+                 ) -> None:
+        """Initialize the descriptor. Nothing is loaded yet."""
+
+        self.filename: str | None = filename
+        self.dflt_color: str = dflt_color
+        self.dflt_size: tuple[int, int] = dflt_size
+        self.image: pygame.Surface | None = None
+        LazyImage.instances.append(self)
+
+    @classmethod
+    def of(cls, owner: type, name: str = 'image') -> LazyImage:
+        """Return the descriptor behind another class's image, to share it."""
+
+        descriptor = inspect.getattr_static(owner, name)
+        if not isinstance(descriptor, LazyImage):
+            raise TypeError(f"{owner.__name__}.{name} is not a LazyImage")
+        return descriptor
+
+    def get(self) -> pygame.Surface:
+        """Return the image, loading it if needed."""
+
+        if self.image is None:
+            self.image = helper_funcs.load_image(
+                self.filename, self.dflt_color, self.dflt_size,
+                wait=not config.load_assets_async
+            )
+        return self.image
+
+    def __get__(self, instance: Any, owner: type | None = None) -> pygame.Surface:
+        """Return the image, when accessed through a class or instance."""
+
+        return self.get()
+
+# name -> loaded font
+_fonts: dict[str, pygame.Font] = {}
+
+def get_font(name: str = 'normal') -> pygame.Font:
+    """
+    Return the font with the given name from config.font_sizes,
+    creating it on first use. Uses the font file at config.font_path,
+    or the font bundled with pygame, so system fonts are never searched.
+    """
+
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+    font = _fonts.get(name, None)
+    if font is not None:
+        return font
+
+    size = config.font_sizes[name]
+    try:
+        font = pygame.font.Font(config.font_path, size)
+    except Exception as e:
+        print(f"Error while loading font at {config.font_path}!\n{e}")
+        print("Using the default font.")
+        font = pygame.font.Font(None, size)
+
+    if not _fonts:
+        # fonts created before pygame is quit can no longer render
+        pygame.register_quit(_fonts.clear)
+    _fonts[name] = font
+    return font
+
+__all__ = ["LazyImage", "get_font"]
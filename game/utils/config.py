@@ -1,23 +1,71 @@
 """A module containing the developer configuration."""
 
 import pygame
-pygame.font.init()
 
 base_speed: int = 5 # default: 100
 required_ability_charge: int = 2000 # in miliseconds
 
 mouse_wheel_magnitude: int = 15
 
+# non-remappable bindings, added to the keybinds from the settings
+# e.g. {'fire': (pygame.K_UP, pygame.K_KP8)}
+extra_keybinds: dict[str, tuple[int, ...]] = {}
+gamepad_buttons: dict[str, tuple[int, ...]] = {
+    'cancel': (7,),
+    'move_left': (4,),
+    'move_right': (5,),
+    'fire': (0,),
+    'active_1': (2,),
+    'active_2': (3,),
+    'active_3': (1,),
+}
+
+# developer instrumentation
+measure_latency: bool = False
+latency_sample_count: int = 1000 # per input type and fps
+profiler_ring_size: int = 240 # frames
+record_telemetry: bool = False # from launch, as main.py --telemetry does; see perf.SessionTelemetry
+print_startup_timeline: bool = False
+record_trace: bool = False # from launch, as main.py --trace does; see perf.Tracer
+telemetry_max_records: int = 100
+
+# garbage collection, see perf.GCPolicy
+gc_control: bool = True # collect at safe points, not automatically mid-session
+gc_backstop_allocations: int = 20000 # young objects that force a collection
+
+debug_keys: dict[str, int] = {
+    'cycle_resolutions': pygame.K_BACKSPACE,
+    'profiler_overlay': pygame.K_F3,
+    'memory_report': pygame.K_F4,
+    'trace': pygame.K_F5,
+}
+
 settings_path: str = "game/data/settings.json"
 main_save_path: str = "game/data/saves/main_save.json"
 back_save_path: str = "game/data/saves/backup_save.json"
+journal_path: str = "game/data/saves/progress.journal"
+history_path: str = "game/data/saves/history.db"
+snapshot_path: str = "game/data/saves/session.bin"
+telemetry_path: str = "game/data/saves/telemetry/"
+memory_report_path: str = "game/data/reports/"
+trace_path: str = "game/data/traces/"
+premix_cache_path: str = "game/data/cache/premix/"
 sounds_path: str = "game/audio/sounds/"
 sequences_path: str = "game/audio/sequences/"
 images_path: str = "game/images/"
+asset_pack_path: str = "game/assets.pack" # built by game.utils.pack_tool
 # TODO: add other file paths
+save_format: str = 'json' # or 'binary', for smaller and faster saves
+save_coalesce_ms: int = 250 # saves of the same file within this are merged
+journal_compact_records: int = 200 # journal length that triggers a snapshot
+history_batch_ms: int = 500 # sessions stored within this share a transaction
 
-font_normal = pygame.font.SysFont(None, 14)
-font_large = pygame.font.SysFont(None, 20)
+# fonts are created on first use, see utils.assets.get_font
+font_path: str | None = None # None uses the font bundled with pygame
+font_sizes: dict[str, int] = {
+    'normal': 14,
+    'large': 20,
+}
 
 framerates: tuple[int, ...] = (30, 60, 120, 144, 240)
 resolutions: list[tuple[int, int]] = [
@@ -26,5 +74,19 @@ resolutions: list[tuple[int, int]] = [
     (640, 480), (1920, 1080), (2340, 1080)
 ]
 music_volumes: list[int] = list(range(11))
+sound_bank_max_bytes: int = 32 * 1024 * 1024
+music_scheduling: str = 'premix' # or 'queued', 'event'
+# the mixer's first channels play the music stems, the next the effects
+# (a premixed sequence needs only the first, and lends the rest)
+music_channels: int = 4
+sfx_channels: int = 8
+# preferred over a file of another format with the same name, in order
+audio_formats: tuple[str, ...] = ('.ogg', '.wav')
+stream_chunk_frames: int = 16384
+stream_buffer_chunks: int = 2 # decoded ahead of the one queued on the channel
+stream_music: bool = True # stream premixed sequences from the cache, if possible
+use_asset_pack: bool = True # if the pack exists; loose files otherwise
+load_assets_async: bool = True # placeholders first, swapped in once decoded
+asset_loader_workers: int = 2
 
 global_colorkey = pygame.Color(1,2,3)
@@ -1,49 +1,74 @@
 """A module containing project-wide helper functions."""
 
-from typing import Iterable
+from typing import Iterable, Sequence
 
 from pathlib import Path
 import pygame
 
 from . import config
+from .asset_pack import get_pack, trace_load
+from .asset_loader import get_loader
+
+def _make_placeholder(dflt_color: str,
+                      dflt_size: tuple[int, int],
+                      flags: int = 0
+                      ) -> pygame.Surface:
+    """Return a rectangle of the given color and size (w, h)."""
+
+    default = pygame.Surface(dflt_size, flags)
+    pygame.draw.rect(default, dflt_color, default.get_rect())
+    return default
 
 def load_image(filename: str | None = None,
                dflt_color: str = "pink",
-               dflt_size: tuple[int, int] = (24, 24)
+               dflt_size: tuple[int, int] = (24, 24),
+               wait: bool = True
                ) -> pygame.Surface:
     """
     Returns an image with the given name from the images directory.
     If the file name is not provided or the image cannot be loaded,
     returns a rectangle by default of the given color and size (w, h).
-    """
 
-    default = pygame.Surface(dflt_size)
-    pygame.draw.rect(default, dflt_color, default.get_rect())
+    If wait is False, the rectangle is returned at once and the image
+    is decoded in the background, then drawn into it (see AssetLoader).
+    """
 
     if filename is None:
-        return default
+        return _make_placeholder(dflt_color, dflt_size)
 
     path = Path(config.images_path, filename)
+    pack = get_pack()
 
-    if not path.exists():
+    if not pack.exists(path):
         print(f"Image not found at: {path}.")
         print("Returning with default.")
-        return default
-    
+        return _make_placeholder(dflt_color, dflt_size)
+
+    if not wait:
+        # packed images know their size, so nothing is resized on swap
+        size = pack.get_image_size(path) or dflt_size
+        placeholder = _make_placeholder(dflt_color, size, pygame.SRCALPHA)
+        return get_loader().load_image(path, placeholder)
+
     try:
-        img = pygame.image.load(path)
-        img.convert_alpha()
+        with trace_load('load_image', path):
+            img = pack.load_image(path)
+            img.convert_alpha()
         return img
     except Exception as e:
         print(f"Error while loading image!\n{e}")
         print("Returning with default.")
-        return default
+        return _make_placeholder(dflt_color, dflt_size)
 
 def copy_image(surface: pygame.Surface) -> pygame.Surface:
-    """Return an identical copy of the given image (surface)."""
+    """
+    Return an identical copy of the given image (surface). A copy of an
+    image still loading is swapped along with it.
+    """
 
     image = pygame.Surface(surface.get_size())
     image.blit(surface, surface.get_rect())
+    get_loader().track_copy(surface, image)
     return image
 
 def shorten_number(number: int) -> str:
@@ -76,3 +101,16 @@ def cycle_values[T](
             return value
     
     return first_value
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Return the given percentile (0-100) of the values,
+    rounded to the nearest value. Returns 0 if there are no values.
+    """
+
+    if not values:
+        return 0
+
+    ordered = sorted(values)
+    rank = round(pct / 100 * (len(ordered) - 1))
+    return ordered[rank]
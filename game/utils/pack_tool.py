@@ -0,0 +1,183 @@
+"""
+A command line tool which packs the loose asset files into the single
+archive read by AssetPack, and inspects an existing archive.
+
+Usage:
+    python -m game.utils.pack_tool build [game/assets.pack]
+    python -m game.utils.pack_tool list [game/assets.pack]
+    python -m game.utils.pack_tool verify [game/assets.pack]
+
+Images are stored as RGBA pixels and sounds as samples in the mixer's
+format, so the game does not decode them. Rebuild the archive after
+changing an asset; verify lists the assets changed since the build.
+"""
+
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import os
+
+import pygame
+
+from . import config
+from .asset_pack import ALIGNMENT, FORMAT_VERSION, HEADER, MAGIC, AssetEntryDict, AssetPack
+
+image_suffixes: tuple[str, ...] = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tga', '.webp')
+sound_suffixes: tuple[str, ...] = ('.wav', '.ogg', '.mp3', '.flac')
+
+def find_sources() -> list[Path]:
+    """
+    Return the asset files to pack. Of sounds sharing a name, only the
+    one the sound bank would pick (see config.audio_formats) is packed.
+    """
+
+    sources: list[Path] = []
+    for directory in (config.images_path, config.sounds_path, config.sequences_path):
+        for path in sorted(Path(directory).rglob("*")):
+            if path.is_file() and "__pycache__" not in path.parts:
+                sources.append(path)
+
+    # sounds by name, without the suffix
+    siblings: dict[Path, list[Path]] = {}
+    for path in sources:
+        if path.suffix in sound_suffixes:
+            siblings.setdefault(path.with_suffix(""), []).append(path)
+
+    def get_rank(path: Path) -> int:
+        if path.suffix in config.audio_formats:
+            return config.audio_formats.index(path.suffix)
+        return len(config.audio_formats)
+
+    preferred = {min(paths, key=get_rank) for paths in siblings.values()}
+    return [
+        path for path in sources
+        if path.suffix not in sound_suffixes or path in preferred
+    ]
+
+def encode_asset(path: Path) -> tuple[bytes, AssetEntryDict]:
+    """Return the data to store for the asset, and its index entry."""
+
+    if path.suffix.lower() in image_suffixes:
+        image = pygame.image.load(path)
+        entry: AssetEntryDict = {
+            'kind': 'image',
+            'width': image.get_width(),
+            'height': image.get_height(),
+            'format': 'RGBA',
+        }
+        return pygame.image.tobytes(image, 'RGBA'), entry
+
+    if path.suffix.lower() in sound_suffixes:
+        frequency, bits, channels = pygame.mixer.get_init()
+        entry = {
+            'kind': 'sound',
+            'frequency': frequency,
+            'bits': bits,
+            'channels': channels,
+        }
+        return pygame.mixer.Sound(path).get_raw(), entry
+
+    return path.read_bytes(), {'kind': 'raw'}
+
+def build(output: Path) -> None:
+    """Pack the assets into the archive at the output path."""
+
+    # the tool only decodes sounds, it never plays them
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.mixer.init()
+
+    entries: dict[str, AssetEntryDict] = {}
+    # source hash -> entry, so identical files are stored once
+    stored: dict[str, AssetEntryDict] = {}
+
+    temporary = output.with_name(output.name + ".tmp")
+    # in case the archive is built inside an asset directory
+    sources = [
+        path for path in find_sources()
+        if path.resolve() not in (output.resolve(), temporary.resolve())
+    ]
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(temporary, 'wb') as file:
+        file.write(bytes(HEADER.size))
+
+        for path in sources:
+            source_hash = hashlib.sha1(path.read_bytes()).hexdigest()
+            if source_hash in stored:
+                entries[path.as_posix()] = stored[source_hash]
+                continue
+
+            try:
+                data, entry = encode_asset(path)
+            except Exception as e:
+                print(f"Skipping {path}: {e}.")
+                continue
+
+            file.write(bytes(-file.tell() % ALIGNMENT))
+            entry['offset'] = file.tell()
+            entry['size'] = len(data)
+            entry['hash'] = source_hash
+            file.write(data)
+
+            entries[path.as_posix()] = stored[source_hash] = entry
+
+        index = json.dumps({'entries': entries}, separators=(',', ':')).encode()
+        index_offset = file.tell()
+        file.write(index)
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, index_offset, len(index)))
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temporary, output)
+    print(f"Packed {len(entries)} assets into {output} ({output.stat().st_size / 1024:.1f} KiB).")
+
+def list_entries(path: Path) -> None:
+    """Print the entries of the archive."""
+
+    pack = AssetPack(path)
+    if not pack.is_open():
+        print(f"No asset pack at {path}.")
+        return
+
+    for name, entry in pack.entries.items():
+        print(f"{entry['kind']:<6} {entry['size']:>10}  {entry['hash'][:12]}  {name}")
+
+def verify(path: Path) -> None:
+    """Print the assets which changed since the archive was built."""
+
+    pack = AssetPack(path)
+    if not pack.is_open():
+        print(f"No asset pack at {path}.")
+        return
+
+    changed = pack.verify()
+    if not changed:
+        print("The asset pack is up to date.")
+        return
+
+    print("Changed since the asset pack was built:")
+    for name in changed:
+        print(f"\t{name}")
+
+def main() -> None:
+    """Run the build, list or verify command."""
+
+    parser = argparse.ArgumentParser(
+        description="Pack the asset files into a single archive."
+    )
+    parser.add_argument('command', choices=('build', 'list', 'verify'))
+    parser.add_argument('path', type=Path, nargs='?', default=Path(config.asset_pack_path))
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build(args.path)
+    elif args.command == 'list':
+        list_entries(args.path)
+    else:
+        verify(args.path)
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,31 @@
+import argparse
+
 from game import Game
+from game.perf import get_tracer
+from game.utils import config
 
 def main():
+    parser = argparse.ArgumentParser(description="Play Deep Space Survivors.")
+    parser.add_argument(
+        "--trace", nargs="?", const="", metavar="PATH",
+        help="record a Chrome trace from launch, to PATH or the traces directory"
+    )
+    parser.add_argument(
+        "--telemetry", action="store_true",
+        help="write a performance record of each session to the telemetry directory"
+    )
+    args = parser.parse_args()
+
+    if args.telemetry:
+        config.record_telemetry = True
+
+    if args.trace is not None:
+        # started before the game, so that loading it is traced too
+        get_tracer().start(args.trace or None)
+
     # initialize the game and run it
     game = Game()
     game.run()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()